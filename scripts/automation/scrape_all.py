@@ -1,11 +1,21 @@
 #!/usr/bin/env python3
 """
 全大会のスクレイピングを実行
+
+    python scripts/automation/scrape_all.py                  # 全大会
+    python scripts/automation/scrape_all.py --due            # スケジューラが対象とした大会のみ
+    python scripts/automation/scrape_all.py --due --force t14,m6n
 """
+import argparse
 import subprocess
 import sys
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from src.services.scrape_scheduler import due_targets, record_run  # noqa: E402
+
 # スクレイピング対象大会（高速→低速の順）
 COMPETITIONS = [
     ("wr", "World Rugby Internationals"),
@@ -23,7 +33,23 @@ COMPETITIONS = [
     ("u6n", "U20 Six Nations"),
 ]
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape every competition (or only the due ones).")
+    parser.add_argument("--due", action="store_true", help="Scrape only competitions due per the scheduler.")
+    parser.add_argument("--force", type=str, default="", help="Comma-separated competitions to scrape regardless of the schedule.")
+    args = parser.parse_args(argv)
+
+    competitions = COMPETITIONS
+    if args.due:
+        force = [value.strip() for value in args.force.split(",") if value.strip()]
+        due = set(due_targets(force=force))
+        competitions = [(comp_id, comp_name) for comp_id, comp_name in COMPETITIONS if comp_id in due]
+        skipped = [comp_id for comp_id, _ in COMPETITIONS if comp_id not in due]
+        print(f"📅 スケジュール対象: {len(competitions)}/{len(COMPETITIONS)}大会" + (f"（スキップ: {', '.join(skipped)}）" if skipped else ""))
+        if not competitions:
+            print("✅ 取得対象の大会なし")
+            return 0
+
     print("=" * 70)
     print("全大会スクレイピング開始")
     print("=" * 70)
@@ -31,7 +57,7 @@ def main():
     success_count = 0
     failed = []
     
-    for comp_id, comp_name in COMPETITIONS:
+    for comp_id, comp_name in competitions:
         print(f"\n{'='*70}")
         print(f"スクレイピング中: {comp_name} ({comp_id})")
         print(f"{'='*70}")
@@ -60,12 +86,15 @@ def main():
         except Exception as e:
             print(f"❌ {comp_name} エラー: {e}")
             failed.append(comp_name)
+
+        # 次回の実行要否の判定に使用（data/scrape_state.json）
+        record_run(comp_id, success=comp_name not in failed)
     
     # サマリー
     print("\n" + "=" * 70)
     print("スクレイピング完了サマリー")
     print("=" * 70)
-    print(f"✅ 成功: {success_count}/{len(COMPETITIONS)}大会")
+    print(f"✅ 成功: {success_count}/{len(competitions)}大会")
     
     if failed:
         print(f"\n❌ 失敗した大会:")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+data_summary 集計のベンチマーク（従来ループ vs NumPy バッチ）
+
+合成した試合データ（既定 100,000 件）に対して
+competition_repository.summarize_matches_loop / summarize_matches_batch を実行し、
+結果の一致と所要時間を比較する。
+
+    python scripts/benchmarks/bench_competition_summary.py --matches 100000 --repeat 3
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from src.repositories import competition_repository as repo  # noqa: E402
+
+TIMEZONES = [
+    ("Europe/London", timedelta(hours=0)),
+    ("Europe/Paris", timedelta(hours=1)),
+    ("Asia/Tokyo", timedelta(hours=9)),
+    ("Pacific/Auckland", timedelta(hours=13)),
+]
+PLACEHOLDERS = ["TBC", "TBD", "準決勝 勝者", "リーグ戦1位", "-"]
+
+
+def build_corpus(size, team_count=400, seed=42):
+    rng = random.Random(seed)
+    teams = [f"Team {i:03d}" for i in range(team_count)]
+    base = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    matches = []
+    for i in range(size):
+        kickoff_utc = base + timedelta(minutes=15 * rng.randrange(0, 6 * 365 * 24 * 4))
+        tz_name, offset = rng.choice(TIMEZONES)
+        local = kickoff_utc.astimezone(timezone(offset))
+        home, away = rng.sample(teams, 2)
+        if rng.random() < 0.02:
+            home = rng.choice(PLACEHOLDERS)
+        matches.append(
+            {
+                "match_id": f"bench-{i}",
+                "competition_id": "bench",
+                "season": str(kickoff_utc.year),
+                "round": str(rng.randrange(1, 20)),
+                "status": "",
+                "kickoff": local.isoformat(),
+                "kickoff_utc": kickoff_utc.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "timezone": tz_name,
+                "venue": f"Stadium {rng.randrange(0, 120)}",
+                "home_team": home,
+                "away_team": away,
+                "home_team_id": "",
+                "away_team_id": "",
+                "match_url": "",
+                "broadcasters": [],
+            }
+        )
+    return matches
+
+
+def bench(func, matches, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(matches)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark data_summary computation.")
+    parser.add_argument("--matches", type=int, default=100_000, help="Synthetic corpus size.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (best time is reported).")
+    args = parser.parse_args()
+
+    if not repo.NUMPY_AVAILABLE:
+        print("⚠️ numpy 未インストールのためバッチ経路を計測できません (pip install numpy)")
+        sys.exit(1)
+
+    matches = build_corpus(args.matches)
+    print(f"合成データ: {len(matches):,} 試合")
+
+    loop_time, loop_result = bench(repo.summarize_matches_loop, matches, args.repeat)
+    batch_time, batch_result = bench(repo.summarize_matches_batch, matches, args.repeat)
+
+    print(f"  loop : {loop_time:.3f}s")
+    print(f"  batch: {batch_time:.3f}s ({loop_time / batch_time:.1f}x)")
+    if loop_result != batch_result:
+        print("✗ 集計結果が一致しません")
+        sys.exit(1)
+    print("✓ 集計結果一致")
+
+
+if __name__ == "__main__":
+    main()
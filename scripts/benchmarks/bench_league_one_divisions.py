@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+League One 日程ページの division 判定ベンチマーク（カードごとの探索 vs 1回走査）
+
+保存したシーズン日程ページ（--html）または合成ページに対して
+LeagueOneDivisionsScraper._find_division_near_container（カードごと）と
+_map_card_divisions（1回走査）を実行し、判定結果の一致と所要時間を比較する。
+
+    # 実ページを保存して計測
+    curl -s https://league-one.jp/schedule/ -o /tmp/jrlo_schedule.html
+    python scripts/benchmarks/bench_league_one_divisions.py --html /tmp/jrlo_schedule.html
+
+    # 合成ページ（既定 600 カード）
+    python scripts/benchmarks/bench_league_one_divisions.py --cards 600
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from src.collectors.domestic.league_one_divisions import LeagueOneDivisionsScraper  # noqa: E402
+
+DIVISION_LABELS = ["ディビジョン1", "ディビジョン2", "ディビジョン3", "D1", "D2", "D3"]
+
+
+def _card(rng, index):
+    label = ""
+    roll = rng.random()
+    if roll < 0.15:
+        label = f'<span class="label">{rng.choice(DIVISION_LABELS)}</span>'
+    elif roll < 0.2:
+        # 分割された表記（get_text の区切り有無で結果が変わるケース）
+        label = '<span class="label"><em>D</em><em>2</em></span>'
+    return (
+        '<div class="c-schedule">'
+        f"{label}"
+        f'<div class="datetime">2026.{1 + index % 12:02d}.{1 + index % 28:02d} 14:30</div>'
+        '<ul class="teams">'
+        f'<li class="home"><a href="/team/{index}"><img src="/logo/{index}.png"><span class="name">Team {index * 2}</span></a></li>'
+        f'<li class="away"><a href="/team/{index + 1}"><img src="/logo/{index + 1}.png"><span class="name">Team {index * 2 + 1}</span></a></li>'
+        "</ul>"
+        f'<p class="place">Stadium {index % 30}</p>'
+        '<dl class="broadcast"><dt>放送</dt><dd><a href="#">J SPORTS</a></dd></dl>'
+        f'<a class="more" href="/match/{index}/">試合詳細</a>'
+        "</div>"
+    )
+
+
+def build_page(cards=600, seed=7):
+    """合成したシーズン日程ページ（節ごとのセクション + 見出し + 入れ子のカード）"""
+    rng = random.Random(seed)
+    parts = ['<html><head><title>日程・結果</title></head><body>', '<nav><ul>']
+    parts.extend(f"<li><span>{label}</span></li>" for label in DIVISION_LABELS[:3])
+    parts.append("</ul></nav><main>")
+    index = 0
+    while index < cards:
+        parts.append('<section class="round">')
+        if rng.random() < 0.7:
+            parts.append(f"<h3>{rng.choice(DIVISION_LABELS[:3])} 第{index // 8 + 1}節</h3>")
+        else:
+            parts.append(f"<h3>第{index // 8 + 1}節</h3>")
+        for _ in range(rng.randrange(4, 10)):
+            if index >= cards:
+                break
+            depth = rng.randrange(0, 4)
+            parts.append('<div class="wrap">' * depth + _card(rng, index) + "</div>" * depth)
+            index += 1
+        parts.append("</section>")
+    parts.append("</main></body></html>")
+    return "".join(parts)
+
+
+def run(html, repeat):
+    scraper = LeagueOneDivisionsScraper.__new__(LeagueOneDivisionsScraper)
+    soup = BeautifulSoup(html, "html.parser")
+    containers = soup.find_all("div", class_="c-schedule")
+
+    def legacy():
+        return {id(c): scraper._find_division_near_container(c) for c in containers}
+
+    def single_pass():
+        return scraper._map_card_divisions(soup, containers)
+
+    timings = {}
+    results = {}
+    for name, func in (("per-card", legacy), ("single-pass", single_pass)):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results[name] = func()
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+
+    mismatches = [
+        i for i, c in enumerate(containers) if results["per-card"][id(c)] != results["single-pass"][id(c)]
+    ]
+    counts = {}
+    for div in results["single-pass"].values():
+        counts[div or "(none)"] = counts.get(div or "(none)", 0) + 1
+    print(f"cards: {len(containers)}  divisions: {dict(sorted(counts.items()))}")
+    for name, seconds in timings.items():
+        print(f"  {name:<12} {seconds * 1000:9.1f} ms")
+    print(f"  speedup      {timings['per-card'] / max(timings['single-pass'], 1e-9):9.1f}x")
+    if mismatches:
+        print(f"MISMATCH: {len(mismatches)} card(s), first index {mismatches[0]}")
+        return 1
+    print("OK: division assignment identical")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--html", type=str, help="Saved League One schedule page")
+    parser.add_argument("--cards", type=int, default=600, help="Cards in the synthetic page (without --html)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.html:
+        html = Path(args.html).read_text(encoding="utf-8")
+    else:
+        html = build_page(args.cards)
+    return run(html, args.repeat)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
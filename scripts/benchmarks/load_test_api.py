@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+読み取り専用 API (src/repositories/http_api.py) の負荷試験
+
+--url を省略するとプロセス内でサーバーを起動して計測する。
+複数スレッドが keep-alive 接続でエンドポイントを巡回し、
+requests/sec とレイテンシ分位点を出力する。
+
+    python scripts/benchmarks/load_test_api.py --concurrency 8 --duration 10
+    python scripts/benchmarks/load_test_api.py --url http://127.0.0.1:8000 --gzip
+"""
+import argparse
+import http.client
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from src.repositories import http_api  # noqa: E402
+
+
+def default_paths(base_url):
+    """competitions / teams / matches を混ぜたリクエストパスを作る"""
+    paths = ["/competitions", "/matches?limit=50"]
+    conn = _connect(base_url)
+    try:
+        conn.request("GET", "/competitions")
+        competitions = json.loads(conn.getresponse().read() or b"[]")
+        conn.request("GET", "/matches")
+        matches = json.loads(conn.getresponse().read() or b"[]")
+    finally:
+        conn.close()
+    for comp in competitions[:5]:
+        comp_id = comp.get("id", "")
+        paths.append(f"/matches?competition={comp_id}")
+        paths.append(f"/matches?competition={comp_id}&from=2026-01-01&to=2026-12-31")
+    team_ids = sorted({m.get("home_team_id") for m in matches if m.get("home_team_id")})
+    for team_id in team_ids[:: max(1, len(team_ids) // 5)][:5]:
+        paths.append(f"/teams/{team_id}")
+        paths.append(f"/matches?team={team_id}")
+    return paths
+
+
+def _connect(base_url):
+    parts = urlsplit(base_url)
+    return http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=10)
+
+
+def worker(base_url, paths, deadline, use_gzip, use_etag, latencies, statuses, lock):
+    conn = _connect(base_url)
+    etags = {}
+    local_latencies = []
+    local_statuses = Counter()
+    i = 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        headers = {}
+        if use_gzip:
+            headers["Accept-Encoding"] = "gzip"
+        if use_etag and path in etags:
+            headers["If-None-Match"] = etags[path]
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            local_statuses["error"] += 1
+            conn.close()
+            conn = _connect(base_url)
+            continue
+        local_latencies.append(time.perf_counter() - start)
+        local_statuses[response.status] += 1
+        etag = response.getheader("ETag")
+        if etag:
+            etags[path] = etag
+    conn.close()
+    with lock:
+        latencies.extend(local_latencies)
+        statuses.update(local_statuses)
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(q * (len(values) - 1))))
+    return values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the read-only data API.")
+    parser.add_argument("--url", type=str, default="", help="Target base URL (default: start an in-process server).")
+    parser.add_argument("--concurrency", type=int, default=8, help="Number of client threads.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Test duration in seconds.")
+    parser.add_argument("--gzip", action="store_true", help="Send Accept-Encoding: gzip.")
+    parser.add_argument("--etag", action="store_true", help="Revalidate with If-None-Match (expect 304s).")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if not base_url:
+        server, _ = http_api.make_server(port=0, reload_interval=0, quiet=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+
+    paths = default_paths(base_url)
+    print(f"対象: {base_url} / パス {len(paths)}種 / 並列 {args.concurrency} / {args.duration:.0f}秒")
+
+    latencies = []
+    statuses = Counter()
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.duration
+    started = time.perf_counter()
+    threads = [
+        threading.Thread(
+            target=worker,
+            args=(base_url, paths, deadline, args.gzip, args.etag, latencies, statuses, lock),
+        )
+        for _ in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"  requests : {total:,} ({total / elapsed:,.0f} req/s)")
+    print(
+        f"  latency  : p50 {percentile(latencies, 0.5) * 1000:.2f}ms / "
+        f"p95 {percentile(latencies, 0.95) * 1000:.2f}ms / p99 {percentile(latencies, 0.99) * 1000:.2f}ms"
+    )
+    print(f"  status   : {dict(statuses)}")
+
+
+if __name__ == "__main__":
+    main()
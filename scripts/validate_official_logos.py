@@ -1,9 +1,34 @@
+"""
+Validate official team logos in data/teams.json.
+
+Default mode checks team counts per competition and logo URL domains.
+With --check-urls every logo_url / badge_url is also requested (HEAD,
+falling back to a 1-byte ranged GET) concurrently over pooled connections
+with a per-host limit. Results are cached in .cache/logo_health.json;
+healthy URLs are rechecked only after --ttl-hours, failed ones every run.
+"""
+
+import argparse
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Dict, List, Optional
 from urllib.parse import urlparse
 
 ROOT = Path(__file__).resolve().parents[1]
 TEAMS_JSON = ROOT / "data" / "teams.json"
+HEALTH_CACHE_JSON = ROOT / ".cache" / "logo_health.json"
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+REQUEST_TIMEOUT = 15
+DEFAULT_WORKERS = 16
+DEFAULT_PER_HOST = 4
+DEFAULT_TTL_HOURS = 24
+# HEAD を受け付けない/ヘッダーが不十分な場合は Range GET で再確認
+HEAD_FALLBACK_STATUSES = {403, 405, 501}
 
 EXPECTED_COUNTS = {
     "premier": 10,
@@ -43,7 +68,169 @@ def _domain(url: str) -> str:
         return ""
 
 
-def main() -> int:
+def _content_length(response) -> Optional[int]:
+    content_range = response.headers.get("Content-Range", "")
+    if "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+        if total.isdigit():
+            return int(total)
+    length = response.headers.get("Content-Length", "")
+    if length.isdigit() and response.status_code != 206:
+        return int(length)
+    return None
+
+
+class UrlHealthChecker:
+    """Concurrent URL checker with pooled connections and per-host limits."""
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, per_host: int = DEFAULT_PER_HOST):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self._requests = requests
+        self.workers = max(1, workers)
+        self.per_host = max(1, per_host)
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT})
+        adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.per_host)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_slots[host]
+
+    def check(self, url: str) -> Dict[str, object]:
+        started = time.perf_counter()
+        result: Dict[str, object] = {"status": 0, "ok": False, "content_type": "", "bytes": None, "error": ""}
+        try:
+            with self._slot(urlparse(url).netloc):
+                response = self.session.head(url, allow_redirects=True, timeout=REQUEST_TIMEOUT)
+                size = _content_length(response)
+                if response.status_code in HEAD_FALLBACK_STATUSES or (response.ok and size is None):
+                    response = self.session.get(
+                        url,
+                        headers={"Range": "bytes=0-0"},
+                        allow_redirects=True,
+                        stream=True,
+                        timeout=REQUEST_TIMEOUT,
+                    )
+                    response.close()
+                    size = _content_length(response)
+            content_type = response.headers.get("Content-Type", "").split(";")[0].strip()
+            result.update(
+                status=response.status_code,
+                ok=response.ok and content_type.startswith("image/"),
+                content_type=content_type,
+                bytes=size,
+            )
+            if response.ok and not result["ok"]:
+                result["error"] = "not an image"
+        except self._requests.RequestException as exc:
+            result["error"] = type(exc).__name__
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000)
+        result["checked_at"] = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+        return result
+
+    def check_many(self, urls: List[str]) -> Dict[str, Dict[str, object]]:
+        if not urls:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(urls))) as executor:
+            return dict(zip(urls, executor.map(self.check, urls)))
+
+
+def _load_health_cache(path: Path) -> Dict[str, Dict[str, object]]:
+    if not path.exists():
+        return {}
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _is_fresh(entry: Dict[str, object], ttl: timedelta, now: datetime) -> bool:
+    if not entry.get("ok"):
+        return False
+    try:
+        checked_at = datetime.fromisoformat(str(entry.get("checked_at", "")).replace("Z", "+00:00"))
+    except ValueError:
+        return False
+    return now - checked_at < ttl
+
+
+def _format_bytes(value) -> str:
+    return f"{value:,}B" if isinstance(value, int) else "-"
+
+
+def check_logo_urls(
+    teams: Dict[str, dict],
+    workers: int = DEFAULT_WORKERS,
+    per_host: int = DEFAULT_PER_HOST,
+    ttl_hours: float = DEFAULT_TTL_HOURS,
+    cache_path: Path = HEALTH_CACHE_JSON,
+) -> int:
+    """Check every logo_url / badge_url and print a per-team report. Returns the error count."""
+    targets = []
+    for team_id, team in sorted(teams.items()):
+        for field in ("logo_url", "badge_url"):
+            url = (team.get(field) or "").strip()
+            if url:
+                targets.append((team_id, team.get("name", ""), field, url))
+
+    now = datetime.now(timezone.utc)
+    ttl = timedelta(hours=ttl_hours)
+    cache = _load_health_cache(cache_path)
+    urls = sorted({url for *_, url in targets})
+    stale = [url for url in urls if not _is_fresh(cache.get(url, {}), ttl, now)]
+
+    print(f"[URL] checking {len(stale)} of {len(urls)} unique URLs (cached: {len(urls) - len(stale)})")
+    started = time.perf_counter()
+    cache.update(UrlHealthChecker(workers, per_host).check_many(stale))
+    elapsed = time.perf_counter() - started
+
+    # 今回参照しないURLはキャッシュから落とす
+    cache = {url: cache[url] for url in urls}
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with cache_path.open("w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+    errors = 0
+    for team_id, name, field, url in targets:
+        entry = cache[url]
+        mark = "OK " if entry.get("ok") else "NG "
+        detail = entry.get("error") or ""
+        print(
+            f"  {mark} {team_id:<18} {field:<9} {entry.get('status', 0):>3} "
+            f"{entry.get('content_type') or '-':<14} {_format_bytes(entry.get('bytes')):>10} "
+            f"{entry.get('latency_ms', 0):>5}ms  {name}" + (f"  ({detail})" if detail else "")
+        )
+        if not entry.get("ok"):
+            print(f"[URL] {team_id} {field}: {url}")
+            errors += 1
+    print(f"[URL] done in {elapsed:.1f}s, {errors} broken")
+    return errors
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Validate official team logos in data/teams.json.")
+    parser.add_argument("--check-urls", action="store_true", help="Also verify that every logo/badge URL resolves.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent URL checks.")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST, help="Concurrent checks per host.")
+    parser.add_argument(
+        "--ttl-hours",
+        type=float,
+        default=DEFAULT_TTL_HOURS,
+        help="Recheck healthy URLs only after this many hours (0 rechecks all).",
+    )
+    args = parser.parse_args(argv)
+
     if not TEAMS_JSON.exists():
         print(f"teams.json not found: {TEAMS_JSON}")
         return 1
@@ -78,6 +265,9 @@ def main() -> int:
                 print(f"[DOMAIN] {comp}: {team.get('name')} -> {domain}")
                 errors += 1
 
+    if args.check_urls:
+        errors += check_logo_urls(teams, args.workers, args.per_host, args.ttl_hours)
+
     if errors == 0:
         print("OK: All official logos validated.")
         return 0
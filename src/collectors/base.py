@@ -1,24 +1,24 @@
 from abc import ABC, abstractmethod
-import json
 import hashlib
 import re
 import os
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
-from urllib.parse import quote_plus
 from dateutil import parser as date_parser
+from src.repositories.change_feed import diff_matches, record_changes
+from src.repositories.frozen_seasons import is_frozen, split_match_filename
+from src.repositories.match_merge import merge_matches
+from src.repositories.match_repository import load_match_file, ndjson_path_for, write_matches_ndjson
+from src.repositories.team_id_allocator import get_allocator
+from src.repositories.team_master_store import get_store, journal_path_for
+from src.utils import browser
+from src.utils.json_io import write_json_atomic
 try:
     from zoneinfo import ZoneInfo
 except ImportError:  # Python < 3.9
     from backports.zoneinfo import ZoneInfo
 
-try:
-    import requests
-    REQUESTS_AVAILABLE = True
-except ImportError:
-    REQUESTS_AVAILABLE = False
-
 class BaseScraper(ABC):
     # 国際試合の大会ID（同名チームを同一視）
     INTERNATIONAL_COMPETITIONS = {
@@ -112,11 +112,22 @@ class BaseScraper(ABC):
         self._team_master = self._load_team_master()
         self._competition_id = None  # サブクラスで設定
         self._base_team_names = self._build_base_team_names_cache()  # 動的スポンサー検知用
-        self._thesportsdb_api_key = os.environ.get("THESPORTSDB_API_KEY", "3")  # Free tier
-        self._logo_cache = {}  # ロゴURL取得のキャッシュ（メモリ内）
-        self._logo_cache_file = Path("data/team_logos_cache.json")  # 永続キャッシュファイル
-        self._load_logo_cache()  # ファイルからキャッシュ読み込み
+        self._team_name_index = self._build_team_name_index()  # 公式ロゴの同名チーム伝播用
+        # NDJSON（1行1試合）の併記出力
+        self._emit_ndjson = os.environ.get("RUGBY_SCRAPER_NDJSON", "").lower() in {"1", "true", "yes"}
         self._update_team_master = update_team_master
+        # team_id解決キャッシュ: (チーム名, 大会ID) → team_id（マスタ更新時に破棄）
+        self._team_id_cache: Dict[Tuple[str, str], str] = {}
+        self._team_id_cache_hits = 0
+        self._team_id_cache_misses = 0
+        # 過去シーズンのバックフィル用（None の場合は現行シーズン）
+        self.target_season: Optional[str] = None
+        # True の場合のみ凍結済みシーズン（data/frozen_seasons.json）を上書きする
+        self.allow_frozen_write = False
+
+    def _season_or(self, default: str) -> str:
+        """Return the backfill target season, or default for regular runs."""
+        return str(self.target_season) if self.target_season else str(default)
 
     @staticmethod
     def _prefer_selenium_manager() -> None:
@@ -132,7 +143,21 @@ class BaseScraper(ABC):
             parts.append(p)
         os.environ["PATH"] = os.pathsep.join(parts)
     
-    def _load_team_master(self) -> Dict[str, Any]:
+    def _driver_profile(self) -> str:
+        """Resident browser key: scrapers sharing a _setup_driver share a browser."""
+        setup = type(self)._setup_driver
+        return f"{setup.__module__}.{setup.__qualname__}"
+
+    def _acquire_driver(self):
+        """Return a WebDriver (kept resident between scrapes in serve-scheduler)."""
+        return browser.acquire(self._driver_profile(), self._setup_driver)
+
+    def _release_driver(self, driver, failed: bool = False) -> None:
+        """Quit the driver, or hand it back to the resident pool."""
+        browser.release(self._driver_profile(), driver, failed=failed)
+
+    @staticmethod
+    def _load_team_master() -> Dict[str, Any]:
         """Load team master data from data/teams.json."""
         # Try relative to current working directory first
         teams_path = Path("data/teams.json")
@@ -141,30 +166,42 @@ class BaseScraper(ABC):
             base_path = Path(__file__).resolve().parents[2]
             teams_path = base_path / "data" / "teams.json"
         
-        if not teams_path.exists():
+        if not teams_path.exists() and not journal_path_for(teams_path).exists():
             print(f"Warning: teams.json not found at {teams_path}")
             return {}
         
         try:
-            with open(teams_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            # teams.json + ジャーナル（プロセス内で共有し、追記分のみ再生）
+            return get_store(teams_path).load()
         except Exception as e:
             print(f"Warning: Failed to load teams.json: {e}")
             return {}
 
-    def _save_team_master(self) -> bool:
-        """Persist team master data to data/teams.json."""
-        if not self._update_team_master:
+    def _team_store(self):
+        return get_store(self.output_dir.parent / "teams.json")
+
+    def _save_team_updates(self, updates: Dict[str, Dict[str, Any]]) -> bool:
+        """Append field updates of existing teams to the team master journal."""
+        if not self._update_team_master or not updates:
             return False
-        teams_file = self.output_dir.parent / "teams.json"
         try:
-            with open(teams_file, "w", encoding="utf-8") as f:
-                json.dump(self._team_master, f, ensure_ascii=False, indent=2)
-                f.write("\n")
-            return True
+            self._team_store().update(updates)
         except Exception as e:
             print(f"⚠️ チームマスタ保存エラー: {e}")
             return False
+        for team_id, fields in updates.items():
+            if team_id in self._team_master:
+                self._team_master[team_id].update(fields)
+        return True
+
+    def _put_team(self, team_id: str, team: Dict[str, Any]) -> bool:
+        """Append a new team to the team master journal (False if the ID was taken meanwhile)."""
+        if not self._team_store().put(team_id, team):
+            return False
+        self._team_master[team_id] = team
+        self._index_team_name(team_id, team)
+        self._invalidate_team_id_cache()
+        return True
 
     def _should_replace_logo(self, existing_url: str) -> bool:
         """Determine if an official logo should overwrite existing value."""
@@ -182,7 +219,16 @@ class BaseScraper(ABC):
         if not team_logos:
             return
 
-        updated = False
+        updates: Dict[str, Dict[str, str]] = {}
+
+        def apply(target_id: str, team_data: Dict[str, Any], logo_url: str, badge_url: str) -> None:
+            # 同じ実行内で先に適用した公式ロゴは上書きしない
+            pending = updates.get(target_id, {})
+            if logo_url and self._should_replace_logo(pending.get("logo_url") or team_data.get("logo_url", "")):
+                updates.setdefault(target_id, {})["logo_url"] = logo_url
+            if badge_url and self._should_replace_logo(pending.get("badge_url") or team_data.get("badge_url", "")):
+                updates.setdefault(target_id, {})["badge_url"] = badge_url
+
         for team_name, logo_info in team_logos.items():
             if not team_name or not logo_info:
                 continue
@@ -196,30 +242,17 @@ class BaseScraper(ABC):
             if team_id:
                 team_data = self._team_master.get(team_id)
                 if team_data:
-                    if logo_url and self._should_replace_logo(team_data.get("logo_url", "")):
-                        team_data["logo_url"] = logo_url
-                        updated = True
-                    if badge_url and self._should_replace_logo(team_data.get("badge_url", "")):
-                        team_data["badge_url"] = badge_url
-                        updated = True
+                    apply(team_id, team_data, logo_url, badge_url)
 
             # 2) 同名チーム（他大会）も公式ロゴで更新
-            normalized_name = team_name.strip().lower()
-            for other_id, other_data in self._team_master.items():
-                if other_id == team_id:
+            for other_id in self._team_name_index.get(team_name.strip().casefold(), ()):
+                other_data = self._team_master.get(other_id)
+                if other_id == team_id or not other_data:
                     continue
-                if normalized_name == (other_data.get("name", "").strip().lower()) or normalized_name == (
-                    other_data.get("short_name", "").strip().lower()
-                ):
-                    if logo_url and self._should_replace_logo(other_data.get("logo_url", "")):
-                        other_data["logo_url"] = logo_url
-                        updated = True
-                    if badge_url and self._should_replace_logo(other_data.get("badge_url", "")):
-                        other_data["badge_url"] = badge_url
-                        updated = True
+                apply(other_id, other_data, logo_url, badge_url)
 
-        if updated:
-            self._save_team_master()
+        if updates:
+            self._save_team_updates(updates)
     
     def _build_base_team_names_cache(self) -> Dict[str, set]:
         """既存チーム名のキャッシュを構築（動的スポンサー検知用）
@@ -245,6 +278,36 @@ class BaseScraper(ABC):
                     cache[comp_id].add(short_name)
         
         return cache
+
+    def _build_team_name_index(self) -> Dict[str, List[str]]:
+        """name / short_name（casefold）→ team_id のリストを構築"""
+        index: Dict[str, List[str]] = {}
+        for team_id, team_data in self._team_master.items():
+            self._index_team_name(team_id, team_data, index)
+        return index
+
+    def _index_team_name(self, team_id: str, team_data: Dict[str, Any], index: Optional[Dict[str, List[str]]] = None) -> None:
+        if index is None:
+            index = self._team_name_index
+        for field in ("name", "short_name"):
+            key = (team_data.get(field) or "").strip().casefold()
+            if not key:
+                continue
+            ids = index.setdefault(key, [])
+            if team_id not in ids:
+                ids.append(team_id)
+
+    def _invalidate_team_id_cache(self) -> None:
+        """チームマスタ変更時にteam_id解決キャッシュを破棄"""
+        self._team_id_cache.clear()
+
+    def team_id_cache_stats(self) -> Dict[str, int]:
+        """team_id解決キャッシュのヒット/ミス件数"""
+        return {
+            "hits": self._team_id_cache_hits,
+            "misses": self._team_id_cache_misses,
+            "size": len(self._team_id_cache),
+        }
     
     def _is_national_team_variant(self, team_name: str) -> bool:
         """代表チームの派生形かどうか判定
@@ -488,7 +551,7 @@ class BaseScraper(ABC):
             return False
         
         # 新規国代表チーム登録
-        self._team_master[team_id] = {
+        team = {
             "id": team_id,
             "competition_id": competition_id,
             "name": team_name,
@@ -500,12 +563,10 @@ class BaseScraper(ABC):
             "badge_url": "",
         }
         
-        # teams.jsonに保存
-        teams_file = self.output_dir.parent / "teams.json"
+        # ジャーナルに追記（teams.json への反映は compact-team-master）
         try:
-            with open(teams_file, "w", encoding="utf-8") as f:
-                json.dump(self._team_master, f, ensure_ascii=False, indent=2)
-                f.write("\n")
+            if not self._put_team(team_id, team):
+                return False
             print(f"✅ 新規国代表チーム登録: {team_id} ({team_name})")
             return True
         except Exception as e:
@@ -539,106 +600,32 @@ class BaseScraper(ABC):
         
         comp_abbr = comp_abbr_map.get(competition_id, competition_id)
         
-        # 同じ大会の既存チーム数を取得
-        existing_teams = [
-            t for t in self._team_master.values()
-            if t.get('competition_id') == competition_id
-        ]
-        
-        # 次の連番を決定
-        next_num = len(existing_teams) + 1
-        
-        return f"{comp_abbr}_{next_num}"
-    
-    def _load_logo_cache(self) -> None:
-        """永続キャッシュファイルからロゴ情報を読み込み"""
-        if not self._logo_cache_file.exists():
-            return
-        
-        try:
-            with open(self._logo_cache_file, 'r', encoding='utf-8') as f:
-                file_cache = json.load(f)
-                # ファイルキャッシュをメモリキャッシュにロード
-                for team_name, cache_data in file_cache.items():
-                    self._logo_cache[team_name] = {
-                        "logo_url": cache_data.get("logo_url", ""),
-                        "badge_url": cache_data.get("badge_url", ""),
-                    }
-        except Exception as e:
-            print(f"⚠️ ロゴキャッシュ読み込みエラー: {e}")
-    
-    def _save_logo_cache(self) -> None:
-        """ロゴキャッシュをファイルに保存"""
-        try:
-            cache_data = {}
-            for team_name, logo_info in self._logo_cache.items():
-                if logo_info:  # 空辞書は保存しない
-                    cache_data[team_name] = {
-                        "logo_url": logo_info.get("logo_url", ""),
-                        "badge_url": logo_info.get("badge_url", ""),
-                        "fetched_at": datetime.now(timezone.utc).isoformat(),
-                    }
-            
-            self._logo_cache_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self._logo_cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
-                f.write("\n")
-        except Exception as e:
-            print(f"⚠️ ロゴキャッシュ保存エラー: {e}")
+        # 大会ごとのカウンタから採番（data/team_id_counters.json、欠番は再利用しない）
+        store = self._team_store()
+        store.load()  # 他プロセスがジャーナルに登録したIDを反映
+        allocator = get_allocator(store.teams_path, self._team_master)
+        team_id = allocator.allocate(comp_abbr)
+        allocator.save()
+        return team_id
     
     def _fetch_team_logo_from_thesportsdb(self, team_name: str) -> Dict[str, str]:
         """TheSportsDB APIからチームのロゴURLを取得
-        
+
+        レート制限・永続キャッシュ（TTL/ネガティブキャッシュ）は共有クライアント
+        (src.services.logo_client) が担当し、キャッシュは終了時にまとめて保存される。
+
         Args:
             team_name: チーム名（例: "Bath Rugby", "England"）
             
         Returns:
             {"logo_url": "...", "badge_url": "..."} または空辞書
         """
-        if not REQUESTS_AVAILABLE:
-            return {}
-        
-        # キャッシュチェック（メモリ内＋ファイル）
-        if team_name in self._logo_cache:
-            return self._logo_cache[team_name]
-        
-        try:
-            # API Rate Limit対策: 1秒待機
-            import time
-            time.sleep(1.0)
-            
-            # チーム検索API
-            api_base = "https://www.thesportsdb.com/api/v1/json"
-            url = f"{api_base}/{self._thesportsdb_api_key}/searchteams.php?t={quote_plus(team_name)}"
-            
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            teams = data.get("teams") or []
-            if not teams:
-                self._logo_cache[team_name] = {}
-                return {}
-            
-            # 最初のチームのロゴ情報を取得
-            team = teams[0]
-            result = {
-                "logo_url": team.get("strLogo") or "",
-                "badge_url": team.get("strBadge") or "",
-            }
-            
-            # メモリキャッシュに保存
-            self._logo_cache[team_name] = result
-            
-            # ファイルキャッシュにも保存
-            self._save_logo_cache()
-            
-            return result
-            
-        except Exception as e:
-            print(f"⚠️ TheSportsDB APIエラー ({team_name}): {e}")
-            self._logo_cache[team_name] = {}
+        from src.services.logo_client import get_logo_client
+
+        result = get_logo_client().resolve(team_name)
+        if not result:
             return {}
+        return {"logo_url": result["logo_url"], "badge_url": result["badge_url"]}
 
     def _register_club_team_with_logo_provider(self, team_id: str, team_name: str, competition_id: str, logo_provider_func=None) -> bool:
         """クラブチームを登録（ロゴ取得関数を使用）
@@ -686,7 +673,7 @@ class BaseScraper(ABC):
         badge_url = logo_info.get("badge_url", "")
         
         # 新規クラブチーム登録
-        self._team_master[team_id] = {
+        team = {
             "id": team_id,
             "competition_id": competition_id,
             "name": team_name,
@@ -698,13 +685,10 @@ class BaseScraper(ABC):
             "badge_url": badge_url,
         }
         
-        # teams.jsonに保存
-        teams_file = self.output_dir.parent / "teams.json"
+        # ジャーナルに追記（teams.json への反映は compact-team-master）
         try:
-            with open(teams_file, "w", encoding="utf-8") as f:
-                json.dump(self._team_master, f, ensure_ascii=False, indent=2)
-                f.write("\n")
-            
+            if not self._put_team(team_id, team):
+                return False
             logo_status = ""
             if logo_url:
                 logo_status = f" 🖼️ ロゴ取得済み"
@@ -713,6 +697,24 @@ class BaseScraper(ABC):
         except Exception as e:
             print(f"⚠️ チーム登録エラー ({team_id}): {e}")
             return False
+
+    def _allocate_club_team(self, base_team_name: str, team_name: str, competition_id: str, logo_info: dict = None) -> str:
+        """新規クラブチームを採番してジャーナルに登録し、登録できたteam_idを返す
+
+        採番から登録までの間に他プロセスが同じIDを登録した場合は採番し直す。
+
+        Returns:
+            登録したteam_id（ジャーナルへの書き込みに失敗した場合は空文字）
+        """
+        while True:
+            team_id = self._generate_club_team_id(base_team_name, competition_id)
+            if not team_id:
+                return ""
+            if self._register_club_team(team_id, team_name, competition_id, logo_info):
+                return team_id
+            # 登録済み（他プロセスが先に追記）なら次のIDで再試行、それ以外は書き込み失敗
+            if team_id not in self._team_store().teams and team_id not in self._team_master:
+                return ""
     
     def _resolve_team_id(self, team_name: str, competition_id: Optional[str] = None) -> str:
         """Resolve team ID from team name using master data.
@@ -733,7 +735,21 @@ class BaseScraper(ABC):
         """
         if not team_name:
             return ""
-        
+
+        # 同一実行内の再解決はキャッシュから返す（正規化処理をスキップ）
+        cache_key = (team_name.strip(), competition_id or "")
+        cached = self._team_id_cache.get(cache_key)
+        if cached is not None:
+            self._team_id_cache_hits += 1
+            return cached
+        self._team_id_cache_misses += 1
+
+        team_id = self._resolve_team_id_uncached(team_name, competition_id)
+        self._team_id_cache[cache_key] = team_id
+        return team_id
+
+    def _resolve_team_id_uncached(self, team_name: str, competition_id: Optional[str] = None) -> str:
+        """Resolve team ID without consulting the resolution cache."""
         # スポンサー名を除去
         base_team_name = self._normalize_team_name(team_name, competition_id)
         
@@ -747,8 +763,11 @@ class BaseScraper(ABC):
                 
                 # 新規国代表チーム → 自動登録
                 if self._update_team_master:
-                    self._register_national_team(national_team_id, base_team_name, competition_id)
-                    return national_team_id
+                    # 他プロセスが同じIDを先に登録していれば、そのIDをそのまま使う
+                    if self._register_national_team(national_team_id, base_team_name, competition_id):
+                        return national_team_id
+                    if national_team_id in self._team_store().teams:
+                        return national_team_id
                 return ""
         
         # 大会IDが指定されている場合、その大会のチームのみを検索
@@ -764,9 +783,7 @@ class BaseScraper(ABC):
             # マスタに存在しない → 新規クラブチームとして登録
             if competition_id not in self.INTERNATIONAL_COMPETITIONS:
                 if self._update_team_master:
-                    club_team_id = self._generate_club_team_id(base_team_name, competition_id)
-                    self._register_club_team(club_team_id, team_name, competition_id)
-                    return club_team_id
+                    return self._allocate_club_team(base_team_name, team_name, competition_id)
                 return ""
         
         # 全体から検索（後方互換性）
@@ -831,6 +848,8 @@ class BaseScraper(ABC):
         """Assign sequential match IDs after sorting matches.
         
         試合リストをkickoff_utc順にソートし、シーケンス番号を付与してmatch_idを生成。
+        既存のシーズンファイルがある場合、save_to_json のマージで保存済みの
+        match_id が優先される（新規試合のみ追加採番）。
         
         Args:
             matches: List of match dictionaries
@@ -841,47 +860,43 @@ class BaseScraper(ABC):
         if not matches:
             return matches
         
-        # Sort by kickoff_utc
+        # Sort by kickoff_utc (1回のみ; グループ内の順序はこのソート順)
         sorted_matches = sorted(matches, key=lambda m: m.get("kickoff_utc", ""))
         
-        # Group by competition_id, season, round
-        from collections import defaultdict
-        groups = defaultdict(list)
-        
+        # Assign sequential IDs within each (competition_id, season, round) group
+        sequences: Dict[Tuple[str, str, str], int] = {}
         for match in sorted_matches:
             comp_id = match.get("competition_id", "")
-            season = match.get("season", "")
-            round_num = match.get("round", "")
+            # Ensure season and round_num are strings
+            season = str(match.get("season", "")) if match.get("season") else ""
+            round_num = str(match.get("round", "")) if match.get("round") else ""
             key = (comp_id, season, round_num)
-            groups[key].append(match)
-        
-        # Assign sequential IDs within each group
-        result = []
-        for (comp_id, season, round_num), group_matches in groups.items():
-            for seq, match in enumerate(group_matches, start=1):
-                # Ensure season and round_num are strings
-                match["match_id"] = self._generate_match_id(
-                    comp_id, 
-                    str(season) if season else "", 
-                    str(round_num) if round_num else "", 
-                    seq
-                )
-                result.append(match)
+            sequences[key] = sequences.get(key, 0) + 1
+            match["match_id"] = self._generate_match_id(comp_id, season, round_num, sequences[key])
         
-        # Return in original sorted order
-        return sorted(result, key=lambda m: m.get("kickoff_utc", ""))
+        return sorted_matches
     
     @abstractmethod
     def scrape(self):
         pass
     
-    def save_to_json(self, data: Union[List[Dict[str, Any]], Dict[str, Any]], filename: str):
+    def save_to_json(
+        self,
+        data: Union[List[Dict[str, Any]], Dict[str, Any]],
+        filename: str,
+        ndjson: Optional[bool] = None,
+    ):
         """Save data to JSON file.
         
         新ディレクトリ構造対応 + チーム名自動正規化:
         - filename に大会ID/シーズン形式を使用 (例: "w6n/2026")
         - 旧形式 (例: "six-nations-women") もサポート
         - home_team/away_teamからスポンサー名を自動除去
+        - 既存のシーズンファイルとマージし、保存済みの match_id を維持
+          （src/repositories/match_merge.py）。内容が変わらなければ書き込まない
+        - 試合単位の差分を変更フィード（data/changes/.pending.ndjson）に記録
+        - ndjson=True（既定: 環境変数 RUGBY_SCRAPER_NDJSON）の場合、
+          kickoff_utc順の NDJSON ({filename}.ndjson) も併せて出力
         """
         # データがリストの場合、各試合のチーム名を正規化
         if isinstance(data, list):
@@ -898,13 +913,35 @@ class BaseScraper(ABC):
                             self._competition_id
                         )
         
+        comp_id, season = split_match_filename(filename)
+        if not self.allow_frozen_write and is_frozen(comp_id, season):
+            print(f"🧊 凍結済みシーズンのため保存をスキップ: {filename}.json")
+            return
+
         output_path = self.output_dir / f"{filename}.json"
-        
-        # 親ディレクトリを作成（新構造対応）
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(data, ensure_ascii=False, indent=2, fp=f)
+
+        existing: List[Dict[str, Any]] = []
+        if isinstance(data, list) and comp_id:
+            # 保存済みの試合と自然キーで突き合わせ、既存の match_id を維持
+            existing = load_match_file(output_path)
+            if existing:
+                merged, stats = merge_matches(existing, data, self._generate_match_id)
+                data[:] = merged
+                if stats["added"] or stats["changed"] or stats["removed"]:
+                    print(
+                        f"🔀 {filename}: 新規 {stats['added']} / 変更 {stats['changed']} / "
+                        f"削除 {stats['removed']} / 変更なし {stats['unchanged']}"
+                    )
+
+        # 内容が同じ場合は書き込まない（mtime を保持）
+        if write_json_atomic(output_path, data, trailing_newline=False) and isinstance(data, list) and comp_id:
+            # 変更フィード（publish-changes で data/changes/ に公開）
+            record_changes(diff_matches(existing, data), self.output_dir.parent / "changes")
+
+        if ndjson is None:
+            ndjson = self._emit_ndjson
+        if ndjson and isinstance(data, list):
+            write_matches_ndjson(ndjson_path_for(output_path), data)
 
     def _parse_timezone_offset(self, timezone_value: Optional[str]) -> Optional[timezone]:
         if not timezone_value:
@@ -1,5 +1,6 @@
-import requests
-from bs4 import BeautifulSoup
+from src.utils import http
+from bs4 import BeautifulSoup, NavigableString, Tag
+from collections import deque
 from datetime import datetime
 import time
 from typing import List, Dict, Any
@@ -101,6 +102,90 @@ class LeagueOneDivisionsScraper(BaseScraper):
                 return div
         return ""
 
+    # _find_division_near_container と同じ探索範囲
+    DIVISION_ANCESTOR_DEPTH = 6
+    DIVISION_PREVIOUS_LIMIT = 12
+    DIVISION_PREVIOUS_TAGS = frozenset(["div", "p", "h2", "h3", "h4", "span"])
+    DIVISION_MARKERS = (
+        ("div1", ("ディビジョン1", "D1")),
+        ("div2", ("ディビジョン2", "D2")),
+        ("div3", ("ディビジョン3", "D3")),
+    )
+
+    @staticmethod
+    def _counts_string(tag, string) -> bool:
+        """tag.get_text() がこの文字列を含むか（bs4 の interesting_string_types と同じ判定）"""
+        types = tag.interesting_string_types or Tag.MAIN_CONTENT_STRING_TYPES
+        if isinstance(types, type):
+            return type(string) is types
+        return type(string) in types
+
+    def _map_card_divisions(self, soup, containers) -> Dict[int, str]:
+        """全カードの division を文書の1回の走査で求める
+
+        _find_division_near_container と同じ結果を返す:
+        1) カード自身と祖先（6階層）のテキストに含まれる「ディビジョン」表記
+        2) 無ければ直前の見出し等（div/p/h2-h4/span、12要素）の表記
+
+        走査中に直前12要素を保持し、表記を含む文字列から祖先へ division を
+        伝播させるため、祖先ごとの get_text() は行わない。
+
+        Returns:
+            {id(container): "div1" | "div2" | "div3" | ""}
+        """
+        card_ids = {id(container) for container in containers}
+        recent = deque(maxlen=self.DIVISION_PREVIOUS_LIMIT)
+        previous_by_card: Dict[int, List[Any]] = {}
+        subtree_divisions: Dict[int, set] = {}
+
+        for node in soup.descendants:
+            if isinstance(node, NavigableString):
+                stripped = node.strip()
+                if not stripped:
+                    continue
+                found = {div for div, markers in self.DIVISION_MARKERS if any(m in stripped for m in markers)}
+                if not found:
+                    continue
+                for ancestor in node.parents:
+                    if self._counts_string(ancestor, node):
+                        subtree_divisions.setdefault(id(ancestor), set()).update(found)
+                continue
+            if id(node) in card_ids:
+                # find_previous と同じく、文書順で直前のタグ（祖先を含む）
+                previous_by_card[id(node)] = list(reversed(recent))
+            if node.name in self.DIVISION_PREVIOUS_TAGS:
+                recent.append(node)
+
+        def division_of(found: set) -> str:
+            for div, _ in self.DIVISION_MARKERS:
+                if div in found:
+                    return div
+            return ""
+
+        previous_text_divisions: Dict[int, str] = {}
+        result: Dict[int, str] = {}
+        for container in containers:
+            div = ""
+            ancestor = container
+            for _ in range(self.DIVISION_ANCESTOR_DEPTH):
+                if not ancestor:
+                    break
+                div = division_of(subtree_divisions.get(id(ancestor), set()))
+                if div:
+                    break
+                ancestor = ancestor.parent
+            if not div:
+                for node in previous_by_card.get(id(container), []):
+                    key = id(node)
+                    if key not in previous_text_divisions:
+                        # get_text(strip=True) は区切り無しで連結されるため個別に判定（要素ごとに1回）
+                        previous_text_divisions[key] = self._infer_division_from_text(node.get_text(strip=True))
+                    div = previous_text_divisions[key]
+                    if div:
+                        break
+            result[id(container)] = div
+        return result
+
     def _is_placeholder_team(self, team_name: str) -> bool:
         if not team_name:
             return False
@@ -119,14 +204,18 @@ class LeagueOneDivisionsScraper(BaseScraper):
             # 全試合を取得
             all_matches = []
             current_date = datetime.now()
-            year = str(current_date.year - 1) if current_date.month < 12 else str(current_date.year)
+            if self.target_season:
+                # 2026シーズン → 2025年開始
+                year = str(int(self.target_season) - 1)
+            else:
+                year = str(current_date.year - 1) if current_date.month < 12 else str(current_date.year)
             
             url = f"{self.calendar_url}?year={year}"
             headers = {
                 "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
             }
             self.current_url = url
-            response = requests.get(url, headers=headers, timeout=30)
+            response = http.get(url, headers=headers, timeout=30)
             if response.status_code != 200:
                 print(f"ページの取得に失敗: {url}")
                 return None
@@ -278,6 +367,7 @@ class LeagueOneDivisionsScraper(BaseScraper):
         
         # 試合カードのコンテナを取得
         match_containers = soup.find_all('div', class_='c-schedule')
+        card_divisions = self._map_card_divisions(soup, match_containers)
         
         for container in match_containers:
             try:
@@ -315,14 +405,14 @@ class LeagueOneDivisionsScraper(BaseScraper):
                 kickoff = self.format_date_string(self._format_date(date_element))
                 
                 # divisionを事前に推定
-                inferred_div = self._find_division_near_container(container)
+                inferred_div = card_divisions.get(id(container), "")
                 comp_id = f"jrlo-{inferred_div}" if inferred_div else "jrlo"
 
                 # competition_idは後でdivisionに応じて変更
                 # team_idは後で設定（Division分類後に登録）
                 match_info = self.build_match(
                     competition_id=comp_id,  # 仮ID
-                    season=str(datetime.now().year),
+                    season=self._season_or(datetime.now().year),
                     round_name="",
                     status="scheduled",
                     kickoff=kickoff,
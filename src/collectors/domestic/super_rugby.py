@@ -1,7 +1,7 @@
 import io
 import re
 from datetime import datetime, timezone, timedelta
-import requests
+from src.utils import http
 import pdfplumber
 from ..base import BaseScraper
 
@@ -16,7 +16,7 @@ class SuperRugbyPacificScraper(BaseScraper):
             headers = {
                 "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
             }
-            response = requests.get(self.pdf_url, headers=headers, timeout=30)
+            response = http.get(self.pdf_url, headers=headers, timeout=30)
             if response.status_code != 200:
                 print(f"PDFの取得に失敗: {self.pdf_url}")
                 return None
@@ -181,8 +181,9 @@ class EPCRBaseScraper(BaseScraper):
             return None  # 変換できない場合
 
     def scrape(self):
+        failed = False
         try:
-            self.driver = self._setup_driver()
+            self.driver = self._acquire_driver()
             self.driver.get(self.url)
             print(f"ページにアクセス: {self.url}")
             
@@ -197,11 +198,12 @@ class EPCRBaseScraper(BaseScraper):
             return matches
 
         except Exception as e:
+            failed = True
             print(f"スクレイピングエラー: {str(e)}")
             return None
         finally:
             if hasattr(self, 'driver'):
-                self.driver.quit()
+                self._release_driver(self.driver, failed=failed)
 
 class EPCRChampionsCupScraper(EPCRBaseScraper):
     def __init__(self):
@@ -1,5 +1,5 @@
 import re
-import requests
+from src.utils import http
 from datetime import datetime
 from bs4 import BeautifulSoup
 from ..base import BaseScraper
@@ -37,7 +37,7 @@ class RugbyVizScraper(BaseScraper):
         headers = {
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         }
-        html = requests.get(self.config_url, headers=headers, timeout=30).text
+        html = http.get(self.config_url, headers=headers, timeout=30).text
         api_key = self._extract_config_value(html, "apiKey")
         app_id = self._extract_config_value(html, "appId")
         realm_id = self._extract_config_value(html, "realmId")
@@ -81,7 +81,7 @@ class RugbyVizScraper(BaseScraper):
             headers = {
                 "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
             }
-            response = requests.get(self.logos_url, headers=headers, timeout=30)
+            response = http.get(self.logos_url, headers=headers, timeout=30)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.text, 'html.parser')
@@ -167,17 +167,22 @@ class RugbyVizScraper(BaseScraper):
                 "X-APP-ID": config["app_id"],
                 "X-REALM": config["realm_id"],
             }
+            season_id = config.get("season_id") or config["season"]  # API呼び出しには元のseason_id使用
+            if self.target_season:
+                # 202501 形式の年部分だけ差し替える（接尾辞は現行設定に合わせる）
+                suffix = season_id[4:] if season_id and len(season_id) > 4 else ""
+                season_id = f"{self.target_season}{suffix}"
             params = {
                 "clientId": config["client_id"],
                 "provider": config["provider"],
-                "seasonId": config.get("season_id") or config["season"],  # API呼び出しには元のseason_id使用
+                "seasonId": season_id,
                 "compId": str(self.competition_id),
                 "pageSize": 200,
                 "pageNumber": 0,
             }
 
             all_matches = []
-            first_page = requests.get(
+            first_page = http.get(
                 f"{self.api_base}/v1/matches", headers=headers, params=params, timeout=30
             ).json()
             all_matches.extend(first_page.get("data", []))
@@ -185,7 +190,7 @@ class RugbyVizScraper(BaseScraper):
             total_pages = first_page.get("metadata", {}).get("totalPages", 1)
             for page in range(1, total_pages):
                 params["pageNumber"] = page
-                page_data = requests.get(
+                page_data = http.get(
                     f"{self.api_base}/v1/matches", headers=headers, params=params, timeout=30
                 ).json()
                 all_matches.extend(page_data.get("data", []))
@@ -208,7 +213,7 @@ class RugbyVizScraper(BaseScraper):
                 normalized = self.assign_match_ids(normalized)
                 
                 # season決定: configから取得、なければ試合データから判定
-                season = config.get("season")
+                season = self.target_season or config.get("season")
                 if not season:
                     # 最初の試合のkickoffから年を抽出
                     first_kickoff = normalized[0].get("kickoff_utc", "")
@@ -309,10 +314,8 @@ class RugbyVizScraper(BaseScraper):
             # 新規チーム登録（公式ロゴ使用）
             if not self._update_team_master:
                 return ""
-            club_team_id = self._generate_club_team_id(base_team_name, competition_id)
             logo_info = self._get_team_logo_from_cache(team_name)
-            self._register_club_team(club_team_id, team_name, competition_id, logo_info)
-            return club_team_id
+            return self._allocate_club_team(base_team_name, team_name, competition_id, logo_info)
         
         return ""
 
@@ -1,7 +1,7 @@
 import re
 import unicodedata
 from datetime import datetime
-import requests
+from src.utils import http
 from bs4 import BeautifulSoup
 from ..base import BaseScraper
 
@@ -132,7 +132,7 @@ class Top14Scraper(BaseScraper):
             headers = {
                 "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
             }
-            response = requests.get(self.calendar_url, headers=headers, timeout=30)
+            response = http.get(self.calendar_url, headers=headers, timeout=30)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, 'html.parser')
 
@@ -27,6 +27,7 @@ class SixNationsBaseScraper(BaseScraper):
         return self._competition_id
 
     def scrape(self):
+        failed = False
         try:
             self._initialize_driver_and_load_page()
             soup = BeautifulSoup(self.driver.page_source, 'html.parser')
@@ -38,7 +39,7 @@ class SixNationsBaseScraper(BaseScraper):
                 matches = self.assign_match_ids(matches)
                 
                 # Save to file
-                season = str(datetime.now().year)
+                season = self._season_or(datetime.now().year)
                 filename = f"{self._competition_id}/{season}"
                 self.save_to_json(matches, filename)
                 print(f"✅ {len(matches)}試合を保存: {filename}.json")
@@ -46,21 +47,23 @@ class SixNationsBaseScraper(BaseScraper):
             return matches
         except Exception as e:
             import traceback
+            failed = True
             print(f"スクレイピングエラー: {str(e)}")
             traceback.print_exc()
             return None
         finally:
             if self.driver:
-                self.driver.quit()
+                self._release_driver(self.driver, failed=failed)
+                self.driver = None
 
     def _initialize_driver_and_load_page(self):
         from selenium.webdriver.common.by import By
         from selenium.webdriver.support import expected_conditions as EC
         import time
         
-        self.driver = self._setup_driver()
+        self.driver = self._acquire_driver()
         self.apply_timezone_override(self.driver, self.display_timezone)
-        year = str(datetime.now().year)
+        year = self._season_or(datetime.now().year)
         url = f"{self.calendar_url}{year}"
 
         self.driver.get(url)
@@ -280,7 +283,7 @@ class SixNationsBaseScraper(BaseScraper):
 
             return self.build_match(
                 competition_id=self._get_competition_id(),
-                season=str(datetime.now().year),
+                season=self._season_or(datetime.now().year),
                 round_name="",
                 status="",
                 kickoff=kickoff_dt,
@@ -332,7 +335,7 @@ class SixNationsBaseScraper(BaseScraper):
         if not date_string:
             return None
         try:
-            default_dt = datetime(datetime.now().year, 1, 1, 0, 0, 0)
+            default_dt = datetime(int(self._season_or(datetime.now().year)), 1, 1, 0, 0, 0)
             # dayfirst=True を指定して、日付を正しく解釈する (例: "7 Feb" -> 2月7日)
             parsed = date_parser.parse(date_string, fuzzy=True, dayfirst=True, default=default_dt)
             return parsed.replace(tzinfo=ZoneInfo(self.display_timezone))
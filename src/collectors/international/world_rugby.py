@@ -1,6 +1,6 @@
 import re
 from datetime import datetime, timedelta, timezone
-import requests
+from src.utils import http
 from ..base import BaseScraper
 
 
@@ -42,7 +42,7 @@ class WorldRugbyInternationalsScraper(BaseScraper):
             if matches:
                 matches = self.assign_match_ids(matches)
                 
-                season = str(datetime.utcnow().year)
+                season = self._season_or(datetime.utcnow().year)
                 filename = f"{self._competition_id}/{season}"
                 self.save_to_json(matches, filename)
                 print(f"✅ {len(matches)}試合を保存: {filename}.json")
@@ -53,6 +53,9 @@ class WorldRugbyInternationalsScraper(BaseScraper):
             return None
 
     def _date_range(self):
+        if self.target_season:
+            year = int(self.target_season)
+            return f"{year}-01-01", f"{year}-12-31"
         now = datetime.utcnow().date()
         start_date = now - timedelta(days=self.lookback_days)
         end_date = now + timedelta(days=self.lookahead_days)
@@ -65,7 +68,7 @@ class WorldRugbyInternationalsScraper(BaseScraper):
             "startDate": start_date,
             "endDate": end_date,
         }
-        first_page = requests.get(
+        first_page = http.get(
             f"{self.api_base}/rugby/v3/match", params=params, timeout=30
         ).json()
         page_info = first_page.get("pageInfo", {})
@@ -74,7 +77,7 @@ class WorldRugbyInternationalsScraper(BaseScraper):
 
         for page in range(1, total_pages):
             params["page"] = page
-            data = requests.get(
+            data = http.get(
                 f"{self.api_base}/rugby/v3/match", params=params, timeout=30
             ).json()
             matches.extend(self._normalize_matches(data.get("content", [])))
@@ -106,7 +109,7 @@ class WorldRugbyInternationalsScraper(BaseScraper):
             normalized.append(
                 self.build_match(
                     competition_id=self._competition_id,
-                    season=str(datetime.utcnow().year),
+                    season=self._season_or(datetime.utcnow().year),
                     round_name=match.get("eventPhase") or "",
                     status=match.get("status") or "",
                     kickoff=kickoff_utc,
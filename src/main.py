@@ -1,3 +1,4 @@
+import os
 import sys
 from src.collectors.european import EPCRChallengeCupScraper, EPCRChampionsCupScraper, Top14Scraper, GallagherPremiershipScraper, UnitedRugbyChampionshipScraper
 from src.collectors.domestic import LeagueOneDivisionsScraper, SuperRugbyPacificScraper
@@ -10,36 +11,31 @@ from src.collectors.international import (
     WorldRugbyInternationalsScraper,
 )
 
-def scrape_command(scraper_type):
-    """Execute scraping for a specific competition."""
-    scrapers = {
-        "m6n": SixNationsScraper(),
-        "w6n": SixNationsWomensScraper(),
-        "u6n": SixNationsU20Scraper(),
-        "epcr-champions": EPCRChampionsCupScraper(),
-        "epcr-challenge": EPCRChallengeCupScraper(),
-        "t14": Top14Scraper(),
-        "jrlo": LeagueOneDivisionsScraper(),
-        "premier": GallagherPremiershipScraper(),
-        "urc": UnitedRugbyChampionshipScraper(),
-        "srp": SuperRugbyPacificScraper(),
-        "wr": WorldRugbyInternationalsScraper(),
-        "trc": RugbyChampionshipScraper(),
-        "ans": AutumnNationsSeriesScraper(),
-    }
-    
-    if scraper_type not in scrapers:
-        print(f"Unknown scraper type: {scraper_type}")
-        print(f"Available: {', '.join(scrapers.keys())}")
-        sys.exit(1)
-    
-    scraper = scrapers[scraper_type]
+SCRAPERS = {
+    "m6n": SixNationsScraper,
+    "w6n": SixNationsWomensScraper,
+    "u6n": SixNationsU20Scraper,
+    "epcr-champions": EPCRChampionsCupScraper,
+    "epcr-challenge": EPCRChallengeCupScraper,
+    "t14": Top14Scraper,
+    "jrlo": LeagueOneDivisionsScraper,
+    "premier": GallagherPremiershipScraper,
+    "urc": UnitedRugbyChampionshipScraper,
+    "srp": SuperRugbyPacificScraper,
+    "wr": WorldRugbyInternationalsScraper,
+    "trc": RugbyChampionshipScraper,
+    "ans": AutumnNationsSeriesScraper,
+}
+
+def run_scraper(scraper_type):
+    """Scrape one competition and save it. Returns matches, or None on failure."""
+    scraper = SCRAPERS[scraper_type]()
     print(f"Starting scraper for: {scraper_type}")
     matches = scraper.scrape()
     
     if matches is None:
         print(f"✗ No matches found or scraping failed")
-        sys.exit(1)
+        return None
 
     if matches:
         # League Oneは辞書形式で返す（Division別）
@@ -74,6 +70,22 @@ def scrape_command(scraper_type):
             print(f"✓ Saved to data/matches/{save_path}.json")
     else:
         print("⚠️ No matches found (possibly off-season or no fixtures published yet)")
+    return matches
+
+def scrape_command(scraper_type, argv=None):
+    """Execute scraping for a specific competition."""
+    argv = argv or []
+    if "--ndjson" in argv:
+        # スクレイパー生成前に設定（save_to_json が参照）
+        os.environ["RUGBY_SCRAPER_NDJSON"] = "1"
+
+    if scraper_type not in SCRAPERS:
+        print(f"Unknown scraper type: {scraper_type}")
+        print(f"Available: {', '.join(SCRAPERS.keys())}")
+        sys.exit(1)
+    
+    if run_scraper(scraper_type) is None:
+        sys.exit(1)
 
 def extract_teams_command():
     """Extract and consolidate teams from all match data."""
@@ -108,6 +120,66 @@ def generate_metadata_command():
     print("Generating competition metadata...")
     generate_metadata()
 
+def build_fixture_index_command(argv=None):
+    """Build data/index/upcoming.json from match data."""
+    from src.repositories.fixture_index import main as build_fixture_index
+    build_fixture_index(argv)
+
+def query_command(argv=None):
+    """Query match data through the indexed SQLite database."""
+    from src.repositories.sqlite_repository import main as query
+    query(argv)
+
+def export_columnar_command(argv=None):
+    """Export a columnar (Parquet/.npz) snapshot of matches and teams."""
+    from src.repositories.columnar_export import main as export_columnar
+    export_columnar(argv)
+
+def serve_api_command(argv=None):
+    """Serve data/ as a read-only JSON API."""
+    from src.repositories.http_api import main as serve_api
+    serve_api(argv)
+
+def publish_artifacts_command(argv=None):
+    """Emit minified/gzip/brotli data artifacts and data/manifest.json."""
+    from src.repositories.artifact_publisher import main as publish_artifacts
+    publish_artifacts(argv)
+
+def scrape_schedule_command(argv=None):
+    """Show which competitions are due (in-season daily / pre-season weekly / off-season monthly)."""
+    from src.services.scrape_scheduler import main as scrape_schedule
+    scrape_schedule(argv)
+
+def compact_team_master_command(argv=None):
+    """Fold the team master journal into teams.json."""
+    from src.repositories.team_master_store import main as compact_team_master
+    compact_team_master(argv)
+
+def serve_scheduler_command(argv=None):
+    """Run scheduled and triggered scrapes in one warm process."""
+    from src.services.scheduler_daemon import main as serve_scheduler
+    serve_scheduler(argv)
+
+def live_command(argv=None):
+    """Poll live status of matches around kickoff and update season files."""
+    from src.services.live_service import main as live
+    live(argv)
+
+def publish_changes_command(argv=None):
+    """Publish pending match changes to data/changes/ (feed + latest.json)."""
+    from src.repositories.change_feed import main as publish_changes
+    publish_changes(argv)
+
+def backfill_seasons_command(argv=None):
+    """Backfill past seasons (checkpointed, per-host rate limited)."""
+    from src.services.season_backfill import main as backfill_seasons
+    backfill_seasons(argv)
+
+def mirror_logos_command(argv=None):
+    """Mirror official team logos as resized WebP/PNG variants."""
+    from src.services.logo_mirror_service import main as mirror_logos
+    mirror_logos(argv)
+
 def update_team_logos_command():
     """既存チームのロゴURLをTheSportsDB APIから取得して更新"""
     from src.services.team_service import update_team_logos
@@ -118,12 +190,25 @@ def main():
         print("Usage: python -m src.main <command> [args]")
         print("\nCommands:")
         print("  <comp_id>           Scrape specific competition (m6n, premier, etc.)")
+        print("                      --ndjson: also write {season}.ndjson (one match per line)")
         print("  extract-teams       Extract teams from match data")
         print("  update-team-master  Update teams.json from official team lists")
+        print("  compact-team-master Fold data/teams.journal.ndjson (scraper registrations) into teams.json")
         print("  update-competition-master  Update competitions.json from base + official metadata")
         print("  backfill-team-ids   Backfill team_id values in match data")
+        print("  backfill-seasons    Backfill past seasons, e.g. --comp m6n:2020-2025 (frozen after completion)")
         print("  validate-duplicates Check for duplicate teams")
         print("  generate-metadata   Generate competitions_summary.json")
+        print("  build-fixture-index Build data/index/upcoming.json (incremental)")
+        print("  query               Query matches via SQLite (.cache/rugby.sqlite3, incremental)")
+        print("  export-columnar     Export Parquet/.npz snapshot to exports/columnar")
+        print("  serve-api           Serve /competitions, /teams/{id}, /matches (read-only)")
+        print("  scrape-schedule     List competitions due for scraping (--all, --force comp1,comp2)")
+        print("  serve-scheduler     Resident scrape daemon (schedule + POST /scrape/{comp}, warm HTTP/browser/teams)")
+        print("  live                Poll match status around kickoff (wr/trc/ans/premier/urc), adaptive intervals")
+        print("  publish-changes     Publish the match change feed (data/changes/{timestamp}.json + latest.json)")
+        print("  publish-artifacts   Emit precompressed artifacts (data/dist/) and data/manifest.json")
+        print("  mirror-logos        Mirror official logos as WebP/PNG thumbnails (data/logos/)")
         print("  update-logos        Deprecated (use update-team-master for official logos)")
         sys.exit(1)
     
@@ -134,19 +219,43 @@ def main():
         extract_teams_command()
     elif command == "update-team-master":
         update_team_master_command(sys.argv[2:])
+    elif command == "compact-team-master":
+        compact_team_master_command(sys.argv[2:])
     elif command == "update-competition-master":
         update_competition_master_command(sys.argv[2:])
     elif command == "backfill-team-ids":
         backfill_team_ids_command(sys.argv[2:])
+    elif command == "backfill-seasons":
+        backfill_seasons_command(sys.argv[2:])
     elif command == "validate-duplicates":
         validate_duplicates_command()
     elif command == "generate-metadata":
         generate_metadata_command()
+    elif command == "build-fixture-index":
+        build_fixture_index_command(sys.argv[2:])
+    elif command == "query":
+        query_command(sys.argv[2:])
+    elif command == "export-columnar":
+        export_columnar_command(sys.argv[2:])
+    elif command == "serve-api":
+        serve_api_command(sys.argv[2:])
+    elif command == "scrape-schedule":
+        scrape_schedule_command(sys.argv[2:])
+    elif command == "serve-scheduler":
+        serve_scheduler_command(sys.argv[2:])
+    elif command == "live":
+        live_command(sys.argv[2:])
+    elif command == "publish-changes":
+        publish_changes_command(sys.argv[2:])
+    elif command == "publish-artifacts":
+        publish_artifacts_command(sys.argv[2:])
+    elif command == "mirror-logos":
+        mirror_logos_command(sys.argv[2:])
     elif command == "update-logos":
         update_team_logos_command()
     else:
         # Assume it's a scraper type
-        scrape_command(command)
+        scrape_command(command, sys.argv[2:])
 
 if __name__ == "__main__":
     main() 
@@ -0,0 +1,235 @@
+"""
+Publish precompressed data artifacts for the data branch.
+
+For every public JSON artifact under data/ this emits, mirrored under data/dist/:
+- {name}.min.json      minified JSON
+- {name}.min.json.gz   gzip of the minified JSON
+- {name}.min.json.br   brotli of the minified JSON (if brotli is installed)
+
+NDJSON match files only get .gz/.br variants (they are already compact).
+Variants live in a separate tree so that existing "*.json" globs over
+data/matches keep seeing the canonical files only.
+Only the dataset itself is published (PUBLIC_FILES at the top level of
+data/ and everything under PUBLIC_DIRS); state files and caches such as
+scrape_state.json, team_logos_cache.json, team_id_counters.json,
+frozen_seasons.json, teams.journal.ndjson and teams_sources.json stay
+out of data/dist and the manifest.
+data/manifest.json records byte sizes, SHA-256 digests and content ETags
+so that static hosts and clients can pick the smallest encoding and
+validate caches without downloading bodies.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+from fnmatch import fnmatch
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.utils.json_io import dump_json_text, write_json_atomic
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT / "data"
+MANIFEST_JSON = DATA_DIR / "manifest.json"
+DIST_DIRNAME = "dist"
+
+MIN_SUFFIX = ".min.json"
+COMPRESSED_SUFFIXES = (".gz", ".br")
+
+# 公開するデータセット（内部状態・キャッシュは含めない）
+PUBLIC_FILES = ("competitions*.json", "teams.json")
+PUBLIC_DIRS = ("matches", "index", "changes")
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _etag(digest: str) -> str:
+    return f'"{digest[:32]}"'
+
+
+def _is_generated(path: Path) -> bool:
+    name = path.name
+    return name.endswith(MIN_SUFFIX) or name.endswith(COMPRESSED_SUFFIXES)
+
+
+def _is_public(rel_parts: tuple) -> bool:
+    if len(rel_parts) == 1:
+        return any(fnmatch(rel_parts[0], pattern) for pattern in PUBLIC_FILES)
+    return rel_parts[0] in PUBLIC_DIRS
+
+
+def iter_artifacts(data_dir: Path = DATA_DIR) -> Iterator[Path]:
+    """Yield public source artifacts (.json / .ndjson) under data/, excluding generated files."""
+    for path in sorted(data_dir.rglob("*")):
+        if not path.is_file():
+            continue
+        rel_parts = path.relative_to(data_dir).parts
+        if not _is_public(rel_parts) or any(part.startswith(".") for part in rel_parts):
+            continue
+        if path.suffix not in (".json", ".ndjson"):
+            continue
+        if _is_generated(path) or path == data_dir / MANIFEST_JSON.name:
+            continue
+        yield path
+
+
+def _dist_base(path: Path, data_dir: Path) -> Path:
+    """Return the data/dist/ path of the (minified) body for an artifact."""
+    rel = path.relative_to(data_dir)
+    target = data_dir / DIST_DIRNAME / rel
+    if path.suffix == ".json":
+        return target.with_name(path.name[: -len(".json")] + MIN_SUFFIX)
+    return target
+
+
+def _write_bytes_if_changed(path: Path, payload: bytes) -> bool:
+    if path.exists() and path.read_bytes() == payload:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_bytes(payload)
+    tmp_path.replace(path)
+    return True
+
+
+def _variant_entry(path: Path, payload: bytes, data_dir: Path) -> Dict[str, Any]:
+    return {
+        "path": path.relative_to(data_dir).as_posix(),
+        "bytes": len(payload),
+        "sha256": _sha256(payload),
+    }
+
+
+def publish_artifact(path: Path, data_dir: Path = DATA_DIR) -> Optional[Dict[str, Any]]:
+    """Emit minified/compressed variants of one artifact and return its manifest entry."""
+    raw = path.read_bytes()
+    body_path = _dist_base(path, data_dir)
+    entry: Dict[str, Any] = {
+        "bytes": len(raw),
+        "sha256": _sha256(raw),
+        "content_type": "application/x-ndjson" if path.suffix == ".ndjson" else "application/json",
+        "variants": {},
+    }
+
+    if path.suffix == ".json":
+        try:
+            data = json.loads(raw.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            print(f"⚠️ {path.relative_to(data_dir)}: JSON解析失敗のためスキップ ({exc})")
+            return None
+        body = dump_json_text(data, indent=None, trailing_newline=False).encode("utf-8")
+        _write_bytes_if_changed(body_path, body)
+        entry["variants"]["min"] = _variant_entry(body_path, body, data_dir)
+    else:
+        body = raw
+
+    # ETag は表現（エンコーディング）に依存しないコンテンツ基準
+    entry["etag"] = _etag(_sha256(body))
+
+    gz_path = body_path.with_name(body_path.name + ".gz")
+    gz_payload = gzip.compress(body, compresslevel=9, mtime=0)
+    _write_bytes_if_changed(gz_path, gz_payload)
+    entry["variants"]["gzip"] = _variant_entry(gz_path, gz_payload, data_dir)
+
+    if BROTLI_AVAILABLE:
+        br_path = body_path.with_name(body_path.name + ".br")
+        br_payload = brotli.compress(body, quality=11)
+        _write_bytes_if_changed(br_path, br_payload)
+        entry["variants"]["br"] = _variant_entry(br_path, br_payload, data_dir)
+
+    return entry
+
+
+def _remove_orphans(data_dir: Path, published: List[Path]) -> int:
+    """Delete generated variants whose source artifact no longer exists."""
+    dist_dir = data_dir / DIST_DIRNAME
+    if not dist_dir.exists():
+        return 0
+
+    expected = set()
+    for path in published:
+        base = _dist_base(path, data_dir)
+        if path.suffix == ".json":
+            expected.add(base)
+        for suffix in COMPRESSED_SUFFIXES:
+            expected.add(base.with_name(base.name + suffix))
+
+    removed = 0
+    for path in sorted(dist_dir.rglob("*")):
+        if path.is_file() and path not in expected:
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def publish_artifacts(data_dir: Path = DATA_DIR) -> Dict[str, Any]:
+    if not BROTLI_AVAILABLE:
+        print("⚠️ brotli 未インストールのため .br は出力しません (pip install brotli)")
+
+    artifacts: Dict[str, Any] = {}
+    published: List[Path] = []
+    for path in iter_artifacts(data_dir):
+        entry = publish_artifact(path, data_dir)
+        if entry is None:
+            continue
+        artifacts[path.relative_to(data_dir).as_posix()] = entry
+        published.append(path)
+
+    removed = _remove_orphans(data_dir, published)
+
+    manifest_path = data_dir / MANIFEST_JSON.name
+    previous: Dict[str, Any] = {}
+    if manifest_path.exists():
+        try:
+            with manifest_path.open("r", encoding="utf-8") as f:
+                previous = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            previous = {}
+
+    # 内容が変わらない場合は generated_at も据え置き（不要なコミットを避ける）
+    if previous.get("artifacts") == artifacts:
+        manifest = previous
+    else:
+        manifest = {
+            "version": 1,
+            "generated_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            "artifacts": artifacts,
+        }
+    write_json_atomic(manifest_path, manifest)
+
+    raw_total = sum(entry["bytes"] for entry in artifacts.values())
+    smallest_total = sum(
+        min([entry["bytes"]] + [variant["bytes"] for variant in entry["variants"].values()])
+        for entry in artifacts.values()
+    )
+    print(f"✅ アーティファクト出力: {len(artifacts)}件 (孤立ファイル削除 {removed}件)")
+    print(f"  元サイズ合計: {raw_total:,} bytes → 最小エンコーディング合計: {smallest_total:,} bytes")
+    return manifest
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Emit minified/gzip/brotli artifacts and data/manifest.json.")
+    parser.add_argument(
+        "--data-dir",
+        type=str,
+        default=str(DATA_DIR),
+        help="Data directory to publish (default: data/).",
+    )
+    args = parser.parse_args(argv)
+    publish_artifacts(Path(args.data_dir))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Match-level change feed (data/changes/).
+
+Every time a season file is saved, the previous and new versions are
+diffed by match_id using per-match fingerprints (SHA-256 of the
+canonical record), and the changes are appended to
+data/changes/.pending.ndjson. `publish-changes` then turns the pending
+changes of a run into one feed file plus a rolling cursor:
+
+- data/changes/{YYYYMMDDTHHMMSSZ}.json
+    {"id", "generated_at", "previous", "counts", "changes": [...]}
+- data/changes/latest.json
+    {"latest", "path", "generated_at", "change_count", "history": [ids, newest first]}
+
+Each change is keyed by match_id and carries its kinds (added, removed,
+kickoff_changed, venue_changed, broadcasters_changed, updated for any
+other field), the old/new fingerprints, the previous values of the
+changed fields and the full new record, so clients can apply the delta
+without refetching the season file. Clients whose cursor is older than
+the oldest id in history fall back to a full refetch.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.utils.json_io import dump_json_text, write_json_atomic
+
+ROOT = Path(__file__).resolve().parents[2]
+CHANGES_DIR = ROOT / "data" / "changes"
+PENDING_NAME = ".pending.ndjson"
+PUBLISHING_NAME = ".publishing.ndjson"
+LATEST_NAME = "latest.json"
+
+FEED_VERSION = 1
+DEFAULT_KEEP = 100
+
+# 種別ごとに比較するフィールド（それ以外の差分は "updated"）
+TRACKED_FIELDS = {
+    "kickoff_changed": ("kickoff_utc", "kickoff", "timezone"),
+    "venue_changed": ("venue",),
+    "broadcasters_changed": ("broadcasters",),
+}
+
+_append_lock = threading.Lock()
+
+
+def match_fingerprint(match: Dict[str, Any]) -> str:
+    text = json.dumps(match, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def diff_matches(
+    previous: List[Dict[str, Any]],
+    current: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """Return match-level changes between two versions of a season file."""
+    old_by_id = {str(m.get("match_id")): m for m in previous if m.get("match_id")}
+    new_by_id = {str(m.get("match_id")): m for m in current if m.get("match_id")}
+    detected_at = _now_iso()
+    changes: List[Dict[str, Any]] = []
+
+    for match_id, match in new_by_id.items():
+        old = old_by_id.get(match_id)
+        fingerprint = match_fingerprint(match)
+        if old is None:
+            kinds = ["added"]
+            before: Dict[str, Any] = {}
+            previous_fingerprint = None
+        else:
+            previous_fingerprint = match_fingerprint(old)
+            if previous_fingerprint == fingerprint:
+                continue
+            changed_fields = {
+                field for field in set(old) | set(match) if old.get(field) != match.get(field)
+            }
+            kinds = [
+                kind
+                for kind, fields in TRACKED_FIELDS.items()
+                if any(field in changed_fields for field in fields)
+            ]
+            tracked = {field for fields in TRACKED_FIELDS.values() for field in fields}
+            if changed_fields - tracked:
+                kinds.append("updated")
+            before = {field: old.get(field) for field in sorted(changed_fields)}
+        changes.append(
+            {
+                "match_id": match_id,
+                "competition_id": match.get("competition_id", ""),
+                "season": match.get("season", ""),
+                "kinds": kinds,
+                "previous_fingerprint": previous_fingerprint,
+                "fingerprint": fingerprint,
+                "before": before,
+                "match": match,
+                "detected_at": detected_at,
+            }
+        )
+
+    for match_id, old in old_by_id.items():
+        if match_id in new_by_id:
+            continue
+        changes.append(
+            {
+                "match_id": match_id,
+                "competition_id": old.get("competition_id", ""),
+                "season": old.get("season", ""),
+                "kinds": ["removed"],
+                "previous_fingerprint": match_fingerprint(old),
+                "fingerprint": None,
+                "before": {},
+                "match": None,
+                "detected_at": detected_at,
+            }
+        )
+    return changes
+
+
+def record_changes(changes: List[Dict[str, Any]], changes_dir: Path = CHANGES_DIR) -> None:
+    """Append changes to the pending log (published later by publish_changes)."""
+    if not changes:
+        return
+    text = "".join(dump_json_text(change, indent=None) for change in changes)
+    with _append_lock:
+        changes_dir.mkdir(parents=True, exist_ok=True)
+        # 1回の write で追記（O_APPEND のため複数プロセスでも行が混ざらない）
+        with (changes_dir / PENDING_NAME).open("a", encoding="utf-8") as f:
+            f.write(text)
+
+
+def _read_ndjson(path: Path) -> List[Dict[str, Any]]:
+    rows = []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rows.append(json.loads(line))
+            except json.JSONDecodeError:
+                # 書き込み途中で中断された行
+                continue
+    return rows
+
+
+def _load_latest(changes_dir: Path) -> Dict[str, Any]:
+    path = changes_dir / LATEST_NAME
+    if not path.exists():
+        return {}
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def publish_changes(changes_dir: Path = CHANGES_DIR, keep: int = DEFAULT_KEEP) -> Optional[Path]:
+    """Publish pending changes as a feed file and advance latest.json.
+
+    Returns:
+        Path of the new feed file, or None when there was nothing to publish.
+    """
+    pending = changes_dir / PENDING_NAME
+    publishing = changes_dir / PUBLISHING_NAME
+    # 公開中の追記を取りこぼさないよう、先にリネームしてから読む
+    # （前回中断した .publishing.ndjson があれば先頭に含める）
+    changes: List[Dict[str, Any]] = []
+    if publishing.exists():
+        changes.extend(_read_ndjson(publishing))
+    if pending.exists():
+        staged = changes_dir / f".staged-{os.getpid()}.ndjson"
+        os.replace(pending, staged)
+        changes.extend(_read_ndjson(staged))
+        with publishing.open("a", encoding="utf-8") as f:
+            f.write(staged.read_text(encoding="utf-8"))
+        staged.unlink()
+    if not changes:
+        print("✅ 公開する変更なし")
+        return None
+
+    latest = _load_latest(changes_dir)
+    now = datetime.now(timezone.utc)
+    feed_id = now.strftime("%Y%m%dT%H%M%SZ")
+    suffix = 1
+    while (changes_dir / f"{feed_id}.json").exists():
+        suffix += 1
+        feed_id = f"{now.strftime('%Y%m%dT%H%M%SZ')}-{suffix}"
+
+    counts: Dict[str, int] = {}
+    for change in changes:
+        for kind in change.get("kinds", []):
+            counts[kind] = counts.get(kind, 0) + 1
+
+    feed_path = changes_dir / f"{feed_id}.json"
+    write_json_atomic(
+        feed_path,
+        {
+            "version": FEED_VERSION,
+            "id": feed_id,
+            "generated_at": now.isoformat().replace("+00:00", "Z"),
+            "previous": latest.get("latest"),
+            "counts": dict(sorted(counts.items())),
+            "changes": changes,
+        },
+    )
+
+    history = [feed_id] + [item for item in latest.get("history", []) if item != feed_id]
+    for expired in history[max(1, keep):]:
+        (changes_dir / f"{expired}.json").unlink(missing_ok=True)
+    history = history[: max(1, keep)]
+    write_json_atomic(
+        changes_dir / LATEST_NAME,
+        {
+            "version": FEED_VERSION,
+            "latest": feed_id,
+            "path": f"changes/{feed_id}.json",
+            "generated_at": now.isoformat().replace("+00:00", "Z"),
+            "previous": latest.get("latest"),
+            "change_count": len(changes),
+            "history": history,
+        },
+    )
+    publishing.unlink(missing_ok=True)
+
+    summary = " / ".join(f"{kind} {count}" for kind, count in sorted(counts.items()))
+    print(f"✅ 変更フィード公開: {feed_path.relative_to(changes_dir.parent)} ({len(changes)}件: {summary})")
+    return feed_path
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Publish pending match changes to data/changes/.")
+    parser.add_argument("--keep", type=int, default=DEFAULT_KEEP, help="Number of feed files to retain.")
+    args = parser.parse_args(argv)
+    publish_changes(keep=args.keep)
+
+
+if __name__ == "__main__":
+    main()
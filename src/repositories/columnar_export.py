@@ -0,0 +1,311 @@
+"""
+Columnar snapshot export of matches and teams for analytics.
+
+Writes exports/columnar/ (gitignored):
+- matches/competition_id={id}/season={season}/part-0.parquet
+- teams.parquet
+- _schema.json (column types and row counts)
+
+Column types follow docs/JSON_SCHEMA.md. Low-cardinality string columns
+(teams, venues, competition, status, ...) are dictionary-encoded and
+kickoff_utc is stored as a UTC timestamp so jobs can scan it vectorized.
+competition_id and season are hive partition keys and are therefore only
+encoded in the directory names, not inside the files.
+
+pyarrow is optional. Without it, the same layout is written as NumPy .npz
+archives: dictionary columns become `{col}__codes` (int32) + `{col}__values`,
+kickoff_utc becomes datetime64[s] (NaT when unknown) and broadcasters
+become `broadcasters__offsets` + `broadcasters__values`.
+
+The snapshot is built in a temporary sibling directory and swapped in.
+An existing --output directory is only replaced when it is empty or
+holds a previous export (nothing but _schema.json, matches/ and teams.*).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.repositories.match_repository import MATCHES_DIR, iter_match_files, load_match_file
+from src.repositories.team_master_store import load_team_master
+from src.utils.json_io import write_json_atomic
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT / "data"
+TEAMS_JSON = DATA_DIR / "teams.json"
+EXPORT_DIR = ROOT / "exports" / "columnar"
+
+# (column, type) - type: "string" | "dictionary" | "timestamp" | "list"
+MATCH_SCHEMA: Tuple[Tuple[str, str], ...] = (
+    ("match_id", "string"),
+    ("competition_id", "dictionary"),
+    ("season", "dictionary"),
+    ("round", "dictionary"),
+    ("status", "dictionary"),
+    ("kickoff", "string"),
+    ("kickoff_utc", "timestamp"),
+    ("timezone", "dictionary"),
+    ("venue", "dictionary"),
+    ("home_team", "dictionary"),
+    ("away_team", "dictionary"),
+    ("home_team_id", "dictionary"),
+    ("away_team_id", "dictionary"),
+    ("match_url", "string"),
+    ("broadcasters", "list"),
+    ("division", "dictionary"),
+)
+MATCH_PARTITION_COLUMNS = ("competition_id", "season")
+MATCH_FILE_SCHEMA = tuple((column, kind) for column, kind in MATCH_SCHEMA if column not in MATCH_PARTITION_COLUMNS)
+TEAM_SCHEMA: Tuple[Tuple[str, str], ...] = (
+    ("id", "string"),
+    ("competition_id", "dictionary"),
+    ("name", "string"),
+    ("name_ja", "string"),
+    ("short_name", "string"),
+    ("country", "dictionary"),
+    ("division", "dictionary"),
+    ("logo_url", "string"),
+    ("badge_url", "string"),
+)
+
+
+def _parse_kickoff_utc(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _column_values(records: List[Dict[str, Any]], column: str, kind: str) -> List[Any]:
+    if kind == "list":
+        return [[str(v) for v in (record.get(column) or [])] for record in records]
+    if kind == "timestamp":
+        return [_parse_kickoff_utc(record.get(column)) for record in records]
+    return ["" if record.get(column) is None else str(record.get(column)) for record in records]
+
+
+# ----------------------------------------------------------------------
+# Parquet (pyarrow)
+# ----------------------------------------------------------------------
+def _arrow_type(kind: str):
+    if kind == "dictionary":
+        return pa.dictionary(pa.int32(), pa.string())
+    if kind == "timestamp":
+        return pa.timestamp("s", tz="UTC")
+    if kind == "list":
+        return pa.list_(pa.string())
+    return pa.string()
+
+
+def _arrow_table(records: List[Dict[str, Any]], schema: Tuple[Tuple[str, str], ...]):
+    arrays = []
+    fields = []
+    for column, kind in schema:
+        values = _column_values(records, column, kind)
+        if kind == "dictionary":
+            array = pa.array(values, type=pa.string()).dictionary_encode()
+        else:
+            array = pa.array(values, type=_arrow_type(kind))
+        arrays.append(array)
+        fields.append(pa.field(column, _arrow_type(kind)))
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def _write_parquet(path: Path, records: List[Dict[str, Any]], schema: Tuple[Tuple[str, str], ...]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(
+        _arrow_table(records, schema),
+        str(path),
+        compression="zstd",
+        use_dictionary=[column for column, kind in schema if kind == "dictionary"],
+    )
+
+
+# ----------------------------------------------------------------------
+# NumPy fallback
+# ----------------------------------------------------------------------
+def _numpy_arrays(records: List[Dict[str, Any]], schema: Tuple[Tuple[str, str], ...]) -> Dict[str, Any]:
+    arrays: Dict[str, Any] = {}
+    for column, kind in schema:
+        values = _column_values(records, column, kind)
+        if kind == "dictionary":
+            uniques, codes = np.unique(np.array(values, dtype=str), return_inverse=True)
+            arrays[f"{column}__codes"] = codes.astype(np.int32)
+            arrays[f"{column}__values"] = uniques
+        elif kind == "timestamp":
+            arrays[column] = np.array(
+                [np.datetime64(dt.replace(tzinfo=None), "s") if dt else np.datetime64("NaT", "s") for dt in values],
+                dtype="datetime64[s]",
+            )
+        elif kind == "list":
+            lengths = np.array([len(items) for items in values], dtype=np.int32)
+            arrays[f"{column}__offsets"] = np.concatenate(([0], np.cumsum(lengths))).astype(np.int32)
+            arrays[f"{column}__values"] = np.array([item for items in values for item in items], dtype=str)
+        else:
+            arrays[column] = np.array(values, dtype=str)
+    return arrays
+
+
+def _write_npz(path: Path, records: List[Dict[str, Any]], schema: Tuple[Tuple[str, str], ...]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # 非圧縮で保存（np.load で列単位に遅延読込できる）
+    np.savez(str(path), **_numpy_arrays(records, schema))
+
+
+# ----------------------------------------------------------------------
+# Export
+# ----------------------------------------------------------------------
+def _collect_partitions(matches_dir: Path) -> Dict[Tuple[str, str], List[Dict[str, Any]]]:
+    partitions: Dict[Tuple[str, str], List[Dict[str, Any]]] = defaultdict(list)
+    for comp_id, match_file in iter_match_files(matches_dir=matches_dir):
+        for match in load_match_file(match_file):
+            competition_id = str(match.get("competition_id") or comp_id)
+            season = str(match.get("season") or match_file.stem)
+            partitions[(competition_id, season)].append(match)
+    return partitions
+
+
+def _load_teams(path: Path) -> List[Dict[str, Any]]:
+    try:
+        # teams.json + スクレイパーのジャーナル
+        data = load_team_master(path)
+    except (OSError, json.JSONDecodeError):
+        return []
+    if not isinstance(data, dict):
+        return []
+    return [{**team, "id": team.get("id") or team_id} for team_id, team in data.items() if isinstance(team, dict)]
+
+
+def _is_replaceable(output_dir: Path) -> bool:
+    """True if output_dir is missing, empty, or contains only a previous export."""
+    if not output_dir.exists():
+        return True
+    if not output_dir.is_dir():
+        return False
+    names = {path.name for path in output_dir.iterdir()}
+    if not names:
+        return True
+    return "_schema.json" in names and names <= {"_schema.json", "matches", "teams.parquet", "teams.npz"}
+
+
+def export_columnar(
+    output_dir: Path = EXPORT_DIR,
+    matches_dir: Path = MATCHES_DIR,
+    teams_path: Path = TEAMS_JSON,
+    fmt: str = "auto",
+) -> Optional[Dict[str, Any]]:
+    if fmt == "auto":
+        fmt = "parquet" if PYARROW_AVAILABLE else "npz"
+    if fmt == "parquet" and not PYARROW_AVAILABLE:
+        print("⚠️ pyarrow 未インストールのため Parquet を出力できません (pip install pyarrow)")
+        return None
+    if fmt == "npz" and not NUMPY_AVAILABLE:
+        print("⚠️ numpy 未インストールのため .npz を出力できません (pip install numpy)")
+        return None
+
+    writer = _write_parquet if fmt == "parquet" else _write_npz
+    suffix = ".parquet" if fmt == "parquet" else ".npz"
+
+    # スナップショットなので毎回作り直す（削除された大会/シーズンを残さない）
+    # 既存のエクスポート以外が入ったディレクトリは置き換えない
+    if not _is_replaceable(output_dir):
+        print(f"⚠️ 出力先に列指向エクスポート以外のファイルがあるため中止します: {output_dir}")
+        return None
+    output_dir.parent.mkdir(parents=True, exist_ok=True)
+    build_dir = Path(tempfile.mkdtemp(prefix=f".{output_dir.name}.", dir=str(output_dir.parent)))
+    try:
+        summary = _write_snapshot(build_dir, matches_dir, teams_path, fmt, writer, suffix)
+        os.chmod(build_dir, 0o755)
+        if output_dir.exists():
+            stale_dir = build_dir.with_name(f"{build_dir.name}.old")
+            os.replace(output_dir, stale_dir)
+            os.replace(build_dir, output_dir)
+            shutil.rmtree(stale_dir, ignore_errors=True)
+        else:
+            os.replace(build_dir, output_dir)
+    finally:
+        if build_dir.exists():
+            shutil.rmtree(build_dir, ignore_errors=True)
+    print(
+        f"✅ 列指向エクスポート ({fmt}): 試合 {summary['match_count']}件 / "
+        f"パーティション {len(summary['partitions'])} / チーム {summary['team_count']}件 → {output_dir}"
+    )
+    return summary
+
+
+def _write_snapshot(
+    output_dir: Path,
+    matches_dir: Path,
+    teams_path: Path,
+    fmt: str,
+    writer,
+    suffix: str,
+) -> Dict[str, Any]:
+    partitions = _collect_partitions(matches_dir)
+    partition_rows = {}
+    for (competition_id, season), records in sorted(partitions.items()):
+        rel = f"matches/competition_id={competition_id}/season={season}/part-0{suffix}"
+        writer(output_dir / rel, records, MATCH_FILE_SCHEMA)
+        partition_rows[rel] = len(records)
+
+    teams = _load_teams(teams_path)
+    writer(output_dir / f"teams{suffix}", teams, TEAM_SCHEMA)
+
+    summary = {
+        "format": fmt,
+        "schema": {
+            "matches": [{"name": column, "type": kind} for column, kind in MATCH_SCHEMA],
+            "partition_columns": list(MATCH_PARTITION_COLUMNS),
+            "teams": [{"name": column, "type": kind} for column, kind in TEAM_SCHEMA],
+        },
+        "partitions": partition_rows,
+        "match_count": sum(partition_rows.values()),
+        "team_count": len(teams),
+    }
+    write_json_atomic(output_dir / "_schema.json", summary)
+    return summary
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Export matches and teams as a columnar snapshot (Parquet or .npz).")
+    parser.add_argument(
+        "--format",
+        choices=["auto", "parquet", "npz"],
+        default="auto",
+        help="Output format (default: parquet if pyarrow is installed, otherwise npz).",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=str(EXPORT_DIR),
+        help="Output directory (default: exports/columnar).",
+    )
+    args = parser.parse_args(argv)
+    export_columnar(Path(args.output), fmt=args.format)
+
+
+if __name__ == "__main__":
+    main()
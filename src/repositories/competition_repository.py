@@ -1,8 +1,15 @@
 import json
+import re
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 from dateutil import parser as date_parser
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 ROOT = Path(__file__).resolve().parents[2]
 DATA_DIR = ROOT / "data"
 BASE_JSON = DATA_DIR / "competitions_base.json"
@@ -31,6 +38,13 @@ PLACEHOLDER_TEAM_TOKENS = [
 ]
 PLACEHOLDER_TEAM_EXACT = {"TBC", "TBD", "TBA", "-"}
 
+# is_placeholder_team と同じ判定を1本の正規表現で行う（一意なチーム名にのみ適用）
+PLACEHOLDER_TEAM_RE = re.compile(
+    r"^\s*(?:" + "|".join(re.escape(v) for v in sorted(PLACEHOLDER_TEAM_EXACT)) + r")\s*$"
+    + "|" + "|".join(re.escape(token) for token in PLACEHOLDER_TEAM_TOKENS),
+    re.IGNORECASE,
+)
+
 
 def load_base_competitions():
     if not BASE_JSON.exists():
@@ -70,12 +84,104 @@ def is_placeholder_team(team_name: str) -> bool:
     return any(token in value for token in PLACEHOLDER_TEAM_TOKENS)
 
 
+def summarize_matches_loop(matches):
+    """Per-match loop: (teams, seasons, date_range or None)."""
+    teams = set()
+    seasons = set()
+    dates = []
+    for match in matches:
+        if not isinstance(match, dict):
+            continue
+        home_team = match.get("home_team")
+        away_team = match.get("away_team")
+        if home_team and not is_placeholder_team(home_team):
+            teams.add(home_team)
+        if away_team and not is_placeholder_team(away_team):
+            teams.add(away_team)
+        if match.get("season"):
+            seasons.add(str(match.get("season")))
+
+        kickoff = match.get("kickoff") or match.get("kickoff_utc")
+        dt = parse_datetime(kickoff)
+        if dt:
+            dates.append(dt)
+
+    date_range = None
+    if dates:
+        dates_sorted = sorted(dates)
+        date_range = {
+            "start": dates_sorted[0].isoformat(),
+            "end": dates_sorted[-1].isoformat(),
+        }
+    return teams, seasons, date_range
+
+
+def _kickoff_datetime64(match):
+    """UTC datetime64[s] of a match (NaT if unknown), preferring kickoff_utc."""
+    kickoff_utc = match.get("kickoff_utc")
+    if isinstance(kickoff_utc, str) and kickoff_utc.endswith("Z"):
+        # 大半はこの経路（dateutil を通さない）
+        return kickoff_utc[:-1]
+    dt = parse_datetime(match.get("kickoff") or kickoff_utc)
+    if dt is None:
+        return "NaT"
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt.isoformat()
+
+
+def summarize_matches_batch(matches):
+    """Column-wise variant of summarize_matches_loop (same output).
+
+    Team names are deduplicated by a set union of the home/away columns and
+    the placeholder regex runs on unique names only; the date range comes
+    from argmin/argmax over a datetime64 array and only the two extreme
+    kickoffs are parsed with dateutil.
+    """
+    rows = [match for match in matches if isinstance(match, dict)]
+
+    names = {match.get("home_team") for match in rows} | {match.get("away_team") for match in rows}
+    teams = {name for name in names if name and not PLACEHOLDER_TEAM_RE.search(name)}
+    seasons = {str(match.get("season")) for match in rows if match.get("season")}
+
+    if not rows:
+        return teams, seasons, None
+
+    kickoffs = np.array([_kickoff_datetime64(match) for match in rows], dtype="datetime64[s]")
+    valid = ~np.isnat(kickoffs)
+    if not valid.any():
+        return teams, seasons, None
+
+    indices = np.flatnonzero(valid)
+    values = kickoffs[indices]
+    # sorted() は安定ソートなので、同時刻なら start は最初、end は最後の試合
+    start_index = indices[int(np.argmin(values))]
+    end_index = indices[len(values) - 1 - int(np.argmax(values[::-1]))]
+
+    def _iso(match):
+        return parse_datetime(match.get("kickoff") or match.get("kickoff_utc")).isoformat()
+
+    date_range = {
+        "start": _iso(rows[start_index]),
+        "end": _iso(rows[end_index]),
+    }
+    return teams, seasons, date_range
+
+
+def summarize_matches(matches):
+    if NUMPY_AVAILABLE:
+        try:
+            return summarize_matches_batch(matches)
+        except (ValueError, TypeError, AttributeError):
+            # 想定外の日時表記が混ざる場合は従来ループで集計
+            pass
+    return summarize_matches_loop(matches)
+
+
 def build_competitions():
     competitions = []
     for base in load_base_competitions():
-        teams = set()
-        seasons = set()
-        dates = []
+        all_matches = []
         match_count = 0
         last_updated = None
 
@@ -92,34 +198,13 @@ def build_competitions():
                     continue
 
                 match_count += len(matches)
-                for match in matches:
-                    if not isinstance(match, dict):
-                        continue
-                    home_team = match.get("home_team")
-                    away_team = match.get("away_team")
-                    if home_team and not is_placeholder_team(home_team):
-                        teams.add(home_team)
-                    if away_team and not is_placeholder_team(away_team):
-                        teams.add(away_team)
-                    if match.get("season"):
-                        seasons.add(str(match.get("season")))
-
-                    kickoff = match.get("kickoff") or match.get("kickoff_utc")
-                    dt = parse_datetime(kickoff)
-                    if dt:
-                        dates.append(dt)
+                all_matches.extend(matches)
 
                 if path.exists():
                     mtime = datetime.utcfromtimestamp(path.stat().st_mtime)
                     last_updated = max(last_updated, mtime) if last_updated else mtime
 
-        date_range = None
-        if dates:
-            dates_sorted = sorted(dates)
-            date_range = {
-                "start": dates_sorted[0].isoformat(),
-                "end": dates_sorted[-1].isoformat(),
-            }
+        teams, seasons, date_range = summarize_matches(all_matches)
 
         coverage = base.get("coverage") or {
             "broadcast_regions": [],
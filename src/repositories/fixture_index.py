@@ -0,0 +1,279 @@
+"""
+Build fixture indexes from match data (data/index/).
+
+- upcoming.json: every future fixture across all competitions as compact
+  match references, bucketed by ISO week, so "what's on this weekend" can
+  be answered with a single small fetch.
+- teams/{team_id}.json: every match a team plays across competitions,
+  sorted by kickoff.
+
+Rebuilds are incremental: data/index/.sources.json keeps the digest and
+extracted references of every match file, and only files whose size/mtime
+and SHA-256 changed are parsed again. A team_id -> sources reverse map in
+the same state file limits team index rewrites to the affected teams.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from src.repositories.match_repository import MATCHES_DIR, iter_match_files, kickoff_sort_key, load_match_file
+from src.utils.json_io import write_json_atomic
+
+ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT / "data"
+INDEX_DIR = DATA_DIR / "index"
+UPCOMING_JSON = INDEX_DIR / "upcoming.json"
+TEAMS_INDEX_DIR = INDEX_DIR / "teams"
+SOURCES_STATE_JSON = INDEX_DIR / ".sources.json"
+
+STATE_VERSION = 1
+REF_FIELDS = ("match_id", "competition_id", "season", "kickoff_utc", "home_team_id", "away_team_id")
+TEAM_ID_FIELDS = ("home_team_id", "away_team_id")
+
+
+def match_ref(match: Dict[str, Any]) -> Dict[str, str]:
+    """Return the compact reference stored in index files."""
+    return {field: str(match.get(field) or "") for field in REF_FIELDS}
+
+
+def parse_kickoff_utc(value: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def iso_week_key(dt: datetime) -> str:
+    year, week, _ = dt.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _source_key(path: Path, matches_dir: Path) -> str:
+    return path.relative_to(matches_dir).as_posix()
+
+
+def load_sources_state(path: Path = SOURCES_STATE_JSON) -> Dict[str, Any]:
+    if path.exists():
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                state = json.load(f)
+            if isinstance(state, dict) and state.get("version") == STATE_VERSION:
+                state.setdefault("sources", {})
+                return state
+        except (OSError, json.JSONDecodeError):
+            pass
+    return {"version": STATE_VERSION, "sources": {}}
+
+
+def refresh_sources(state: Dict[str, Any], matches_dir: Path = MATCHES_DIR) -> Dict[str, Dict[str, Any]]:
+    """Re-read changed match files into state["sources"].
+
+    Returns:
+        {source_key: previous_entry_or_None} for every added, changed or removed source.
+    """
+    sources: Dict[str, Any] = state["sources"]
+    changed: Dict[str, Dict[str, Any]] = {}
+    seen: Set[str] = set()
+
+    for _, match_file in iter_match_files(matches_dir=matches_dir):
+        key = _source_key(match_file, matches_dir)
+        seen.add(key)
+        stat = match_file.stat()
+        entry = sources.get(key)
+        if entry and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            continue
+
+        digest = _sha256_file(match_file)
+        if entry and entry.get("sha256") == digest:
+            # touch のみ（内容は同じ）
+            entry["size"] = stat.st_size
+            entry["mtime_ns"] = stat.st_mtime_ns
+            continue
+
+        refs = [match_ref(match) for match in load_match_file(match_file)]
+        sources[key] = {
+            "sha256": digest,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "refs": [ref for ref in refs if ref["match_id"]],
+        }
+        changed[key] = entry
+
+    for key in sorted(set(sources) - seen):
+        changed[key] = sources.pop(key)
+
+    return changed
+
+
+def build_upcoming(sources: Dict[str, Any], now: datetime) -> Dict[str, List[Dict[str, str]]]:
+    """Bucket future fixtures by ISO week (kickoff_utc ascending)."""
+    upcoming = []
+    for entry in sources.values():
+        for ref in entry.get("refs", []):
+            dt = parse_kickoff_utc(ref["kickoff_utc"])
+            if dt and dt >= now:
+                upcoming.append((dt, ref))
+
+    upcoming.sort(key=lambda item: (item[0], item[1]["competition_id"], item[1]["match_id"]))
+    weeks: Dict[str, List[Dict[str, str]]] = {}
+    for dt, ref in upcoming:
+        weeks.setdefault(iso_week_key(dt), []).append(ref)
+    return weeks
+
+
+def _ref_team_ids(refs: List[Dict[str, str]]) -> Set[str]:
+    team_ids = set()
+    for ref in refs:
+        for field in TEAM_ID_FIELDS:
+            team_id = ref.get(field)
+            # ファイル名として使えないIDは除外
+            if team_id and "/" not in team_id and not team_id.startswith("."):
+                team_ids.add(team_id)
+    return team_ids
+
+
+def update_team_sources(state: Dict[str, Any], changed: Dict[str, Dict[str, Any]]) -> Set[str]:
+    """Update the team_id -> source keys reverse map for changed sources.
+
+    Returns:
+        team_ids whose index file must be rewritten.
+    """
+    sources: Dict[str, Any] = state["sources"]
+    if "team_sources" not in state:
+        # 逆引きが無い（初回/旧state）場合は全件構築
+        team_sources: Dict[str, Set[str]] = {}
+        for key, entry in sources.items():
+            for team_id in _ref_team_ids(entry.get("refs", [])):
+                team_sources.setdefault(team_id, set()).add(key)
+        state["team_sources"] = {team_id: sorted(keys) for team_id, keys in team_sources.items()}
+        return set(team_sources)
+
+    team_sources = {team_id: set(keys) for team_id, keys in state["team_sources"].items()}
+    affected: Set[str] = set()
+    for key, previous in changed.items():
+        old_teams = _ref_team_ids(previous.get("refs", [])) if previous else set()
+        new_teams = _ref_team_ids(sources[key].get("refs", [])) if key in sources else set()
+        for team_id in old_teams - new_teams:
+            team_sources.get(team_id, set()).discard(key)
+        for team_id in new_teams:
+            team_sources.setdefault(team_id, set()).add(key)
+        affected |= old_teams | new_teams
+
+    state["team_sources"] = {team_id: sorted(keys) for team_id, keys in sorted(team_sources.items()) if keys}
+    return affected
+
+
+def build_team_refs(state: Dict[str, Any], team_id: str) -> List[Dict[str, str]]:
+    """Collect a team's match references from the sources it appears in."""
+    refs = []
+    for key in state["team_sources"].get(team_id, []):
+        for ref in state["sources"].get(key, {}).get("refs", []):
+            if team_id in (ref.get("home_team_id"), ref.get("away_team_id")):
+                refs.append(ref)
+    refs.sort(key=lambda ref: (kickoff_sort_key(ref), ref["competition_id"], ref["match_id"]))
+    return refs
+
+
+def write_team_indexes(state: Dict[str, Any], team_ids: Set[str], teams_dir: Path) -> Dict[str, int]:
+    written = 0
+    removed = 0
+    for team_id in sorted(team_ids):
+        path = teams_dir / f"{team_id}.json"
+        refs = build_team_refs(state, team_id)
+        if not refs:
+            if path.exists():
+                path.unlink()
+                removed += 1
+            continue
+        if _write_index(path, {"team_id": team_id, "match_count": len(refs), "matches": refs}):
+            written += 1
+    return {"written": written, "removed": removed}
+
+
+def _write_index(path: Path, payload: Dict[str, Any]) -> bool:
+    """Write an index file, keeping generated_at when the payload is unchanged."""
+    previous: Dict[str, Any] = {}
+    if path.exists():
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                previous = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            previous = {}
+
+    comparable = {k: v for k, v in previous.items() if k != "generated_at"} if isinstance(previous, dict) else {}
+    if comparable == payload and previous.get("generated_at"):
+        return False
+    document = {"generated_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"), **payload}
+    return write_json_atomic(path, document)
+
+
+def build_fixture_index(
+    index_dir: Path = INDEX_DIR,
+    matches_dir: Path = MATCHES_DIR,
+    now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    now = now or datetime.now(timezone.utc)
+    state_path = index_dir / SOURCES_STATE_JSON.name
+    state = load_sources_state(state_path)
+    changed = refresh_sources(state, matches_dir)
+
+    weeks = build_upcoming(state["sources"], now)
+    match_count = sum(len(refs) for refs in weeks.values())
+    upcoming_written = _write_index(
+        index_dir / UPCOMING_JSON.name,
+        {"match_count": match_count, "weeks": weeks},
+    )
+
+    teams_dir = index_dir / TEAMS_INDEX_DIR.name
+    if not teams_dir.exists():
+        state.pop("team_sources", None)
+    affected_teams = update_team_sources(state, changed)
+    team_result = write_team_indexes(state, affected_teams, teams_dir)
+    write_json_atomic(state_path, state)
+
+    print(
+        f"✅ 試合インデックス: ソース {len(state['sources'])}件 (再読込 {len(changed)}件) / "
+        f"今後の試合 {match_count}件 ({len(weeks)}週)"
+        + ("" if upcoming_written else " - 変更なし")
+    )
+    print(
+        f"✅ チーム別インデックス: 対象チーム {len(affected_teams)}件 / "
+        f"更新 {team_result['written']}件 / 削除 {team_result['removed']}件"
+    )
+    return {"changed": changed, "weeks": weeks, "teams": affected_teams}
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Build data/index/upcoming.json and data/index/teams/{team_id}.json from match data."
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Ignore the incremental state and re-read every match file.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        SOURCES_STATE_JSON.unlink(missing_ok=True)
+    build_fixture_index()
+
+
+if __name__ == "__main__":
+    main()
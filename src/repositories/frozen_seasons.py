@@ -0,0 +1,62 @@
+"""
+Frozen season registry (data/frozen_seasons.json).
+
+Past seasons loaded by the season backfill are frozen: regular scraper
+runs skip writing data/matches/{comp_id}/{season}.json for them, so a
+date rollover or a source that still serves old fixtures can never
+overwrite historical data. Only the backfill (with an explicit refresh)
+writes frozen seasons.
+
+Format: {"m6n": ["2020", "2021"], "jrlo-div1": ["2023"], ...}
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Set, Tuple
+
+from src.utils.json_io import write_json_atomic
+
+ROOT = Path(__file__).resolve().parents[2]
+FROZEN_SEASONS_JSON = ROOT / "data" / "frozen_seasons.json"
+
+_lock = threading.Lock()
+
+
+def load_frozen_seasons(path: Path = FROZEN_SEASONS_JSON) -> Dict[str, Set[str]]:
+    if not path.exists():
+        return {}
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {comp_id: {str(season) for season in seasons} for comp_id, seasons in data.items() if isinstance(seasons, list)}
+
+
+def split_match_filename(filename: str) -> Tuple[str, str]:
+    """Split a save_to_json filename ("m6n/2024") into (comp_id, season)."""
+    if "/" not in filename:
+        return "", ""
+    comp_id, season = filename.rsplit("/", 1)
+    return comp_id, season
+
+
+def is_frozen(comp_id: str, season: str, path: Path = FROZEN_SEASONS_JSON) -> bool:
+    if not comp_id or not season:
+        return False
+    return str(season) in load_frozen_seasons(path).get(comp_id, set())
+
+
+def freeze_seasons(entries: Iterable[Tuple[str, str]], path: Path = FROZEN_SEASONS_JSON) -> bool:
+    """Add (comp_id, season) pairs to the registry. Returns True if the file changed."""
+    with _lock:
+        frozen = load_frozen_seasons(path)
+        for comp_id, season in entries:
+            frozen.setdefault(comp_id, set()).add(str(season))
+        data = {comp_id: sorted(seasons) for comp_id, seasons in sorted(frozen.items()) if seasons}
+        return write_json_atomic(path, data)
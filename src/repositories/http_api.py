@@ -0,0 +1,343 @@
+"""
+Read-only HTTP API over the dataset (stdlib only).
+
+Endpoints:
+- GET /competitions
+- GET /teams/{team_id}          team record + its matches (kickoff order)
+- GET /matches?competition=&team=&from=&to=&limit=
+
+All indexes are built once at startup into an immutable DatasetIndex and
+swapped atomically by a background watcher when a source file's mtime
+changes; request handlers never touch the filesystem. Responses carry
+strong ETags (If-None-Match -> 304) and are gzip-encoded when the client
+accepts it. Encoded bodies are cached per index generation.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from src.repositories.match_repository import MATCHES_DIR, iter_match_files, kickoff_sort_key, load_match_file
+from src.repositories.team_master_store import journal_path_for, load_team_master
+
+ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT / "data"
+TEAMS_JSON = DATA_DIR / "teams.json"
+COMPETITIONS_JSON = DATA_DIR / "competitions.json"
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+RELOAD_INTERVAL = 2.0
+GZIP_MIN_BYTES = 1024
+RESPONSE_CACHE_SIZE = 512
+CACHE_CONTROL = "public, max-age=60"
+
+
+def _load_json(path: Path, default: Any) -> Any:
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return default
+
+
+class Response:
+    """Encoded JSON body with lazily computed gzip variant."""
+
+    __slots__ = ("status", "body", "etag", "_gzip")
+
+    def __init__(self, payload: Any, status: int = 200):
+        self.status = status
+        self.body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+        self._gzip: Optional[bytes] = None
+
+    def gzip_body(self) -> bytes:
+        if self._gzip is None:
+            self._gzip = gzip.compress(self.body, compresslevel=6, mtime=0)
+        return self._gzip
+
+
+class _SortedMatches:
+    """Matches sorted by kickoff_utc with a parallel key list for bisect."""
+
+    __slots__ = ("matches", "keys", "dated")
+
+    def __init__(self, matches: List[Dict[str, Any]]):
+        self.matches = sorted(matches, key=lambda m: (kickoff_sort_key(m), m.get("match_id", "")))
+        self.keys = [m.get("kickoff_utc") or "" for m in self.matches]
+        # kickoff 未定の試合は末尾に並ぶ
+        self.dated = sum(1 for key in self.keys if key)
+
+    def slice(self, date_from: str = "", date_to: str = "") -> List[Dict[str, Any]]:
+        if not date_from and not date_to:
+            return self.matches
+        keys = self.keys[: self.dated]
+        lo = bisect.bisect_left(keys, date_from) if date_from else 0
+        hi = bisect.bisect_right(keys, date_to) if date_to else len(keys)
+        return self.matches[lo:hi]
+
+
+def _source_mtimes(data_dir: Path) -> Dict[str, int]:
+    paths = [data_dir / TEAMS_JSON.name, journal_path_for(data_dir / TEAMS_JSON.name), data_dir / COMPETITIONS_JSON.name]
+    paths.extend(path for _, path in iter_match_files(matches_dir=data_dir / MATCHES_DIR.name))
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[str(path)] = path.stat().st_mtime_ns
+        except OSError:
+            continue
+    return mtimes
+
+
+class DatasetIndex:
+    """Immutable in-memory indexes built from data/ once."""
+
+    def __init__(self, data_dir: Path = DATA_DIR):
+        self.data_dir = Path(data_dir)
+        self.mtimes = _source_mtimes(self.data_dir)
+        self.loaded_at = time.time()
+
+        competitions = _load_json(self.data_dir / COMPETITIONS_JSON.name, [])
+        self.competitions = competitions if isinstance(competitions, list) else []
+        try:
+            # teams.json + スクレイパーのジャーナル
+            teams = dict(load_team_master(self.data_dir / TEAMS_JSON.name))
+        except (OSError, json.JSONDecodeError):
+            teams = {}
+        self.teams: Dict[str, Dict[str, Any]] = teams if isinstance(teams, dict) else {}
+
+        matches: List[Dict[str, Any]] = []
+        for _, path in iter_match_files(matches_dir=self.data_dir / MATCHES_DIR.name):
+            matches.extend(load_match_file(path))
+
+        by_competition: Dict[str, List[Dict[str, Any]]] = {}
+        by_team: Dict[str, List[Dict[str, Any]]] = {}
+        for match in matches:
+            by_competition.setdefault(match.get("competition_id") or "", []).append(match)
+            for field in ("home_team_id", "away_team_id"):
+                team_id = match.get(field)
+                if team_id:
+                    by_team.setdefault(team_id, []).append(match)
+
+        self.all_matches = _SortedMatches(matches)
+        self.by_competition = {key: _SortedMatches(value) for key, value in by_competition.items()}
+        self.by_team = {key: _SortedMatches(value) for key, value in by_team.items()}
+
+        self._responses: "OrderedDict[Tuple, Response]" = OrderedDict()
+        self._lock = threading.Lock()
+        # 固定レスポンスは起動時に作っておく
+        self._responses[("competitions",)] = Response(self.competitions)
+
+    @property
+    def match_count(self) -> int:
+        return len(self.all_matches.matches)
+
+    def is_stale(self) -> bool:
+        return _source_mtimes(self.data_dir) != self.mtimes
+
+    def cached(self, key: Tuple, build) -> Response:
+        with self._lock:
+            response = self._responses.get(key)
+            if response is not None:
+                self._responses.move_to_end(key)
+                return response
+        response = build()
+        with self._lock:
+            self._responses[key] = response
+            if len(self._responses) > RESPONSE_CACHE_SIZE:
+                self._responses.popitem(last=False)
+        return response
+
+    def competitions_response(self) -> Response:
+        return self._responses[("competitions",)]
+
+    def team_response(self, team_id: str) -> Response:
+        def build() -> Response:
+            team = self.teams.get(team_id)
+            if team is None:
+                return Response({"error": f"team not found: {team_id}"}, status=404)
+            entry = self.by_team.get(team_id)
+            return Response({"team": team, "matches": entry.matches if entry else []})
+
+        return self.cached(("team", team_id), build)
+
+    def matches_response(self, competition: str, team: str, date_from: str, date_to: str, limit: int) -> Response:
+        if date_to and len(date_to) == 10:
+            # 日付のみ指定はその日の終わりまで含める
+            date_to += "T23:59:59Z"
+
+        def build() -> Response:
+            if team:
+                source = self.by_team.get(team)
+            elif competition:
+                source = self.by_competition.get(competition)
+            else:
+                source = self.all_matches
+            matches = source.slice(date_from, date_to) if source else []
+            if team and competition:
+                matches = [m for m in matches if m.get("competition_id") == competition]
+            if limit:
+                matches = matches[:limit]
+            return Response(matches)
+
+        return self.cached(("matches", competition, team, date_from, date_to, limit), build)
+
+
+class DatasetHolder:
+    """Holds the current DatasetIndex and swaps it when sources change."""
+
+    def __init__(self, data_dir: Path = DATA_DIR, reload_interval: float = RELOAD_INTERVAL):
+        self.data_dir = Path(data_dir)
+        self.reload_interval = reload_interval
+        self.index = DatasetIndex(self.data_dir)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start_watcher(self) -> None:
+        if self.reload_interval <= 0:
+            return
+        self._thread = threading.Thread(target=self._watch, name="dataset-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.reload_interval):
+            try:
+                if self.index.is_stale():
+                    index = DatasetIndex(self.data_dir)
+                    self.index = index
+                    print(f"🔄 データ再読込: 試合 {index.match_count}件 / チーム {len(index.teams)}件")
+            except Exception as exc:  # noqa: BLE001
+                print(f"⚠️ データ再読込に失敗: {exc}")
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # ヘッダーと本文の2回書き込みで Nagle + 遅延ACK 待ちが起きないようにする
+    disable_nagle_algorithm = True
+    server_version = "RugbyDataAPI/1.0"
+    holder: DatasetHolder = None  # set by make_server
+    quiet = False
+
+    def log_message(self, format: str, *args) -> None:
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def do_HEAD(self) -> None:
+        self._handle(send_body=False)
+
+    def do_GET(self) -> None:
+        self._handle(send_body=True)
+
+    def _route(self) -> Response:
+        index = self.holder.index
+        parts = urlsplit(self.path)
+        path = parts.path.rstrip("/") or "/"
+        if path == "/competitions":
+            return index.competitions_response()
+        if path.startswith("/teams/"):
+            return index.team_response(unquote(path[len("/teams/"):]))
+        if path == "/matches":
+            query = parse_qs(parts.query)
+
+            def param(name: str) -> str:
+                return (query.get(name) or [""])[0].strip()
+
+            limit = param("limit")
+            if limit and not limit.isdigit():
+                return Response({"error": "limit must be a positive integer"}, status=400)
+            return index.matches_response(
+                param("competition"), param("team"), param("from"), param("to"), int(limit or 0)
+            )
+        return Response({"error": f"not found: {path}"}, status=404)
+
+    def _handle(self, send_body: bool) -> None:
+        response = self._route()
+
+        if response.status == 200 and self.headers.get("If-None-Match") == response.etag:
+            self.send_response(304)
+            self.send_header("ETag", response.etag)
+            self.send_header("Cache-Control", CACHE_CONTROL)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = response.body
+        use_gzip = len(body) >= GZIP_MIN_BYTES and "gzip" in (self.headers.get("Accept-Encoding") or "")
+        if use_gzip:
+            body = response.gzip_body()
+
+        self.send_response(response.status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Vary", "Accept-Encoding")
+        if response.status == 200:
+            self.send_header("ETag", response.etag)
+            self.send_header("Cache-Control", CACHE_CONTROL)
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+
+def make_server(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    data_dir: Path = DATA_DIR,
+    reload_interval: float = RELOAD_INTERVAL,
+    quiet: bool = False,
+) -> Tuple[ThreadingHTTPServer, DatasetHolder]:
+    holder = DatasetHolder(data_dir, reload_interval)
+    handler = type("BoundApiHandler", (ApiHandler,), {"holder": holder, "quiet": quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    holder.start_watcher()
+    return server, holder
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve data/ as a read-only JSON API.")
+    parser.add_argument("--host", type=str, default=DEFAULT_HOST, help="Bind address.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Bind port.")
+    parser.add_argument("--data-dir", type=str, default=str(DATA_DIR), help="Data directory.")
+    parser.add_argument(
+        "--reload-interval",
+        type=float,
+        default=RELOAD_INTERVAL,
+        help="Seconds between source mtime checks (0 disables hot reload).",
+    )
+    parser.add_argument("--quiet", action="store_true", help="Disable access logs.")
+    args = parser.parse_args(argv)
+
+    server, holder = make_server(args.host, args.port, Path(args.data_dir), args.reload_interval, args.quiet)
+    index = holder.index
+    print(
+        f"✅ API起動: http://{args.host}:{server.server_port} "
+        f"(試合 {index.match_count}件 / チーム {len(index.teams)}件 / 大会 {len(index.competitions)}件)"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        holder.stop()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
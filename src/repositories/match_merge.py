@@ -0,0 +1,195 @@
+"""
+Stable incremental merge of scraped fixtures into an existing season file.
+
+Scrapers number matches per (competition, season, round) in kickoff order,
+so a single rescheduled or inserted fixture used to shift the match_id of
+every later match in its group. Before a season file is rewritten, the
+freshly scraped matches are matched against the stored ones by a natural
+key, in priority order:
+
+1. source ID: match_url, or a source-provided match_id (World Rugby etc.)
+2. same home/away team (name or team_id) with kickoff within MATCH_WINDOW
+
+Matched fixtures keep their stored match_id (and the stored record when
+nothing else changed); genuinely new fixtures get sequence numbers above
+the highest one ever stored in their group, so IDs are never reused.
+Fixtures that disappeared from the source are dropped, as before.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.repositories.fixture_index import parse_kickoff_utc
+
+MATCH_WINDOW = timedelta(days=7)
+
+_TRAILING_SEQ = re.compile(r"-(\d+)$")
+
+MatchIdFactory = Callable[[str, str, str, int], str]
+
+
+def _file_order_key(match: Dict[str, Any]) -> str:
+    # assign_match_ids / 保存済みファイルと同じ順序（日時未定の試合が先頭）
+    return str(match.get("kickoff_utc") or "")
+
+
+def _group_key(match: Dict[str, Any]) -> Tuple[str, str, str]:
+    return (
+        str(match.get("competition_id") or ""),
+        str(match.get("season") or ""),
+        str(match.get("round") or ""),
+    )
+
+
+def _sequence_of(match_id: str, group: Tuple[str, str, str], make_id: MatchIdFactory) -> Optional[int]:
+    """Return the sequence number if match_id is a generated ID of the group."""
+    found = _TRAILING_SEQ.search(match_id or "")
+    if not found:
+        return None
+    seq = int(found.group(1))
+    return seq if make_id(*group, seq) == match_id else None
+
+
+def _team_keys(match: Dict[str, Any]) -> List[Tuple[str, str, str]]:
+    keys = []
+    home_name = str(match.get("home_team") or "").casefold()
+    away_name = str(match.get("away_team") or "").casefold()
+    if home_name and away_name:
+        keys.append(("name", home_name, away_name))
+    home_id = str(match.get("home_team_id") or "")
+    away_id = str(match.get("away_team_id") or "")
+    if home_id and away_id:
+        keys.append(("id", home_id, away_id))
+    return keys
+
+
+def _kickoff(match: Dict[str, Any]) -> Optional[datetime]:
+    return parse_kickoff_utc(str(match.get("kickoff_utc") or ""))
+
+
+class _ExistingIndex:
+    def __init__(self, existing: List[Dict[str, Any]], make_id: MatchIdFactory):
+        self.by_url: Dict[str, int] = {}
+        self.by_source_id: Dict[str, int] = {}
+        self.by_teams: Dict[Tuple[str, str, str], List[int]] = defaultdict(list)
+        self.kickoffs = [_kickoff(match) for match in existing]
+        self.claimed: set = set()
+        for pos, match in enumerate(existing):
+            url = match.get("match_url") or ""
+            if url:
+                self.by_url.setdefault(url, pos)
+            match_id = str(match.get("match_id") or "")
+            if match_id and _sequence_of(match_id, _group_key(match), make_id) is None:
+                self.by_source_id.setdefault(match_id, pos)
+            for key in _team_keys(match):
+                self.by_teams[key].append(pos)
+
+    def _take(self, pos: Optional[int]) -> Optional[int]:
+        if pos is None or pos in self.claimed:
+            return None
+        self.claimed.add(pos)
+        return pos
+
+    def find(self, match: Dict[str, Any], make_id: MatchIdFactory) -> Optional[int]:
+        url = match.get("match_url") or ""
+        if url:
+            pos = self._take(self.by_url.get(url))
+            if pos is not None:
+                return pos
+        match_id = str(match.get("match_id") or "")
+        if match_id and _sequence_of(match_id, _group_key(match), make_id) is None:
+            pos = self._take(self.by_source_id.get(match_id))
+            if pos is not None:
+                return pos
+
+        kickoff = _kickoff(match)
+        best: Optional[Tuple[timedelta, int]] = None
+        for key in _team_keys(match):
+            for pos in self.by_teams.get(key, ()):
+                if pos in self.claimed:
+                    continue
+                stored = self.kickoffs[pos]
+                if kickoff is None and stored is None:
+                    distance = timedelta(0)
+                elif kickoff is None or stored is None:
+                    # 日時未定 ⇔ 確定の置き換えは最後の候補
+                    distance = MATCH_WINDOW
+                else:
+                    distance = abs(kickoff - stored)
+                if distance <= MATCH_WINDOW and (best is None or (distance, pos) < best):
+                    best = (distance, pos)
+        return self._take(best[1]) if best else None
+
+
+def merge_matches(
+    existing: List[Dict[str, Any]],
+    scraped: List[Dict[str, Any]],
+    make_id: MatchIdFactory,
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Merge scraped matches into the stored season file contents.
+
+    Args:
+        existing: Matches currently stored in the season file
+        scraped: Freshly scraped matches (match_id already assigned)
+        make_id: ID factory (competition_id, season, round, sequence) -> match_id
+
+    Returns:
+        (merged matches in season-file order, counts of added/changed/unchanged/removed)
+    """
+    index = _ExistingIndex(existing, make_id)
+    stats = {"added": 0, "changed": 0, "unchanged": 0, "removed": 0}
+
+    # 既存の採番の最大値（削除済みの試合も含めて再利用しない）
+    max_seq: Dict[Tuple[str, str, str], int] = defaultdict(int)
+    used_ids = set()
+    for match in existing:
+        match_id = str(match.get("match_id") or "")
+        if not match_id:
+            continue
+        used_ids.add(match_id)
+        group = _group_key(match)
+        seq = _sequence_of(match_id, group, make_id)
+        if seq is not None:
+            max_seq[group] = max(max_seq[group], seq)
+
+    merged: List[Dict[str, Any]] = []
+    new_matches: List[Dict[str, Any]] = []
+    for match in sorted(scraped, key=_file_order_key):
+        pos = index.find(match, make_id)
+        if pos is None:
+            new_matches.append(match)
+            continue
+        stored = existing[pos]
+        record = dict(match)
+        if stored.get("match_id"):
+            record["match_id"] = stored["match_id"]
+        if record == stored:
+            merged.append(stored)
+            stats["unchanged"] += 1
+        else:
+            merged.append(record)
+            stats["changed"] += 1
+
+    used_ids.update(str(match.get("match_id") or "") for match in merged)
+    for match in new_matches:
+        record = dict(match)
+        match_id = str(record.get("match_id") or "")
+        group = _group_key(record)
+        needs_id = not match_id or match_id in used_ids or _sequence_of(match_id, group, make_id) is not None
+        if needs_id and make_id(*group, 1):
+            seq = max_seq[group] + 1
+            while make_id(*group, seq) in used_ids:
+                seq += 1
+            max_seq[group] = seq
+            record["match_id"] = make_id(*group, seq)
+        used_ids.add(record["match_id"])
+        merged.append(record)
+        stats["added"] += 1
+
+    stats["removed"] = len(existing) - len(index.claimed)
+    merged.sort(key=_file_order_key)
+    return merged, stats
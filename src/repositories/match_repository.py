@@ -0,0 +1,102 @@
+"""
+Match file access helpers (data/matches/{comp_id}/{season}.json).
+
+Besides the canonical JSON arrays, scrapers can emit an NDJSON sibling
+({season}.ndjson, one match per line sorted by kickoff_utc) so that
+consumers can stream fixtures without loading the whole array.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from src.utils.json_io import write_text_atomic
+
+ROOT = Path(__file__).resolve().parents[2]
+MATCHES_DIR = ROOT / "data" / "matches"
+
+NDJSON_SUFFIX = ".ndjson"
+
+
+def ndjson_path_for(json_path: Path) -> Path:
+    """Return the NDJSON sibling path of a match JSON file."""
+    return Path(json_path).with_suffix(NDJSON_SUFFIX)
+
+
+def kickoff_sort_key(match: Dict[str, Any]):
+    """Sort key by kickoff_utc (matches without kickoff go last)."""
+    kickoff_utc = match.get("kickoff_utc") or ""
+    return (not kickoff_utc, kickoff_utc)
+
+
+def iter_match_files(only: Optional[List[str]] = None, matches_dir: Path = MATCHES_DIR) -> Iterator[tuple]:
+    """Yield (comp_id, path) for every data/matches/{comp_id}/{season}.json file."""
+    if not matches_dir.exists():
+        return
+    for comp_dir in sorted(matches_dir.iterdir()):
+        if not comp_dir.is_dir():
+            continue
+        comp_id = comp_dir.name
+        if only and comp_id not in only:
+            continue
+        for match_file in sorted(comp_dir.glob("*.json")):
+            yield comp_id, match_file
+
+
+def load_match_file(path: Path) -> List[Dict[str, Any]]:
+    """Load a match JSON array (empty list if missing or broken)."""
+    path = Path(path)
+    if not path.exists():
+        return []
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return []
+    if not isinstance(data, list):
+        return []
+    return [match for match in data if isinstance(match, dict)]
+
+
+def write_matches_ndjson(path: Path, matches: Iterable[Dict[str, Any]]) -> bool:
+    """Write matches as NDJSON sorted by kickoff_utc.
+
+    Returns:
+        True if the file was written, False if unchanged.
+    """
+    rows = sorted((m for m in matches if isinstance(m, dict)), key=kickoff_sort_key)
+    text = "".join(json.dumps(match, ensure_ascii=False, separators=(",", ":")) + "\n" for match in rows)
+    return write_text_atomic(Path(path), text)
+
+
+def iter_matches_ndjson(path: Path) -> Iterator[Dict[str, Any]]:
+    """Lazily yield matches from an NDJSON file, one line at a time."""
+    with Path(path).open("r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                match = json.loads(line)
+            except json.JSONDecodeError as exc:
+                print(f"⚠️ {path}:{line_no}: NDJSON解析失敗 ({exc})")
+                continue
+            if isinstance(match, dict):
+                yield match
+
+
+def iter_matches(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield matches of a season file, streaming from the NDJSON sibling when present."""
+    path = Path(path)
+    if path.suffix == NDJSON_SUFFIX:
+        yield from iter_matches_ndjson(path)
+        return
+    ndjson_path = ndjson_path_for(path)
+    if ndjson_path.exists() and (
+        not path.exists() or ndjson_path.stat().st_mtime >= path.stat().st_mtime
+    ):
+        yield from iter_matches_ndjson(ndjson_path)
+        return
+    yield from load_match_file(path)
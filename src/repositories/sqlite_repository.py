@@ -0,0 +1,492 @@
+"""
+SQLite query layer over the match corpus.
+
+Bulk-loads data/matches (season files and legacy flat files), teams.json and
+competitions.json into .cache/rugby.sqlite3 with indexes on kickoff_utc,
+competition_id and the home/away team IDs, so maintenance scripts and
+validators can run indexed SQL instead of Python loops.
+
+Loading is incremental: each source file is tracked by SHA-256 in the
+`files` table and only changed files are re-imported (rows owned by the
+file are replaced, matches are upserted by match_id). When the same
+match_id exists in a season file and a legacy flat file, the season file
+wins.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.repositories.match_repository import MATCHES_DIR, iter_match_files, load_match_file
+from src.repositories.team_master_store import journal_path_for, load_team_master
+
+ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT / "data"
+CACHE_DIR = ROOT / ".cache"
+DB_PATH = CACHE_DIR / "rugby.sqlite3"
+TEAMS_JSON = DATA_DIR / "teams.json"
+COMPETITIONS_JSON = DATA_DIR / "competitions.json"
+
+MATCH_COLUMNS = (
+    "match_id",
+    "competition_id",
+    "season",
+    "round",
+    "status",
+    "kickoff",
+    "kickoff_utc",
+    "timezone",
+    "venue",
+    "home_team",
+    "away_team",
+    "home_team_id",
+    "away_team_id",
+    "match_url",
+)
+TEAM_COLUMNS = (
+    "competition_id",
+    "name",
+    "name_ja",
+    "short_name",
+    "country",
+    "division",
+    "logo_url",
+    "badge_url",
+)
+COMPETITION_COLUMNS = (
+    "name",
+    "short_name",
+    "category",
+    "gender",
+    "age_grade",
+    "tier",
+    "region",
+    "timezone_default",
+)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    row_count INTEGER NOT NULL,
+    loaded_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS matches (
+    {", ".join(f"{col} TEXT NOT NULL DEFAULT ''" if col != "match_id" else "match_id TEXT PRIMARY KEY" for col in MATCH_COLUMNS)},
+    broadcasters TEXT NOT NULL DEFAULT '[]',
+    source_path TEXT NOT NULL,
+    source_kind TEXT NOT NULL,
+    raw TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_matches_kickoff_utc ON matches(kickoff_utc);
+CREATE INDEX IF NOT EXISTS idx_matches_competition ON matches(competition_id, season);
+CREATE INDEX IF NOT EXISTS idx_matches_home_team ON matches(home_team_id, kickoff_utc);
+CREATE INDEX IF NOT EXISTS idx_matches_away_team ON matches(away_team_id, kickoff_utc);
+CREATE INDEX IF NOT EXISTS idx_matches_source ON matches(source_path);
+CREATE TABLE IF NOT EXISTS teams (
+    team_id TEXT PRIMARY KEY,
+    {", ".join(f"{col} TEXT NOT NULL DEFAULT ''" for col in TEAM_COLUMNS)},
+    raw TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_teams_competition ON teams(competition_id);
+CREATE TABLE IF NOT EXISTS competitions (
+    id TEXT PRIMARY KEY,
+    {", ".join(f"{col} TEXT NOT NULL DEFAULT ''" for col in COMPETITION_COLUMNS)},
+    raw TEXT NOT NULL
+);
+"""
+
+MATCH_SOURCE_KINDS = ("season", "legacy")
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    return str(value)
+
+
+def _iter_legacy_match_files(matches_dir: Path) -> Iterator[Path]:
+    if matches_dir.exists():
+        yield from sorted(path for path in matches_dir.glob("*.json") if path.is_file())
+
+
+def _load_json(path: Path) -> Any:
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+class MatchDatabase:
+    """Indexed SQLite view of match, team and competition data."""
+
+    def __init__(self, db_path: Path = DB_PATH, data_dir: Path = DATA_DIR):
+        self.db_path = Path(db_path)
+        self.data_dir = Path(data_dir)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "MatchDatabase":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+    def _rel(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.data_dir).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def _iter_sources(self, include_legacy: bool) -> Iterator[Tuple[str, Path]]:
+        matches_dir = self.data_dir / MATCHES_DIR.name
+        for _, path in iter_match_files(matches_dir=matches_dir):
+            yield "season", path
+        if include_legacy:
+            for path in _iter_legacy_match_files(matches_dir):
+                yield "legacy", path
+        teams_path = self.data_dir / TEAMS_JSON.name
+        for kind, path in (
+            ("teams", teams_path),
+            # ジャーナルへの追記でも teams テーブルを読み直す
+            ("teams", journal_path_for(teams_path)),
+            ("competitions", self.data_dir / COMPETITIONS_JSON.name),
+        ):
+            if path.exists():
+                yield kind, path
+
+    def _file_state(self, rel_path: str) -> Optional[sqlite3.Row]:
+        return self.conn.execute("SELECT * FROM files WHERE path = ?", (rel_path,)).fetchone()
+
+    def _load_matches(self, rel_path: str, kind: str, path: Path) -> int:
+        self.conn.execute("DELETE FROM matches WHERE source_path = ?", (rel_path,))
+        placeholders = ", ".join("?" for _ in range(len(MATCH_COLUMNS) + 4))
+        updates = ", ".join(f"{col} = excluded.{col}" for col in MATCH_COLUMNS[1:])
+        sql = (
+            f"INSERT INTO matches ({', '.join(MATCH_COLUMNS)}, broadcasters, source_path, source_kind, raw) "
+            f"VALUES ({placeholders}) "
+            # season ファイル由来の行は legacy ファイルで上書きしない
+            f"ON CONFLICT(match_id) DO UPDATE SET {updates}, broadcasters = excluded.broadcasters, "
+            "source_path = excluded.source_path, source_kind = excluded.source_kind, raw = excluded.raw "
+            "WHERE excluded.source_kind = 'season' OR matches.source_kind = 'legacy'"
+        )
+        rows = []
+        for match in load_match_file(path):
+            if not match.get("match_id"):
+                continue
+            rows.append(
+                tuple(_text(match.get(col)) for col in MATCH_COLUMNS)
+                + (
+                    json.dumps(match.get("broadcasters") or [], ensure_ascii=False),
+                    rel_path,
+                    kind,
+                    json.dumps(match, ensure_ascii=False),
+                )
+            )
+        self.conn.executemany(sql, rows)
+        return len(rows)
+
+    def _load_teams(self, path: Path) -> int:
+        try:
+            data = dict(load_team_master(self.data_dir / TEAMS_JSON.name))
+        except (OSError, json.JSONDecodeError):
+            data = None
+        if not isinstance(data, dict):
+            return 0
+        self.conn.execute("DELETE FROM teams")
+        rows = [
+            (team_id,)
+            + tuple(_text(team.get(col)) for col in TEAM_COLUMNS)
+            + (json.dumps(team, ensure_ascii=False),)
+            for team_id, team in data.items()
+            if isinstance(team, dict)
+        ]
+        placeholders = ", ".join("?" for _ in range(len(TEAM_COLUMNS) + 2))
+        self.conn.executemany(
+            f"INSERT INTO teams (team_id, {', '.join(TEAM_COLUMNS)}, raw) VALUES ({placeholders})",
+            rows,
+        )
+        return len(rows)
+
+    def _load_competitions(self, path: Path) -> int:
+        data = _load_json(path)
+        if not isinstance(data, list):
+            return 0
+        self.conn.execute("DELETE FROM competitions")
+        rows = [
+            (comp.get("id"),)
+            + tuple(_text(comp.get(col)) for col in COMPETITION_COLUMNS)
+            + (json.dumps(comp, ensure_ascii=False),)
+            for comp in data
+            if isinstance(comp, dict) and comp.get("id")
+        ]
+        placeholders = ", ".join("?" for _ in range(len(COMPETITION_COLUMNS) + 2))
+        self.conn.executemany(
+            f"INSERT INTO competitions (id, {', '.join(COMPETITION_COLUMNS)}, raw) VALUES ({placeholders})",
+            rows,
+        )
+        return len(rows)
+
+    def _remove_source(self, rel_path: str, kind: str) -> None:
+        if kind in MATCH_SOURCE_KINDS:
+            self.conn.execute("DELETE FROM matches WHERE source_path = ?", (rel_path,))
+        elif kind == "teams":
+            self.conn.execute("DELETE FROM teams")
+            # teams.json / ジャーナルの片方だけ消えた場合は残りを次回の sync で読み直す
+            self.conn.execute("DELETE FROM files WHERE kind = 'teams'")
+        elif kind == "competitions":
+            self.conn.execute("DELETE FROM competitions")
+        self.conn.execute("DELETE FROM files WHERE path = ?", (rel_path,))
+
+    def sync(self, include_legacy: bool = True) -> Dict[str, int]:
+        """Import new/changed source files and drop removed ones.
+
+        Returns:
+            {"scanned", "loaded", "removed", "rows"}
+        """
+        stats = {"scanned": 0, "loaded": 0, "removed": 0, "rows": 0}
+        seen = set()
+        season_changed = False
+        with self.conn:
+            for kind, path in self._iter_sources(include_legacy):
+                rel_path = self._rel(path)
+                seen.add(rel_path)
+                stats["scanned"] += 1
+                stat = path.stat()
+                state = self._file_state(rel_path)
+                if state and state["size"] == stat.st_size and state["mtime_ns"] == stat.st_mtime_ns:
+                    continue
+
+                digest = _sha256_file(path)
+                if state and state["sha256"] == digest:
+                    self.conn.execute(
+                        "UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?",
+                        (stat.st_size, stat.st_mtime_ns, rel_path),
+                    )
+                    continue
+
+                if kind == "teams":
+                    row_count = self._load_teams(path)
+                elif kind == "competitions":
+                    row_count = self._load_competitions(path)
+                else:
+                    row_count = self._load_matches(rel_path, kind, path)
+                    season_changed = season_changed or kind == "season"
+
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO files (path, kind, sha256, size, mtime_ns, row_count, loaded_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        rel_path,
+                        kind,
+                        digest,
+                        stat.st_size,
+                        stat.st_mtime_ns,
+                        row_count,
+                        datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+                    ),
+                )
+                stats["loaded"] += 1
+                stats["rows"] += row_count
+
+            for row in self.conn.execute("SELECT path, kind FROM files").fetchall():
+                if row["path"] not in seen:
+                    self._remove_source(row["path"], row["kind"])
+                    season_changed = season_changed or row["kind"] == "season"
+                    stats["removed"] += 1
+
+            if season_changed and include_legacy:
+                # season 側の行が消えた場合に legacy 側の同一 match_id を復元する
+                self._restore_legacy_rows()
+        return stats
+
+    def _restore_legacy_rows(self) -> None:
+        missing = self.conn.execute(
+            "SELECT COUNT(*) FROM files f WHERE f.kind = 'legacy' AND f.row_count > "
+            "(SELECT COUNT(*) FROM matches m WHERE m.source_path = f.path)"
+        ).fetchone()[0]
+        if not missing:
+            return
+        matches_dir = self.data_dir / MATCHES_DIR.name
+        for path in _iter_legacy_match_files(matches_dir):
+            rel_path = self._rel(path)
+            if self._file_state(rel_path):
+                self._load_matches(rel_path, "legacy", path)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        """Run arbitrary SQL and return rows as dicts."""
+        return [dict(row) for row in self.conn.execute(sql, tuple(params)).fetchall()]
+
+    def matches(
+        self,
+        competition: Optional[str] = None,
+        season: Optional[str] = None,
+        team: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        include_legacy: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Return matches (original JSON records) ordered by kickoff_utc.
+
+        date_from/date_to are compared against kickoff_utc as ISO strings
+        (e.g. "2026-02-01" or "2026-02-01T00:00:00Z").
+        """
+        clauses = []
+        params: List[Any] = []
+        if not include_legacy:
+            clauses.append("source_kind = 'season'")
+        if competition:
+            clauses.append("competition_id = ?")
+            params.append(competition)
+        if season:
+            clauses.append("season = ?")
+            params.append(str(season))
+        if team:
+            # OR だと片方のインデックスしか使えないため UNION で両方を使う
+            clauses.append(
+                "match_id IN (SELECT match_id FROM matches WHERE home_team_id = ? "
+                "UNION SELECT match_id FROM matches WHERE away_team_id = ?)"
+            )
+            params.extend([team, team])
+        if date_from:
+            clauses.append("kickoff_utc >= ?")
+            params.append(date_from)
+        if date_to:
+            if len(date_to) == 10:
+                # 日付のみ指定はその日の終わりまで含める
+                date_to += "T23:59:59Z"
+            clauses.append("kickoff_utc != '' AND kickoff_utc <= ?")
+            params.append(date_to)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+
+        sql = "SELECT raw FROM matches"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY kickoff_utc = '', kickoff_utc, match_id"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return [json.loads(row["raw"]) for row in self.conn.execute(sql, params).fetchall()]
+
+    def team(self, team_id: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute("SELECT raw FROM teams WHERE team_id = ?", (team_id,)).fetchone()
+        return json.loads(row["raw"]) if row else None
+
+    def competition(self, competition_id: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute("SELECT raw FROM competitions WHERE id = ?", (competition_id,)).fetchone()
+        return json.loads(row["raw"]) if row else None
+
+
+def _print_rows(rows: List[Dict[str, Any]], as_json: bool) -> None:
+    if as_json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+        return
+    if not rows:
+        print("(0 rows)")
+        return
+    columns = list(rows[0].keys())
+    print("\t".join(columns))
+    for row in rows:
+        print("\t".join(_text(row.get(col)) for col in columns))
+    print(f"({len(rows)} rows)")
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Query match data through an indexed SQLite database.")
+    parser.add_argument("--db", type=str, default=str(DB_PATH), help="SQLite database path.")
+    parser.add_argument("--sql", type=str, default="", help="Run raw SQL (tables: matches, teams, competitions, files).")
+    parser.add_argument("--competition", type=str, default="", help="Filter by competition_id.")
+    parser.add_argument("--season", type=str, default="", help="Filter by season.")
+    parser.add_argument("--team", type=str, default="", help="Filter by home/away team_id.")
+    parser.add_argument("--from", dest="date_from", type=str, default="", help="kickoff_utc lower bound (ISO).")
+    parser.add_argument("--to", dest="date_to", type=str, default="", help="kickoff_utc upper bound (ISO).")
+    parser.add_argument("--status", type=str, default="", help="Filter by status (e.g., fixture, result).")
+    parser.add_argument("--limit", type=int, default=0, help="Maximum number of rows.")
+    parser.add_argument("--legacy", action="store_true", help="Include legacy flat files in match queries.")
+    parser.add_argument("--json", action="store_true", help="Print rows as JSON.")
+    parser.add_argument("--no-sync", action="store_true", help="Skip the incremental import before querying.")
+    args = parser.parse_args(argv)
+
+    with MatchDatabase(Path(args.db)) as db:
+        if not args.no_sync:
+            stats = db.sync()
+            if stats["loaded"] or stats["removed"]:
+                print(
+                    f"🗂️ SQLite同期: 走査 {stats['scanned']} / 取込 {stats['loaded']}ファイル "
+                    f"({stats['rows']}行) / 削除 {stats['removed']}"
+                )
+
+        if args.sql:
+            try:
+                rows = db.execute(args.sql)
+            except sqlite3.Error as exc:
+                print(f"⚠️ SQLエラー: {exc}")
+                raise SystemExit(1)
+            _print_rows(rows, args.json)
+            return
+
+        matches = db.matches(
+            competition=args.competition or None,
+            season=args.season or None,
+            team=args.team or None,
+            date_from=args.date_from or None,
+            date_to=args.date_to or None,
+            status=args.status or None,
+            limit=args.limit or None,
+            include_legacy=args.legacy,
+        )
+        if args.json:
+            print(json.dumps(matches, ensure_ascii=False, indent=2))
+            return
+        _print_rows(
+            [
+                {
+                    "kickoff_utc": m.get("kickoff_utc", ""),
+                    "match_id": m.get("match_id", ""),
+                    "home_team": m.get("home_team", ""),
+                    "away_team": m.get("away_team", ""),
+                    "venue": m.get("venue", ""),
+                }
+                for m in matches
+            ],
+            as_json=False,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Club team ID allocator ({competition}_{sequence}).
+
+New club team IDs used to be derived as "number of teams in the
+competition + 1" (a full scan of the master per registration, and a
+reused ID after a deletion). The allocator keeps one counter per
+competition prefix, seeded once from the highest existing suffix and
+persisted in data/team_id_counters.json next to teams.json, so:
+
+- allocation is O(1) (a dict lookup + increment)
+- IDs are never reused, even after a team is deleted from teams.json
+- an ID that already exists in the master (e.g. registered by another
+  process through the team master journal) is skipped
+
+Shared by BaseScraper registrations and team_service.generate_team_master.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from src.utils.json_io import write_json_atomic
+
+COUNTERS_NAME = "team_id_counters.json"
+
+
+def counters_path_for(teams_path: Path) -> Path:
+    return Path(teams_path).with_name(COUNTERS_NAME)
+
+
+def split_team_id(team_id: str) -> Optional[tuple]:
+    """Return (prefix, sequence) for "{prefix}_{n}" IDs, else None."""
+    prefix, sep, num = str(team_id).rpartition("_")
+    if not sep or not prefix or not num.isdigit():
+        return None
+    return prefix, int(num)
+
+
+def _load_counters(path: Optional[Path]) -> Dict[str, int]:
+    if path is None or not path.exists():
+        return {}
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {str(k): int(v) for k, v in data.items() if isinstance(v, int)}
+
+
+class TeamIdAllocator:
+    """Per-competition counters over a team master mapping."""
+
+    def __init__(self, teams: Mapping[str, Any], counters_path: Optional[Path] = None):
+        # teams は参照を保持（他プロセスの登録がジャーナル経由で反映される）
+        self.teams = teams
+        self.counters_path = counters_path
+        self._counters = _load_counters(counters_path)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.observe(teams.keys())
+        self._dirty = False
+
+    def observe(self, team_ids: Iterable[str]) -> None:
+        """Raise counters to cover IDs added outside the allocator."""
+        for team_id in team_ids:
+            parsed = split_team_id(team_id)
+            if parsed is None:
+                continue
+            prefix, seq = parsed
+            if seq > self._counters.get(prefix, 0):
+                self._counters[prefix] = seq
+                self._dirty = True
+
+    def peek(self, prefix: str) -> int:
+        return self._counters.get(prefix, 0)
+
+    def allocate(self, prefix: str, taken: Iterable[str] = ()) -> str:
+        """Return the next unused ID for prefix (and advance its counter)."""
+        taken = set(taken)
+        with self._lock:
+            seq = self._counters.get(prefix, 0) + 1
+            while f"{prefix}_{seq}" in self.teams or f"{prefix}_{seq}" in taken:
+                seq += 1
+            self._counters[prefix] = seq
+            self._dirty = True
+        return f"{prefix}_{seq}"
+
+    def save(self) -> bool:
+        """Persist counters (merged with the file so concurrent runs never go backwards)."""
+        if self.counters_path is None or not self._dirty:
+            return False
+        with self._lock:
+            merged = _load_counters(self.counters_path)
+            for prefix, seq in self._counters.items():
+                merged[prefix] = max(merged.get(prefix, 0), seq)
+            self._counters = merged
+            self._dirty = False
+            return write_json_atomic(self.counters_path, dict(sorted(merged.items())))
+
+
+_allocators: Dict[str, TeamIdAllocator] = {}
+_allocators_lock = threading.Lock()
+
+
+def get_allocator(teams_path: Path, teams: Mapping[str, Any]) -> TeamIdAllocator:
+    """Return the process-wide allocator for a teams.json (seeded on first use)."""
+    key = str(Path(teams_path).resolve())
+    with _allocators_lock:
+        allocator = _allocators.get(key)
+        if allocator is None or allocator.teams is not teams:
+            allocator = _allocators[key] = TeamIdAllocator(teams, counters_path_for(teams_path))
+        return allocator
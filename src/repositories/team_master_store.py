@@ -0,0 +1,237 @@
+"""
+Team master store: data/teams.json snapshot + append-only journal.
+
+Scrapers used to rewrite the whole teams.json for every registered team
+or logo update, so concurrent scrapers overwrote each other. Mutations
+are now appended as JSON lines to data/teams.journal.ndjson (one write
++ fsync under an exclusive flock per batch):
+
+    {"op": "put", "team_id": "premier_14", "team": {...}, "ts": "..."}
+    {"op": "update", "team_id": "premier_3", "fields": {"logo_url": "..."}, "ts": "..."}
+
+Readers rebuild the state as snapshot + journal replay (under a shared
+lock), and an open store only replays the journal tail written since its
+last read. `compact-team-master` folds the journal back into teams.json
+and truncates it; commands that rewrite teams.json wholesale
+(update-team-master, extract-teams) compact first.
+
+    python -m src.main compact-team-master
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from src.utils.json_io import dump_json_text, write_json_atomic
+
+ROOT = Path(__file__).resolve().parents[2]
+TEAMS_JSON = ROOT / "data" / "teams.json"
+JOURNAL_NAME = "teams.journal.ndjson"
+
+
+def journal_path_for(teams_path: Path) -> Path:
+    return Path(teams_path).with_name(JOURNAL_NAME)
+
+
+def _file_stamp(path: Path) -> Tuple[int, int]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return (0, 0)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def apply_mutation(teams: Dict[str, Any], record: Dict[str, Any]) -> None:
+    team_id = record.get("team_id")
+    if not team_id:
+        return
+    op = record.get("op")
+    if op == "put" and isinstance(record.get("team"), dict):
+        teams[team_id] = record["team"]
+    elif op == "update" and team_id in teams:
+        teams[team_id].update(record.get("fields") or {})
+
+
+def _replay(f, teams: Dict[str, Any]) -> int:
+    """Apply complete journal lines from the current position; return the end offset."""
+    offset = f.tell()
+    for line in f:
+        if not line.endswith(b"\n"):
+            # 書き込み途中の行（次回読み直す）
+            break
+        offset += len(line)
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            apply_mutation(teams, json.loads(line))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+    return offset
+
+
+class TeamMasterStore:
+    """teams.json + journal for one data directory (shared per process via get_store)."""
+
+    def __init__(self, teams_path: Path = TEAMS_JSON):
+        self.teams_path = Path(teams_path)
+        self.journal_path = journal_path_for(self.teams_path)
+        self.teams: Dict[str, Any] = {}
+        self._snapshot_stamp: Optional[Tuple[int, int]] = None
+        self._offset = 0
+        self._lock = threading.RLock()
+
+    @contextmanager
+    def _locked(self, exclusive: bool) -> Iterator[Any]:
+        """Open the journal (creating it) under a process-wide flock."""
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, self.journal_path.open("a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield f
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _catch_up(self, f) -> None:
+        """Bring self.teams up to date (caller holds the lock)."""
+        snapshot_stamp = _file_stamp(self.teams_path)
+        journal_size = os.fstat(f.fileno()).st_size if f is not None else 0
+        if snapshot_stamp != self._snapshot_stamp or journal_size < self._offset:
+            # 初回 / compaction 後 / teams.json の外部更新: 全体を読み直す
+            snapshot: Dict[str, Any] = {}
+            if self.teams_path.exists():
+                with self.teams_path.open("r", encoding="utf-8") as snap:
+                    snapshot = json.load(snap)
+            # 共有している dict を差し替えずに中身を更新する
+            self.teams.clear()
+            self.teams.update(snapshot)
+            self._snapshot_stamp = snapshot_stamp
+            self._offset = 0
+        if journal_size > self._offset:
+            f.seek(self._offset)
+            self._offset = _replay(f, self.teams)
+
+    def load(self) -> Dict[str, Any]:
+        """Return the current team master (the same dict object on every call)."""
+        if not self.journal_path.exists():
+            # ジャーナル未作成（読み取り専用の利用者はファイルを作らない）
+            with self._lock:
+                self._catch_up(None)
+            return self.teams
+        with self._locked(exclusive=False) as f:
+            self._catch_up(f)
+        return self.teams
+
+    def append(self, records: List[Dict[str, Any]], if_absent: bool = False) -> List[Dict[str, Any]]:
+        """Append mutations to the journal and apply them.
+
+        Other processes' appends are replayed first, so with if_absent=True a
+        "put" for a team_id registered elsewhere in the meantime is skipped.
+
+        Returns:
+            The records actually written.
+        """
+        with self._locked(exclusive=True) as f:
+            self._catch_up(f)
+            written = []
+            for record in records:
+                if if_absent and record.get("op") == "put" and record.get("team_id") in self.teams:
+                    continue
+                written.append(dict(record, ts=record.get("ts") or _now_iso()))
+            if not written:
+                return []
+            f.seek(0, os.SEEK_END)
+            f.write("".join(dump_json_text(record, indent=None) for record in written).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+            for record in written:
+                apply_mutation(self.teams, record)
+            self._offset = f.tell()
+        return written
+
+    def put(self, team_id: str, team: Dict[str, Any]) -> bool:
+        """Register a team unless the team_id already exists (in any process)."""
+        return bool(self.append([{"op": "put", "team_id": team_id, "team": team}], if_absent=True))
+
+    def update(self, updates: Dict[str, Dict[str, Any]]) -> int:
+        """Update fields of existing teams ({team_id: {field: value}})."""
+        records = [
+            {"op": "update", "team_id": team_id, "fields": fields}
+            for team_id, fields in updates.items()
+            if fields
+        ]
+        return len(self.append(records)) if records else 0
+
+    def compact(self) -> int:
+        """Fold the journal into teams.json and truncate it; return folded record count."""
+        if not self.journal_path.exists():
+            return 0
+        with self._locked(exclusive=True) as f:
+            self._catch_up(f)
+            f.seek(0)
+            count = sum(1 for line in f if line.strip())
+            if count == 0:
+                return 0
+            write_json_atomic(self.teams_path, self.teams)
+            f.truncate(0)
+            f.flush()
+            os.fsync(f.fileno())
+            self._snapshot_stamp = _file_stamp(self.teams_path)
+            self._offset = 0
+        return count
+
+
+_stores: Dict[str, TeamMasterStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(teams_path: Path = TEAMS_JSON) -> TeamMasterStore:
+    key = str(Path(teams_path).resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = TeamMasterStore(Path(teams_path))
+        return store
+
+
+def load_team_master(teams_path: Path = TEAMS_JSON) -> Dict[str, Any]:
+    """Snapshot + journal replay for read-only consumers."""
+    return get_store(teams_path).load()
+
+
+def compact_team_master(teams_path: Path = TEAMS_JSON) -> int:
+    return get_store(teams_path).compact()
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Fold data/teams.journal.ndjson into data/teams.json.")
+    parser.add_argument("--teams", type=Path, default=TEAMS_JSON, help="Path to teams.json.")
+    args = parser.parse_args(argv)
+
+    count = compact_team_master(args.teams)
+    if count:
+        print(f"✅ チームマスタのジャーナルを反映: {count}件 → {args.teams.name}")
+    else:
+        print("✅ 反映するジャーナルなし")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,84 +3,185 @@ Competition master updater (hybrid).
 
 Base template: data/competitions_base.json
 Official site auto-fill: logo_url / official_sites (og:url) when available.
+
+Official sites are fetched concurrently (asyncio + a thread pool running
+requests) with a per-host limit. Each response is streamed and reading
+stops at </head>; only the head is tokenized with html.parser.
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
+import codecs
 import json
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from src.utils.json_io import write_json_atomic
 
 ROOT = Path(__file__).resolve().parents[2]
 DATA_DIR = ROOT / "data"
 BASE_JSON = DATA_DIR / "competitions_base.json"
 OUT_JSON = DATA_DIR / "competitions.json"
 
-
-def _fetch_official_meta(url: str) -> dict:
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    }
-    response = requests.get(url, headers=headers, timeout=30)
-    response.raise_for_status()
-    soup = BeautifulSoup(response.text, "html.parser")
-
-    def meta(prop: str) -> str:
-        tag = soup.find("meta", property=prop)
-        if tag and tag.get("content"):
-            return tag["content"].strip()
-        return ""
-
-    og_title = meta("og:title")
-    og_image = meta("og:image")
-    og_url = meta("og:url")
-
-    # favicon fallback
-    icon = ""
-    icon_tag = soup.find("link", rel=lambda v: v and "icon" in v.lower())
-    if icon_tag and icon_tag.get("href"):
-        icon = icon_tag["href"].strip()
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+REQUEST_TIMEOUT = 30
+CHUNK_SIZE = 8192
+MAX_HEAD_BYTES = 512 * 1024
+DEFAULT_CONCURRENCY = 16
+DEFAULT_PER_HOST = 2
+
+META_PROPERTIES = ("og:title", "og:image", "og:url")
+
+
+class _HeadMetaParser(HTMLParser):
+    """Collect og:* meta tags and the first icon link until </head>."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta: Dict[str, str] = {}
+        self.icon = ""
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == "body":
+            self.done = True
+            return
+        attributes = {name.lower(): (value or "") for name, value in attrs}
+        if tag == "meta":
+            prop = attributes.get("property", "")
+            content = attributes.get("content", "").strip()
+            # 同じ property が複数ある場合は最初のものを採用
+            if prop in META_PROPERTIES and content and prop not in self.meta:
+                self.meta[prop] = content
+        elif tag == "link" and not self.icon:
+            rel = attributes.get("rel", "")
+            href = attributes.get("href", "").strip()
+            if rel and "icon" in rel.lower() and href:
+                self.icon = href
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self.done = True
+
+
+def _build_session(pool_size: int = DEFAULT_CONCURRENCY) -> requests.Session:
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _fetch_official_meta(url: str, session: Optional[requests.Session] = None) -> dict:
+    http = session or requests
+    response = http.get(url, headers={"User-Agent": USER_AGENT}, timeout=REQUEST_TIMEOUT, stream=True)
+    try:
+        response.raise_for_status()
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+        parser = _HeadMetaParser()
+        read_bytes = 0
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            read_bytes += len(chunk)
+            parser.feed(decoder.decode(chunk))
+            # </head> を読んだ時点で打ち切る
+            if parser.done or read_bytes >= MAX_HEAD_BYTES:
+                break
+    finally:
+        response.close()
 
     return {
-        "og_title": og_title,
-        "og_image": og_image,
-        "og_url": og_url,
-        "icon": icon,
+        "og_title": parser.meta.get("og:title", ""),
+        "og_image": parser.meta.get("og:image", ""),
+        "og_url": parser.meta.get("og:url", ""),
+        "icon": parser.icon,
     }
 
 
-def update_competitions(only: List[str] | None = None) -> None:
+async def _fetch_competition_meta(
+    comp_id: str,
+    candidates: List[str],
+    session: requests.Session,
+    executor: ThreadPoolExecutor,
+    host_limits: Dict[str, asyncio.Semaphore],
+    per_host: int,
+) -> Tuple[str, Optional[dict], str]:
+    loop = asyncio.get_running_loop()
+    for candidate in candidates:
+        host = urlparse(candidate).netloc.lower()
+        semaphore = host_limits.setdefault(host, asyncio.Semaphore(per_host))
+        try:
+            async with semaphore:
+                meta = await loop.run_in_executor(executor, _fetch_official_meta, candidate, session)
+            return comp_id, meta, candidate
+        except Exception as exc:  # noqa: BLE001
+            print(f"⚠️  {comp_id}: 公式サイト取得失敗 ({candidate}): {exc}")
+    return comp_id, None, ""
+
+
+async def _fetch_all_meta(
+    targets: List[Tuple[str, List[str]]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_host: int = DEFAULT_PER_HOST,
+) -> Dict[str, Tuple[dict, str]]:
+    """Fetch official metadata for all competitions concurrently.
+
+    Returns:
+        {comp_id: (meta, official_url)} for competitions with a successful fetch.
+    """
+    host_limits: Dict[str, asyncio.Semaphore] = {}
+    session = _build_session(concurrency)
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = await asyncio.gather(
+                *(
+                    _fetch_competition_meta(comp_id, candidates, session, executor, host_limits, per_host)
+                    for comp_id, candidates in targets
+                )
+            )
+    finally:
+        session.close()
+    return {comp_id: (meta, url) for comp_id, meta, url in results if meta is not None}
+
+
+def update_competitions(
+    only: List[str] | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_host: int = DEFAULT_PER_HOST,
+) -> None:
     if not BASE_JSON.exists():
         raise FileNotFoundError(f"competitions_base.json not found: {BASE_JSON}")
 
     with BASE_JSON.open("r", encoding="utf-8") as f:
         competitions = json.load(f)
 
+    targets = [
+        (comp.get("id", ""), list(comp.get("official_sites") or []))
+        for comp in competitions
+        if (not only or comp.get("id", "") in only) and comp.get("official_sites")
+    ]
+    fetched = asyncio.run(_fetch_all_meta(targets, concurrency=concurrency, per_host=per_host))
+
     for comp in competitions:
         comp_id = comp.get("id", "")
-        if only and comp_id not in only:
+        if comp_id not in fetched:
             continue
 
         official_sites = comp.get("official_sites") or []
-        if not official_sites:
-            continue
-
-        meta = None
-        official_url = ""
-        for candidate in official_sites:
-            try:
-                meta = _fetch_official_meta(candidate)
-                official_url = candidate
-                break
-            except Exception as exc:  # noqa: BLE001
-                print(f"⚠️  {comp_id}: 公式サイト取得失敗 ({candidate}): {exc}")
-
-        if meta is None:
-            continue
+        meta, official_url = fetched[comp_id]
 
         # Append og:url if present
         og_url = meta.get("og_url")
@@ -103,9 +204,7 @@ def update_competitions(only: List[str] | None = None) -> None:
             "last_updated": "",
         }
 
-    with OUT_JSON.open("w", encoding="utf-8") as f:
-        json.dump(competitions, f, ensure_ascii=False, indent=2)
-        f.write("\n")
+    write_json_atomic(OUT_JSON, competitions)
 
     print("✅ competitions.json 更新完了")
 
@@ -118,10 +217,22 @@ def main(argv: List[str] | None = None) -> None:
         default="",
         help="Comma-separated competition IDs to update (e.g., premier,urc,m6n).",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Maximum concurrent requests (default: {DEFAULT_CONCURRENCY}).",
+    )
+    parser.add_argument(
+        "--per-host",
+        type=int,
+        default=DEFAULT_PER_HOST,
+        help=f"Maximum concurrent requests per host (default: {DEFAULT_PER_HOST}).",
+    )
     args = parser.parse_args(argv)
 
     only = [s.strip() for s in args.only.split(",") if s.strip()] if args.only else None
-    update_competitions(only)
+    update_competitions(only, concurrency=max(1, args.concurrency), per_host=max(1, args.per_host))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,444 @@
+"""
+Match-day live status polling.
+
+    python -m src.main live                 # poll until no match is left in the window
+    python -m src.main live --comp premier  # one competition only
+    python -m src.main live --once          # single pass (for cron)
+
+Matches kicking off within [now - BEHIND, now + AHEAD] are picked from the
+existing season files (data/matches/{comp}/{season}.json), and only those
+matches' endpoints are polled:
+
+- World Rugby (wr/trc/ans): /rugby/v3/match/{matchId} (id from match_url)
+- RugbyViz (premier/urc): /v1/matches/{id}; the source ids are resolved
+  once at start-up with a single /v1/matches listing per competition
+
+Each match has its own schedule: backed off before kickoff, tight during
+play, and a few slow confirmation polls after the full-time status before
+it is dropped. Status changes are written to the season file (and its
+NDJSON sibling) atomically as they happen and recorded in the change feed.
+All requests share one pooled HTTP session.
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.repositories.change_feed import diff_matches, record_changes
+from src.repositories.fixture_index import parse_kickoff_utc
+from src.repositories.match_repository import MATCHES_DIR, iter_match_files, load_match_file, ndjson_path_for, write_matches_ndjson
+from src.utils.json_io import write_json_atomic
+
+ROOT = Path(__file__).resolve().parents[2]
+
+WR_API_BASE = "https://api.wr-rims-prod.pulselive.com"
+RUGBYVIZ_API_BASE = "https://rugby-union-feeds.incrowdsports.com"
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+REQUEST_TIMEOUT = 15
+MAX_ATTEMPTS = 3
+
+WR_COMPETITIONS = {"wr", "trc", "ans"}
+RUGBYVIZ_COMPETITIONS = {"premier": "GallagherPremiershipScraper", "urc": "UnitedRugbyChampionshipScraper"}
+
+DEFAULT_AHEAD = timedelta(hours=2)
+DEFAULT_BEHIND = timedelta(hours=3)
+
+# ポーリング間隔（秒）
+LIVE_INTERVAL = 30
+NEAR_KICKOFF_INTERVAL = 120
+PRE_KICKOFF_MAX_INTERVAL = 900
+POST_FINAL_INTERVAL = 300
+NEAR_KICKOFF = timedelta(minutes=15)
+FINAL_HOLD = timedelta(minutes=20)     # 終了後もスコア訂正等を確認する期間
+GIVE_UP_AFTER = timedelta(hours=4)     # キックオフ後この時間を過ぎたら打ち切り
+RESCAN_INTERVAL = 900                  # 新たにウィンドウに入る試合の再探索
+
+FINAL_STATUSES = {
+    "c", "cc", "result", "complete", "completed", "ft", "full time", "fulltime",
+    "final", "postponed", "abandoned", "cancelled", "canceled",
+}
+_WR_LIVE_STATUS = re.compile(r"^l[a-z0-9]{0,3}$")
+
+
+def status_phase(status: str) -> str:
+    """Classify a source status as "pre", "live" or "final"."""
+    value = (status or "").strip().lower()
+    if value in FINAL_STATUSES:
+        return "final"
+    if _WR_LIVE_STATUS.match(value) or any(word in value for word in ("live", "half", "progress", "play")):
+        return "live"
+    return "pre"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class LiveMatch:
+    """A match being polled and its polling state."""
+
+    def __init__(self, comp_id: str, path: Path, match: Dict[str, Any], kickoff: datetime):
+        self.comp_id = comp_id
+        self.path = path
+        self.match_id = str(match.get("match_id") or "")
+        self.label = f"{match.get('home_team', '')} v {match.get('away_team', '')}"
+        self.kickoff = kickoff
+        self.status = str(match.get("status") or "")
+        self.source_id = ""
+        self.final_since: Optional[datetime] = None
+        self.failures = 0
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (str(self.path), self.match_id)
+
+    def next_interval(self, now: datetime) -> Optional[float]:
+        """Seconds until the next poll, or None when polling is finished."""
+        phase = status_phase(self.status)
+        if phase == "final":
+            if self.final_since is None:
+                self.final_since = now
+            if now - self.final_since >= FINAL_HOLD:
+                return None
+            return POST_FINAL_INTERVAL
+        if now - self.kickoff > GIVE_UP_AFTER:
+            return None
+        if phase == "live" or now >= self.kickoff - timedelta(minutes=5):
+            return LIVE_INTERVAL
+        until_kickoff = self.kickoff - now
+        if until_kickoff <= NEAR_KICKOFF:
+            return NEAR_KICKOFF_INTERVAL
+        # キックオフ15分前に起きるように待つ（最大 PRE_KICKOFF_MAX_INTERVAL）
+        return max(NEAR_KICKOFF_INTERVAL, min(PRE_KICKOFF_MAX_INTERVAL, (until_kickoff - NEAR_KICKOFF).total_seconds()))
+
+
+class LiveClient:
+    """Pooled HTTP client shared by every poll of a live session."""
+
+    def __init__(self, pool_size: int = 4):
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT, "Accept": "application/json"})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._rugbyviz_headers: Dict[str, Dict[str, str]] = {}
+        self._rugbyviz_params: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"requests": 0, "errors": 0}
+
+    def get_json(self, url: str, **kwargs) -> Optional[Any]:
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            self.stats["requests"] += 1
+            try:
+                response = self.session.get(url, timeout=REQUEST_TIMEOUT, **kwargs)
+                if response.status_code == 429 or response.status_code >= 500:
+                    time.sleep(2.0 ** attempt)
+                    continue
+                response.raise_for_status()
+                return response.json()
+            except (requests.RequestException, ValueError) as exc:
+                if attempt == MAX_ATTEMPTS:
+                    print(f"⚠️ 取得失敗: {url} ({exc})")
+                    break
+                time.sleep(2.0 ** attempt)
+        self.stats["errors"] += 1
+        return None
+
+    def close(self) -> None:
+        self.session.close()
+
+    # ------------------------------------------------------------------
+    # World Rugby
+    # ------------------------------------------------------------------
+    def fetch_wr_status(self, match_id: str) -> Optional[str]:
+        data = self.get_json(f"{WR_API_BASE}/rugby/v3/match/{match_id}")
+        if not isinstance(data, dict):
+            return None
+        match = data.get("match") if isinstance(data.get("match"), dict) else data
+        status = match.get("status")
+        return str(status) if status is not None else None
+
+    # ------------------------------------------------------------------
+    # RugbyViz
+    # ------------------------------------------------------------------
+    def _rugbyviz_config(self, comp_id: str):
+        """Return (headers, params) for the RugbyViz API (config page fetched once)."""
+        if comp_id not in self._rugbyviz_headers:
+            from src.collectors.european import rugbyviz
+
+            try:
+                scraper = getattr(rugbyviz, RUGBYVIZ_COMPETITIONS[comp_id])()
+                config = scraper._fetch_config()
+            except Exception as exc:  # noqa: BLE001
+                print(f"⚠️ {comp_id}: RugbyViz 設定の取得に失敗 ({exc})")
+                return None, None
+            if not config.get("api_key"):
+                return None, None
+            self._rugbyviz_headers[comp_id] = {
+                "X-API-KEY": config["api_key"],
+                "X-APP-ID": config["app_id"],
+                "X-REALM": config["realm_id"],
+            }
+            self._rugbyviz_params[comp_id] = {
+                "clientId": config["client_id"],
+                "provider": config["provider"],
+                "seasonId": config.get("season_id") or config["season"],
+                "compId": str(scraper.competition_id),
+            }
+        return self._rugbyviz_headers[comp_id], self._rugbyviz_params[comp_id]
+
+    def list_rugbyviz_matches(self, comp_id: str) -> List[Dict[str, Any]]:
+        """One listing of the competition (used only to resolve source ids)."""
+        headers, params = self._rugbyviz_config(comp_id)
+        if headers is None:
+            return []
+        matches: List[Dict[str, Any]] = []
+        page = 0
+        while True:
+            data = self.get_json(
+                f"{RUGBYVIZ_API_BASE}/v1/matches",
+                headers=headers,
+                params={**params, "pageSize": 200, "pageNumber": page},
+            )
+            if not isinstance(data, dict):
+                break
+            matches.extend(data.get("data") or [])
+            page += 1
+            if page >= (data.get("metadata") or {}).get("totalPages", 1):
+                break
+        return matches
+
+    def fetch_rugbyviz_status(self, comp_id: str, source_id: str) -> Optional[str]:
+        headers, params = self._rugbyviz_config(comp_id)
+        if headers is None:
+            return None
+        data = self.get_json(
+            f"{RUGBYVIZ_API_BASE}/v1/matches/{source_id}",
+            headers=headers,
+            params={"clientId": params["clientId"], "provider": params["provider"]},
+        )
+        if not isinstance(data, dict):
+            return None
+        match = data.get("data") if isinstance(data.get("data"), dict) else data
+        status = match.get("status")
+        return str(status) if status is not None else None
+
+
+def find_live_candidates(
+    now: datetime,
+    ahead: timedelta = DEFAULT_AHEAD,
+    behind: timedelta = DEFAULT_BEHIND,
+    only: Optional[List[str]] = None,
+    matches_dir: Path = MATCHES_DIR,
+) -> List[LiveMatch]:
+    """Matches of supported competitions kicking off within the window."""
+    supported = WR_COMPETITIONS | set(RUGBYVIZ_COMPETITIONS)
+    candidates = []
+    for comp_id, path in iter_match_files(only=only, matches_dir=matches_dir):
+        if comp_id not in supported:
+            continue
+        for match in load_match_file(path):
+            kickoff = parse_kickoff_utc(str(match.get("kickoff_utc") or ""))
+            if kickoff is None or not match.get("match_id"):
+                continue
+            if not (now - behind <= kickoff <= now + ahead):
+                continue
+            if status_phase(str(match.get("status") or "")) == "final":
+                continue
+            candidates.append(LiveMatch(comp_id, path, match, kickoff))
+    return candidates
+
+
+def _wr_source_id(path: Path, match_id: str) -> str:
+    for match in load_match_file(path):
+        if str(match.get("match_id")) == match_id:
+            return str(match.get("match_url") or "").rstrip("/").rsplit("/", 1)[-1]
+    return ""
+
+
+def resolve_source_ids(client: LiveClient, targets: List[LiveMatch]) -> None:
+    """Fill LiveMatch.source_id (one listing per RugbyViz competition)."""
+    by_comp: Dict[str, List[LiveMatch]] = {}
+    for target in targets:
+        if target.source_id:
+            continue
+        if target.comp_id in WR_COMPETITIONS:
+            target.source_id = _wr_source_id(target.path, target.match_id)
+        else:
+            by_comp.setdefault(target.comp_id, []).append(target)
+
+    for comp_id, comp_targets in by_comp.items():
+        listing = client.list_rugbyviz_matches(comp_id)
+        by_kickoff: Dict[datetime, List[Dict[str, Any]]] = {}
+        for raw in listing:
+            kickoff = parse_kickoff_utc(str(raw.get("date") or ""))
+            if kickoff is not None:
+                by_kickoff.setdefault(kickoff, []).append(raw)
+        for target in comp_targets:
+            same_time = by_kickoff.get(target.kickoff, [])
+            if len(same_time) > 1:
+                # 同時刻開始の試合はホームチーム名で絞り込む
+                home = target.label.split(" v ", 1)[0].casefold()
+                same_time = [
+                    raw for raw in same_time
+                    if home and home in str((raw.get("homeTeam") or {}).get("name", "")).casefold()
+                ] or same_time[:0]
+            if len(same_time) == 1 and same_time[0].get("id") is not None:
+                target.source_id = str(same_time[0]["id"])
+            else:
+                print(f"⚠️ {comp_id} {target.match_id}: RugbyViz の試合IDを特定できません")
+
+
+class _SeasonWriter:
+    """Apply status changes to season files (atomic, change feed aware)."""
+
+    def __init__(self, matches_dir: Path = MATCHES_DIR):
+        self.changes_dir = matches_dir.parent / "changes"
+        self._lock = threading.Lock()
+
+    def update_status(self, target: LiveMatch, status: str) -> bool:
+        with self._lock:
+            previous = load_match_file(target.path)
+            current = [dict(match) for match in previous]
+            for match in current:
+                if str(match.get("match_id")) == target.match_id:
+                    if match.get("status") == status:
+                        return False
+                    match["status"] = status
+                    break
+            else:
+                return False
+            # スクレイパーの save_to_json と同じ書式
+            write_json_atomic(target.path, current, trailing_newline=False)
+            ndjson_path = ndjson_path_for(target.path)
+            if ndjson_path.exists():
+                write_matches_ndjson(ndjson_path, current)
+            record_changes(diff_matches(previous, current), self.changes_dir)
+            return True
+
+
+def _poll(client: LiveClient, target: LiveMatch) -> Optional[str]:
+    if target.comp_id in WR_COMPETITIONS:
+        return client.fetch_wr_status(target.source_id)
+    return client.fetch_rugbyviz_status(target.comp_id, target.source_id)
+
+
+def run_live(
+    only: Optional[List[str]] = None,
+    ahead: timedelta = DEFAULT_AHEAD,
+    behind: timedelta = DEFAULT_BEHIND,
+    once: bool = False,
+    matches_dir: Path = MATCHES_DIR,
+) -> Dict[str, int]:
+    client = LiveClient()
+    writer = _SeasonWriter(matches_dir)
+    summary = {"polls": 0, "updates": 0}
+    queue: List[Tuple[float, int, LiveMatch]] = []
+    tracked: Dict[Tuple[str, str], LiveMatch] = {}
+    counter = 0
+
+    def scan() -> None:
+        nonlocal counter
+        found = [c for c in find_live_candidates(_now(), ahead, behind, only, matches_dir) if c.key not in tracked]
+        if not found:
+            return
+        resolve_source_ids(client, found)
+        for target in found:
+            if not target.source_id:
+                continue
+            tracked[target.key] = target
+            counter += 1
+            heapq.heappush(queue, (time.monotonic(), counter, target))
+            print(f"📡 {target.comp_id} {target.match_id} {target.label} ({target.kickoff:%Y-%m-%d %H:%M}Z)")
+
+    try:
+        scan()
+        if not queue:
+            print("✅ 対象時間帯の試合なし")
+        next_scan = time.monotonic() + RESCAN_INTERVAL
+        while True:
+            if not queue:
+                if once or not tracked:
+                    break
+                # ウィンドウ内の試合が終わったら、新たに入る試合がないか確認して終了
+                scan()
+                next_scan = time.monotonic() + RESCAN_INTERVAL
+                if not queue:
+                    break
+            due, _, target = queue[0]
+            now_mono = time.monotonic()
+            if not once and due > now_mono:
+                if now_mono >= next_scan:
+                    scan()
+                    next_scan = now_mono + RESCAN_INTERVAL
+                    continue
+                time.sleep(min(due, next_scan) - now_mono)
+                continue
+            heapq.heappop(queue)
+
+            status = _poll(client, target)
+            summary["polls"] += 1
+            if status is None:
+                target.failures += 1
+            else:
+                target.failures = 0
+                if status != target.status:
+                    if writer.update_status(target, status):
+                        summary["updates"] += 1
+                        print(f"🔄 {target.comp_id} {target.match_id}: {target.status or '-'} → {status}")
+                    target.status = status
+
+            if once:
+                continue
+            interval = target.next_interval(_now())
+            if interval is None:
+                print(f"🏁 {target.comp_id} {target.match_id}: ポーリング終了 ({target.status or '-'})")
+                continue
+            # 連続失敗時は間隔を延ばす
+            interval *= 2 ** min(target.failures, 4)
+            counter += 1
+            heapq.heappush(queue, (time.monotonic() + interval, counter, target))
+    except KeyboardInterrupt:
+        print("\n⏹️ 中断しました")
+    finally:
+        client.close()
+
+    print(
+        f"ライブ更新終了: ポーリング {summary['polls']}回 / 更新 {summary['updates']}件 / "
+        f"HTTP {client.stats['requests']}回（失敗 {client.stats['errors']}）"
+    )
+    return summary
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Poll live match status for matches around kickoff.")
+    parser.add_argument(
+        "--comp",
+        action="append",
+        choices=sorted(WR_COMPETITIONS | set(RUGBYVIZ_COMPETITIONS)),
+        help="Competition to poll (repeatable; default: all supported).",
+    )
+    parser.add_argument("--ahead", type=float, default=DEFAULT_AHEAD.total_seconds() / 3600, help="Hours before kickoff to start polling.")
+    parser.add_argument("--behind", type=float, default=DEFAULT_BEHIND.total_seconds() / 3600, help="Hours after kickoff to keep matches in the window.")
+    parser.add_argument("--once", action="store_true", help="Poll every match in the window once and exit.")
+    args = parser.parse_args(argv)
+
+    run_live(
+        only=args.comp,
+        ahead=timedelta(hours=args.ahead),
+        behind=timedelta(hours=args.behind),
+        once=args.once,
+    )
+
+
+if __name__ == "__main__":
+    main()
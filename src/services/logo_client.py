@@ -0,0 +1,283 @@
+"""
+TheSportsDB team logo client shared by scrapers and legacy services.
+
+- Token-bucket rate limiter (shared by all threads of the process)
+- Persistent cache data/team_logos_cache.json with per-entry fetched_at;
+  hits are refreshed after HIT_TTL, misses (negative cache) after MISS_TTL
+- Cache writes are batched: entries are marked dirty and flushed once
+  (explicit flush() or at interpreter exit)
+- resolve_many() resolves several teams concurrently within the rate limit
+
+Transient errors (network, 5xx, exhausted 429 retries) are not cached.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from src.utils.json_io import write_json_atomic
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT / "data"
+LOGO_CACHE_JSON = DATA_DIR / "team_logos_cache.json"
+
+API_BASE = "https://www.thesportsdb.com/api/v1/json"
+DEFAULT_API_KEY = "3"  # Free tier
+REQUEST_TIMEOUT = 10
+
+# 無料枠は 30 req/min 程度
+RATE_PER_SECOND = 0.5
+BURST = 2
+MAX_ATTEMPTS = 3
+HIT_TTL = timedelta(days=30)
+MISS_TTL = timedelta(days=7)
+MAX_WORKERS = 4
+
+
+class TokenBucket:
+    """Thread-safe token bucket: acquire() blocks until a token is available."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _parse_timestamp(value: str) -> Optional[datetime]:
+    try:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _logo_fields(team: Dict[str, str]) -> Dict[str, str]:
+    # v1 API は strLogo/strBadge/strBanner、旧レスポンスは strTeam* を返す
+    return {
+        "logo_url": team.get("strLogo") or team.get("strTeamLogo") or "",
+        "badge_url": team.get("strBadge") or team.get("strTeamBadge") or "",
+        "banner_url": team.get("strBanner") or team.get("strTeamBanner") or "",
+    }
+
+
+class LogoClient:
+    """Rate-limited, cached TheSportsDB searchteams client."""
+
+    def __init__(
+        self,
+        cache_path: Path = LOGO_CACHE_JSON,
+        api_key: str | None = None,
+        rate: float = RATE_PER_SECOND,
+        burst: int = BURST,
+        hit_ttl: timedelta = HIT_TTL,
+        miss_ttl: timedelta = MISS_TTL,
+    ):
+        self.cache_path = Path(cache_path)
+        self.api_key = api_key or os.environ.get("THESPORTSDB_API_KEY", DEFAULT_API_KEY)
+        self.hit_ttl = hit_ttl
+        self.miss_ttl = miss_ttl
+        self._bucket = TokenBucket(rate, burst)
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, threading.Event] = {}
+        self._dirty = False
+        self._session = None
+        self.stats = {"cache_hits": 0, "requests": 0, "errors": 0}
+        self._entries: Dict[str, Dict[str, str]] = self._load_cache()
+
+    # ------------------------------------------------------------------
+    # Persistent cache
+    # ------------------------------------------------------------------
+    def _load_cache(self) -> Dict[str, Dict[str, str]]:
+        if not self.cache_path.exists():
+            return {}
+        try:
+            with self.cache_path.open("r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, json.JSONDecodeError) as exc:
+            print(f"⚠️ ロゴキャッシュ読み込みエラー: {exc}")
+            return {}
+        if not isinstance(raw, dict):
+            return {}
+
+        entries = {}
+        for team_name, data in raw.items():
+            if not isinstance(data, dict):
+                continue
+            logo_url = data.get("logo_url") or ""
+            badge_url = data.get("badge_url") or ""
+            banner_url = data.get("banner_url") or ""
+            # 旧形式（found なし）はヒットのみ保存されていた
+            found = data.get("found", bool(logo_url or badge_url or banner_url))
+            entries[team_name] = {
+                "found": bool(found),
+                "logo_url": logo_url,
+                "badge_url": badge_url,
+                "banner_url": banner_url,
+                "fetched_at": data.get("fetched_at") or "",
+            }
+        return entries
+
+    def flush(self) -> bool:
+        """Write the cache if any entry changed since the last flush."""
+        with self._lock:
+            if not self._dirty:
+                return False
+            snapshot = {name: dict(entry) for name, entry in sorted(self._entries.items())}
+            self._dirty = False
+        try:
+            return write_json_atomic(self.cache_path, snapshot)
+        except OSError as exc:
+            print(f"⚠️ ロゴキャッシュ保存エラー: {exc}")
+            with self._lock:
+                self._dirty = True
+            return False
+
+    def _is_fresh(self, entry: Dict[str, str]) -> bool:
+        fetched_at = _parse_timestamp(entry.get("fetched_at") or "")
+        if fetched_at is None:
+            # 取得日時不明の旧エントリはヒットのみ有効扱い（次回失効時に更新）
+            return bool(entry.get("found"))
+        ttl = self.hit_ttl if entry.get("found") else self.miss_ttl
+        return _now() - fetched_at < ttl
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+    def _get_session(self):
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+
+    def _search(self, team_name: str) -> Optional[Dict[str, str]]:
+        """Return logo fields, {} when not found, or None on a transient error."""
+        url = f"{API_BASE}/{self.api_key}/searchteams.php"
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            self._bucket.acquire()
+            with self._lock:
+                self.stats["requests"] += 1
+            try:
+                response = self._get_session().get(url, params={"t": team_name}, timeout=REQUEST_TIMEOUT)
+                if response.status_code == 429 or response.status_code >= 500:
+                    retry_after = response.headers.get("Retry-After", "")
+                    delay = float(retry_after) if retry_after.isdigit() else 2.0 ** attempt
+                    time.sleep(delay)
+                    continue
+                response.raise_for_status()
+                teams = (response.json() or {}).get("teams") or []
+            except (requests.RequestException, ValueError) as exc:
+                if attempt == MAX_ATTEMPTS:
+                    print(f"⚠️ TheSportsDB APIエラー ({team_name}): {exc}")
+                    break
+                time.sleep(2.0 ** attempt)
+                continue
+            return _logo_fields(teams[0]) if teams else {}
+
+        with self._lock:
+            self.stats["errors"] += 1
+        return None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def resolve(self, team_name: str) -> Dict[str, str]:
+        """Return {"logo_url", "badge_url", "banner_url"} or {} when unknown."""
+        team_name = (team_name or "").strip()
+        if not team_name or not REQUESTS_AVAILABLE:
+            return {}
+
+        while True:
+            with self._lock:
+                entry = self._entries.get(team_name)
+                if entry is not None and self._is_fresh(entry):
+                    self.stats["cache_hits"] += 1
+                    return self._result(entry)
+                event = self._inflight.get(team_name)
+                if event is None:
+                    event = threading.Event()
+                    self._inflight[team_name] = event
+                    break
+            # 同名チームの取得中は結果を待つ
+            event.wait()
+
+        try:
+            fields = self._search(team_name)
+            with self._lock:
+                if fields is None:
+                    # 一時エラー: キャッシュを更新せず、古いヒットがあればそれを返す
+                    entry = self._entries.get(team_name)
+                    return self._result(entry) if entry else {}
+                entry = {"found": bool(fields), "logo_url": "", "badge_url": "", "banner_url": "", **fields}
+                entry["fetched_at"] = _now().isoformat().replace("+00:00", "Z")
+                self._entries[team_name] = entry
+                self._dirty = True
+                return self._result(entry)
+        finally:
+            with self._lock:
+                self._inflight.pop(team_name, None)
+            event.set()
+
+    @staticmethod
+    def _result(entry: Dict[str, str]) -> Dict[str, str]:
+        if not entry.get("found"):
+            return {}
+        return {key: entry.get(key, "") for key in ("logo_url", "badge_url", "banner_url")}
+
+    def resolve_many(self, team_names: Iterable[str], max_workers: int = MAX_WORKERS) -> Dict[str, Dict[str, str]]:
+        """Resolve several teams concurrently (rate limit still applies)."""
+        names: List[str] = list(dict.fromkeys(name.strip() for name in team_names if name and name.strip()))
+        if not names:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(names)))) as executor:
+            results = dict(zip(names, executor.map(self.resolve, names)))
+        self.flush()
+        return results
+
+
+_default_client: Optional[LogoClient] = None
+_default_lock = threading.Lock()
+
+
+def get_logo_client() -> LogoClient:
+    """Return the process-wide client (flushed automatically at exit)."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = LogoClient()
+            atexit.register(_default_client.flush)
+        return _default_client
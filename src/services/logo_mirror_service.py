@@ -0,0 +1,355 @@
+"""
+Mirror official team logos as resized WebP/PNG assets.
+
+Driven by data/teams.json:
+- every distinct logo_url is downloaded once (concurrently, per-host limit)
+- assets are deduplicated by SHA-256 of the downloaded bytes (URC/EPCR
+  clubs share images), so each image is rendered once
+- thumbnails are rendered at fixed sizes in a process pool:
+  data/logos/{sha256[:16]}/{size}.webp and {size}.png
+- data/logos/manifest.json maps team_id -> asset + variant paths
+
+Re-runs send conditional requests (If-None-Match / If-Modified-Since)
+using the validators stored in the manifest; unchanged URLs (304) reuse
+their asset and are not rendered again. SVG sources are rasterized with
+cairosvg when installed and otherwise left unmirrored.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import json
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.repositories.team_master_store import load_team_master
+from src.utils.json_io import write_json_atomic
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+try:
+    import cairosvg
+    CAIROSVG_AVAILABLE = True
+except (ImportError, OSError):
+    CAIROSVG_AVAILABLE = False
+
+ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT / "data"
+TEAMS_JSON = DATA_DIR / "teams.json"
+LOGOS_DIR = DATA_DIR / "logos"
+MANIFEST_NAME = "manifest.json"
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+REQUEST_TIMEOUT = 30
+MAX_DOWNLOAD_BYTES = 10 * 1024 * 1024
+DEFAULT_SIZES = (64, 128, 256)
+DEFAULT_WORKERS = 8
+DEFAULT_PER_HOST = 4
+WEBP_QUALITY = 90
+MANIFEST_VERSION = 1
+SVG_SKIPPED = "svg (cairosvg not installed)"
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _is_svg(url: str, content_type: str, payload: bytes) -> bool:
+    if "svg" in content_type or urlparse(url).path.lower().endswith(".svg"):
+        return True
+    head = payload[:512].lstrip().lower()
+    return head.startswith(b"<svg") or (head.startswith(b"<?xml") and b"<svg" in payload[:2048].lower())
+
+
+# ----------------------------------------------------------------------
+# Rendering (runs in worker processes)
+# ----------------------------------------------------------------------
+def _render_variants(payload: bytes, is_svg: bool, asset_dir: str, sizes: Tuple[int, ...]) -> Dict[str, Any]:
+    """Render fixed-size WebP/PNG thumbnails of one image into asset_dir."""
+    if is_svg:
+        payload = cairosvg.svg2png(bytestring=payload, output_width=max(sizes) * 2)
+
+    out_dir = Path(asset_dir)
+    # サイズ構成が変わった場合に古いファイルを残さない
+    shutil.rmtree(out_dir, ignore_errors=True)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with Image.open(io.BytesIO(payload)) as source:
+        source.load()
+        image = source.convert("RGBA")
+    width, height = image.size
+
+    files: Dict[str, Dict[str, str]] = {}
+    for size in sizes:
+        # 長辺を size に合わせる（拡大はしない）
+        thumb = image.copy()
+        thumb.thumbnail((size, size), Image.LANCZOS)
+        webp_path = out_dir / f"{size}.webp"
+        png_path = out_dir / f"{size}.png"
+        thumb.save(webp_path, "WEBP", quality=WEBP_QUALITY, method=6)
+        thumb.save(png_path, "PNG", optimize=True)
+        files[str(size)] = {"webp": webp_path.name, "png": png_path.name}
+    return {"width": width, "height": height, "files": files}
+
+
+# ----------------------------------------------------------------------
+# Download
+# ----------------------------------------------------------------------
+class _Downloader:
+    def __init__(self, workers: int, per_host: int):
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT})
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=per_host)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.per_host = per_host
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_slots[host]
+
+    def fetch(self, url: str, previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Return {"status": "not_modified" | "ok" | "error", ...}."""
+        headers = {}
+        if previous:
+            if previous.get("etag"):
+                headers["If-None-Match"] = previous["etag"]
+            if previous.get("last_modified"):
+                headers["If-Modified-Since"] = previous["last_modified"]
+        try:
+            with self._slot(urlparse(url).netloc):
+                response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT, stream=True)
+                try:
+                    if response.status_code == 304:
+                        return {"status": "not_modified"}
+                    response.raise_for_status()
+                    chunks = []
+                    received = 0
+                    for chunk in response.iter_content(65536):
+                        received += len(chunk)
+                        if received > MAX_DOWNLOAD_BYTES:
+                            return {"status": "error", "error": "too large"}
+                        chunks.append(chunk)
+                finally:
+                    response.close()
+        except requests.RequestException as exc:
+            return {"status": "error", "error": f"{type(exc).__name__}: {exc}"}
+        return {
+            "status": "ok",
+            "payload": b"".join(chunks),
+            "content_type": response.headers.get("Content-Type", "").split(";")[0].strip(),
+            "etag": response.headers.get("ETag", ""),
+            "last_modified": response.headers.get("Last-Modified", ""),
+        }
+
+    def close(self) -> None:
+        self.session.close()
+
+
+# ----------------------------------------------------------------------
+# Pipeline
+# ----------------------------------------------------------------------
+def _load_manifest(path: Path) -> Dict[str, Any]:
+    if path.exists():
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if isinstance(manifest, dict) and manifest.get("version") == MANIFEST_VERSION:
+                return manifest
+        except (OSError, json.JSONDecodeError):
+            pass
+    return {"version": MANIFEST_VERSION, "sources": {}, "assets": {}, "teams": {}}
+
+
+def _asset_variants(asset_key: str, asset: Dict[str, Any], data_dir: Path, logos_dir: Path) -> Dict[str, Dict[str, str]]:
+    base = (logos_dir / asset_key).relative_to(data_dir).as_posix()
+    return {
+        size: {fmt: f"{base}/{name}" for fmt, name in files.items()}
+        for size, files in asset.get("files", {}).items()
+    }
+
+
+def _asset_complete(asset_dir: Path, asset: Optional[Dict[str, Any]], sizes: Tuple[int, ...]) -> bool:
+    if not asset or asset.get("error"):
+        return False
+    files = asset.get("files", {})
+    if sorted(files) != sorted(str(size) for size in sizes):
+        return False
+    return all((asset_dir / name).exists() for variant in files.values() for name in variant.values())
+
+
+def mirror_logos(
+    teams_path: Path = TEAMS_JSON,
+    logos_dir: Path = LOGOS_DIR,
+    sizes: Tuple[int, ...] = DEFAULT_SIZES,
+    workers: int = DEFAULT_WORKERS,
+    per_host: int = DEFAULT_PER_HOST,
+    force: bool = False,
+) -> Optional[Dict[str, Any]]:
+    if not PIL_AVAILABLE:
+        print("⚠️ Pillow 未インストールのためロゴをミラーできません (pip install pillow)")
+        return None
+    if not CAIROSVG_AVAILABLE:
+        print("⚠️ cairosvg 未インストールのため SVG ロゴはスキップします (pip install cairosvg)")
+
+    # teams.json + スクレイパーのジャーナル
+    teams: Dict[str, Dict[str, Any]] = dict(load_team_master(teams_path))
+
+    data_dir = logos_dir.parent
+    manifest_path = logos_dir / MANIFEST_NAME
+    previous = _load_manifest(manifest_path)
+    assets: Dict[str, Any] = dict(previous.get("assets", {}))
+    previous_sources: Dict[str, Any] = {}
+    if not force:
+        # 出力が揃っているURLだけ条件付きGETにする（サイズ変更・削除時は再取得）
+        for url, source in previous.get("sources", {}).items():
+            asset = assets.get(source.get("asset", ""))
+            svg_skipped = bool(asset) and asset.get("error") == SVG_SKIPPED and not CAIROSVG_AVAILABLE
+            if svg_skipped or _asset_complete(logos_dir / source.get("asset", ""), asset, sizes):
+                previous_sources[url] = source
+
+    urls = sorted({(team.get("logo_url") or "").strip() for team in teams.values()} - {""})
+
+    # 1) ダウンロード（同一URLは1回、条件付きGET）
+    downloader = _Downloader(max(1, workers), max(1, per_host))
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(urls) or 1))) as executor:
+            fetched = dict(zip(urls, executor.map(lambda url: downloader.fetch(url, previous_sources.get(url)), urls)))
+    finally:
+        downloader.close()
+
+    sources: Dict[str, Any] = {}
+    pending: Dict[str, Tuple[bytes, bool]] = {}
+    counts = {"downloaded": 0, "not_modified": 0, "errors": 0}
+    for url in urls:
+        result = fetched[url]
+        prior = previous_sources.get(url)
+        if result["status"] == "not_modified" and prior:
+            counts["not_modified"] += 1
+            sources[url] = prior
+            continue
+        if result["status"] != "ok":
+            counts["errors"] += 1
+            print(f"  ⚠️ 取得失敗: {url} ({result.get('error', '')})")
+            if prior:
+                # 一時的な失敗は前回のアセットを維持
+                sources[url] = prior
+            continue
+
+        counts["downloaded"] += 1
+        payload = result["payload"]
+        digest = hashlib.sha256(payload).hexdigest()
+        asset_key = digest[:16]
+        sources[url] = {
+            "sha256": digest,
+            "asset": asset_key,
+            "etag": result["etag"],
+            "last_modified": result["last_modified"],
+            "content_type": result["content_type"],
+            "bytes": len(payload),
+            "fetched_at": _now_iso(),
+        }
+        if asset_key in pending or _asset_complete(logos_dir / asset_key, assets.get(asset_key), sizes):
+            continue
+        pending[asset_key] = (payload, _is_svg(url, result["content_type"], payload))
+
+    # 2) サムネイル生成（プロセスプール、同一画像は1回）
+    render_jobs = {}
+    for asset_key, (payload, is_svg) in sorted(pending.items()):
+        if is_svg and not CAIROSVG_AVAILABLE:
+            assets[asset_key] = {"error": SVG_SKIPPED, "files": {}}
+            continue
+        render_jobs[asset_key] = (payload, is_svg)
+
+    if render_jobs:
+        with ProcessPoolExecutor() as executor:
+            futures = {
+                asset_key: executor.submit(_render_variants, payload, is_svg, str(logos_dir / asset_key), sizes)
+                for asset_key, (payload, is_svg) in render_jobs.items()
+            }
+            for asset_key, future in futures.items():
+                try:
+                    assets[asset_key] = future.result()
+                except Exception as exc:  # noqa: BLE001
+                    print(f"  ⚠️ 変換失敗: {asset_key} ({exc})")
+                    assets[asset_key] = {"error": str(exc), "files": {}}
+
+    # 3) マニフェスト（team_id → バリアント）
+    used_assets = {entry["asset"] for entry in sources.values()}
+    assets = {key: value for key, value in sorted(assets.items()) if key in used_assets}
+    team_entries: Dict[str, Any] = {}
+    for team_id, team in sorted(teams.items()):
+        url = (team.get("logo_url") or "").strip()
+        source = sources.get(url)
+        if not source:
+            continue
+        asset_key = source["asset"]
+        asset = assets.get(asset_key, {})
+        team_entries[team_id] = {
+            "logo_url": url,
+            "asset": asset_key,
+            "variants": _asset_variants(asset_key, asset, data_dir, logos_dir),
+        }
+
+    removed = 0
+    if logos_dir.exists():
+        for path in sorted(logos_dir.iterdir()):
+            if path.is_dir() and path.name not in assets:
+                shutil.rmtree(path)
+                removed += 1
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "sizes": list(sizes),
+        "formats": ["webp", "png"],
+        "sources": sources,
+        "assets": assets,
+        "teams": team_entries,
+    }
+    write_json_atomic(manifest_path, manifest)
+
+    mirrored = sum(1 for entry in team_entries.values() if entry["variants"])
+    print(
+        f"✅ ロゴミラー: URL {len(urls)}件 (取得 {counts['downloaded']} / 未変更 {counts['not_modified']} / "
+        f"失敗 {counts['errors']}) → アセット {len(assets)}件 (新規変換 {len(render_jobs)} / 削除 {removed})"
+    )
+    print(f"  チーム {len(teams)}件中 {mirrored}件にバリアントあり → {manifest_path}")
+    return manifest
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Mirror official team logos as resized WebP/PNG variants.")
+    parser.add_argument(
+        "--sizes",
+        type=str,
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="Comma-separated thumbnail sizes in px (default: 64,128,256).",
+    )
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent downloads.")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST, help="Concurrent downloads per host.")
+    parser.add_argument("--force", action="store_true", help="Ignore cached validators and re-download everything.")
+    args = parser.parse_args(argv)
+
+    sizes = tuple(sorted({int(size) for size in args.sizes.split(",") if size.strip()}))
+    mirror_logos(sizes=sizes, workers=args.workers, per_host=args.per_host, force=args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Long-running scrape daemon with warm state (serve-scheduler).
+
+    python -m src.main serve-scheduler                     # due scrapes every hour
+    python -m src.main serve-scheduler --interval 1800 --port 8765
+    curl -X POST http://127.0.0.1:8765/scrape/premier      # trigger one competition
+    curl -X POST http://127.0.0.1:8765/scrape-due          # trigger the due list
+    curl http://127.0.0.1:8765/status
+
+Everything a one-shot CLI run reloads is kept resident:
+- collector modules (imported once)
+- data/teams.json + journal (team_master_store, only new journal lines are replayed)
+- HTTP connection pools and a conditional-GET cache (src/utils/http.py)
+- Chrome for browser sources, one per driver profile (src/utils/browser.py)
+- the TheSportsDB logo client and its cache
+
+Scrapes run one at a time on a worker thread, fed by the schedule
+(scrape_scheduler due list every --interval seconds) and by triggers on
+the local HTTP endpoint. Season files are written atomically and team
+registrations go to the team master journal; after each batch the logo cache is flushed
+and, with --publish-changes, the change feed is published.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import queue
+import signal
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_INTERVAL = 3600
+HISTORY_SIZE = 50
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class SchedulerDaemon:
+    """Job queue + worker thread + schedule ticker."""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, publish_changes: bool = False):
+        from src.main import SCRAPERS
+
+        self.scrapers = SCRAPERS
+        self.interval = interval
+        self.publish_changes = publish_changes
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._pending: set = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.current: Optional[str] = None
+        self.history: List[Dict[str, Any]] = []
+        self.started_at = _now_iso()
+        self.next_tick: Optional[float] = None
+        self._threads: List[threading.Thread] = []
+
+    # ------------------------------------------------------------------
+    # Warm-up
+    # ------------------------------------------------------------------
+    def warm_up(self, warm_browser: bool = False) -> None:
+        from src.collectors.base import BaseScraper
+        from src.services.logo_client import get_logo_client
+        from src.utils import browser, http
+
+        started = time.perf_counter()
+        http.enable_cache()
+        browser.enable_resident()
+        # teams.json + ジャーナルをここで読み込み、以降は追記分のみ再生
+        BaseScraper._load_team_master()
+        get_logo_client()
+        if warm_browser:
+            for comp_id in ("epcr-champions", "m6n"):
+                scraper = self.scrapers[comp_id]()
+                scraper._release_driver(scraper._acquire_driver())
+        print(f"🔥 ウォームアップ完了 ({time.perf_counter() - started:.1f}s)")
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+    def enqueue(self, comp_id: str) -> bool:
+        """Queue a scrape (ignored when the same competition is already queued)."""
+        if comp_id not in self.scrapers:
+            raise KeyError(comp_id)
+        with self._lock:
+            if comp_id in self._pending:
+                return False
+            self._pending.add(comp_id)
+        self._queue.put(comp_id)
+        return True
+
+    def enqueue_due(self, force: Optional[List[str]] = None) -> List[str]:
+        from src.services.scrape_scheduler import due_targets
+
+        queued = [comp_id for comp_id in due_targets(force=force or []) if comp_id in self.scrapers and self.enqueue(comp_id)]
+        print(f"📅 スケジュール: {', '.join(queued) if queued else '対象なし'}")
+        return queued
+
+    def _run_job(self, comp_id: str) -> None:
+        from src.main import run_scraper
+        from src.services.scrape_scheduler import record_run
+
+        started = time.perf_counter()
+        entry: Dict[str, Any] = {"competition": comp_id, "started_at": _now_iso()}
+        try:
+            matches = run_scraper(comp_id)
+            success = matches is not None
+        except Exception as exc:  # noqa: BLE001
+            print(f"❌ {comp_id}: {exc}")
+            success = False
+            entry["error"] = str(exc)
+        entry["status"] = "success" if success else "failed"
+        entry["seconds"] = round(time.perf_counter() - started, 1)
+        record_run(comp_id, success)
+        with self._lock:
+            self.history.insert(0, entry)
+            del self.history[HISTORY_SIZE:]
+        print(f"{'✅' if success else '❌'} {comp_id} ({entry['seconds']}s)")
+
+    def _flush(self) -> None:
+        from src.services.logo_client import get_logo_client
+
+        get_logo_client().flush()
+        if self.publish_changes:
+            from src.repositories.change_feed import publish_changes
+
+            publish_changes()
+
+    def _worker(self) -> None:
+        while True:
+            comp_id = self._queue.get()
+            if comp_id is None:
+                break
+            with self._lock:
+                self._pending.discard(comp_id)
+                self.current = comp_id
+            try:
+                self._run_job(comp_id)
+            finally:
+                with self._lock:
+                    self.current = None
+            # キューが空になったらバッチ終了として書き出す
+            if self._queue.empty():
+                try:
+                    self._flush()
+                except Exception as exc:  # noqa: BLE001
+                    print(f"⚠️ 書き出しエラー: {exc}")
+
+    def _ticker(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.enqueue_due()
+            except Exception as exc:  # noqa: BLE001
+                print(f"⚠️ スケジュール判定エラー: {exc}")
+            self.next_tick = time.time() + self.interval
+            self._stop.wait(self.interval)
+
+    def start(self, schedule: bool = True) -> None:
+        threads = [threading.Thread(target=self._worker, name="scrape-worker", daemon=True)]
+        if schedule:
+            threads.append(threading.Thread(target=self._ticker, name="scrape-ticker", daemon=True))
+        for thread in threads:
+            thread.start()
+        self._threads = threads
+
+    def stop(self) -> None:
+        from src.utils import browser, http
+
+        self._stop.set()
+        self._queue.put(None)
+        worker = self._threads[0] if self._threads else None
+        if worker is not None and self.current:
+            print(f"⏳ 実行中のスクレイプ完了を待機: {self.current}")
+        if worker is not None:
+            worker.join()
+        browser.close_all()
+        http.close()
+
+    def status(self) -> Dict[str, Any]:
+        from src.utils import browser, http
+
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "current": self.current,
+                "queued": sorted(self._pending),
+                "next_schedule": (
+                    datetime.fromtimestamp(self.next_tick, timezone.utc).isoformat().replace("+00:00", "Z")
+                    if self.next_tick
+                    else None
+                ),
+                "history": list(self.history),
+                "http": dict(http.stats),
+                "browser": dict(browser.stats),
+            }
+
+
+def make_handler(daemon: SchedulerDaemon):
+    class TriggerHandler(BaseHTTPRequestHandler):
+        server_version = "RugbyScraperScheduler/1.0"
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+        def _send(self, status: int, payload: Any) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            if urlsplit(self.path).path == "/status":
+                self._send(200, daemon.status())
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self) -> None:
+            path = urlsplit(self.path).path.rstrip("/")
+            if path == "/scrape-due":
+                self._send(202, {"queued": daemon.enqueue_due()})
+                return
+            if path.startswith("/scrape/"):
+                comp_id = path[len("/scrape/"):]
+                try:
+                    queued = daemon.enqueue(comp_id)
+                except KeyError:
+                    self._send(404, {"error": f"unknown competition: {comp_id}", "available": sorted(daemon.scrapers)})
+                    return
+                self._send(202, {"queued": [comp_id] if queued else [], "already_queued": not queued})
+                return
+            self._send(404, {"error": "not found"})
+
+    return TriggerHandler
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run scrapes on a schedule or on trigger with warm state.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="Seconds between schedule checks.")
+    parser.add_argument("--no-schedule", action="store_true", help="Only run scrapes triggered over HTTP.")
+    parser.add_argument("--warm-browser", action="store_true", help="Start the resident browsers at start-up.")
+    parser.add_argument("--publish-changes", action="store_true", help="Publish the change feed after each batch.")
+    args = parser.parse_args(argv)
+
+    daemon = SchedulerDaemon(interval=args.interval, publish_changes=args.publish_changes)
+    daemon.warm_up(warm_browser=args.warm_browser)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(daemon))
+
+    def handle_sigterm(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    daemon.start(schedule=not args.no_schedule)
+    print(f"🚀 serve-scheduler: http://{args.host}:{server.server_port} (POST /scrape/{{comp}}, /scrape-due, GET /status)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        daemon.stop()
+        print("⏹️ serve-scheduler 停止")
+
+
+if __name__ == "__main__":
+    main()
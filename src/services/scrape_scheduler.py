@@ -0,0 +1,251 @@
+"""
+Fixture-aware scrape scheduler.
+
+Decides which competitions are due instead of scraping everything on
+every cron run. Each scrape target (the ids accepted by `src.main`) is
+classified from its match files and data_summary.date_range
+(data/competitions_summary.json, when generated):
+
+- in-season   next kickoff within IN_SEASON_NEXT, a match in the last
+              RESULTS_GRACE, or inside the date range with the next
+              kickoff within IN_SEASON_GAP          -> daily
+- pre-season  next kickoff within PRE_SEASON_WINDOW -> weekly
+- off-season  anything else (no future fixtures)    -> monthly
+
+A target is due when its last successful scrape (data/scrape_state.json)
+is older than its cadence. The cron therefore runs daily and most runs
+touch only the competitions that are actually playing.
+
+    python -m src.main scrape-schedule            # due list
+    python -m src.main scrape-schedule --all      # every target with its phase
+    python scripts/automation/scrape_all.py --due # scrape only due targets
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.repositories.fixture_index import parse_kickoff_utc
+from src.repositories.match_repository import MATCHES_DIR, load_match_file
+from src.utils.json_io import write_json_atomic
+
+ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT / "data"
+STATE_JSON = DATA_DIR / "scrape_state.json"
+SUMMARY_JSON = DATA_DIR / "competitions_summary.json"
+
+# スクレイプ対象ID（src.main の引数） → 出力先の大会ID
+SCRAPE_TARGETS: Dict[str, tuple] = {
+    "wr": ("wr",),
+    "premier": ("premier",),
+    "urc": ("urc",),
+    "trc": ("trc",),
+    "ans": ("ans",),
+    "srp": ("srp",),
+    "epcr-champions": ("epcr-champions",),
+    "epcr-challenge": ("epcr-challenge",),
+    "t14": ("t14",),
+    "jrlo": ("jrlo-div1", "jrlo-div2", "jrlo-div3"),
+    "m6n": ("m6n",),
+    "w6n": ("w6n",),
+    "u6n": ("u6n",),
+}
+
+CADENCE = {
+    "in-season": timedelta(days=1),
+    "pre-season": timedelta(days=7),
+    "off-season": timedelta(days=30),
+}
+# cron の実行時刻のずれを吸収
+CADENCE_SLACK = timedelta(hours=2)
+
+IN_SEASON_NEXT = timedelta(days=10)
+IN_SEASON_GAP = timedelta(days=21)
+RESULTS_GRACE = timedelta(days=2)
+PRE_SEASON_WINDOW = timedelta(days=90)
+
+_state_lock = threading.Lock()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _iso(dt: Optional[datetime]) -> str:
+    return dt.isoformat().replace("+00:00", "Z") if dt else ""
+
+
+def load_state(path: Path = STATE_JSON) -> Dict[str, Dict[str, Any]]:
+    if not path.exists():
+        return {}
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def record_run(target: str, success: bool, now: Optional[datetime] = None, path: Path = STATE_JSON) -> None:
+    """Record a scrape attempt (the schedule is based on the last success)."""
+    now = now or _now()
+    with _state_lock:
+        state = load_state(path)
+        entry = state.setdefault(target, {})
+        entry["last_run"] = _iso(now)
+        entry["last_status"] = "success" if success else "failed"
+        if success:
+            entry["last_success"] = _iso(now)
+        write_json_atomic(path, dict(sorted(state.items())))
+
+
+def _parse_datetime(value: str) -> Optional[datetime]:
+    dt = parse_kickoff_utc(value or "")
+    if dt is not None and dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def _load_date_ranges(path: Path = SUMMARY_JSON) -> Dict[str, tuple]:
+    if not path.exists():
+        return {}
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            competitions = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    ranges = {}
+    for competition in competitions if isinstance(competitions, list) else []:
+        date_range = (competition.get("data_summary") or {}).get("date_range") or {}
+        start = _parse_datetime(date_range.get("start", ""))
+        end = _parse_datetime(date_range.get("end", ""))
+        if competition.get("id") and start and end:
+            ranges[competition["id"]] = (start, end)
+    return ranges
+
+
+def _kickoffs(comp_ids: Iterable[str], matches_dir: Path) -> List[datetime]:
+    kickoffs = []
+    for comp_id in comp_ids:
+        comp_dir = matches_dir / comp_id
+        if not comp_dir.is_dir():
+            continue
+        for path in comp_dir.glob("*.json"):
+            for match in load_match_file(path):
+                kickoff = _parse_datetime(str(match.get("kickoff_utc") or ""))
+                if kickoff is not None:
+                    kickoffs.append(kickoff)
+    return sorted(kickoffs)
+
+
+def classify(
+    now: datetime,
+    kickoffs: List[datetime],
+    date_range: Optional[tuple] = None,
+) -> tuple:
+    """Return (phase, next_kickoff, reason) for a scrape target."""
+    previous = max((k for k in kickoffs if k <= now), default=None)
+    upcoming = min((k for k in kickoffs if k > now), default=None)
+
+    if upcoming and upcoming - now <= IN_SEASON_NEXT:
+        return "in-season", upcoming, f"次の試合まで{(upcoming - now).days}日"
+    if previous and now - previous <= RESULTS_GRACE:
+        return "in-season", upcoming, "直近の試合結果を反映"
+    if date_range and upcoming and upcoming - now <= IN_SEASON_GAP:
+        start, end = date_range
+        if start <= now <= end:
+            return "in-season", upcoming, "開催期間中"
+    if upcoming and upcoming - now <= PRE_SEASON_WINDOW:
+        return "pre-season", upcoming, f"次の試合まで{(upcoming - now).days}日"
+    if upcoming:
+        return "off-season", upcoming, f"次の試合まで{(upcoming - now).days}日"
+    return "off-season", None, "今後の試合なし"
+
+
+def plan(
+    targets: Optional[Iterable[str]] = None,
+    now: Optional[datetime] = None,
+    force: Iterable[str] = (),
+    matches_dir: Path = MATCHES_DIR,
+    state_path: Path = STATE_JSON,
+    summary_path: Path = SUMMARY_JSON,
+) -> List[Dict[str, Any]]:
+    """Return the schedule of every target (in SCRAPE_TARGETS order)."""
+    now = now or _now()
+    state = load_state(state_path)
+    date_ranges = _load_date_ranges(summary_path)
+    forced = set(force)
+    selected = list(targets) if targets else list(SCRAPE_TARGETS)
+
+    schedule = []
+    for target in selected:
+        outputs = SCRAPE_TARGETS.get(target, (target,))
+        # 複数の出力先（League One の各Division）は最も広い期間で判定
+        ranges = [date_ranges[comp_id] for comp_id in outputs if comp_id in date_ranges]
+        date_range = (min(r[0] for r in ranges), max(r[1] for r in ranges)) if ranges else None
+        phase, upcoming, reason = classify(now, _kickoffs(outputs, matches_dir), date_range)
+        cadence = CADENCE[phase]
+        last_success = _parse_datetime((state.get(target) or {}).get("last_success", ""))
+        if target in forced or "all" in forced:
+            due, reason = True, "強制実行"
+        elif last_success is None:
+            due = True
+            reason = f"{reason} / 未実行"
+        else:
+            due = now - last_success >= cadence - CADENCE_SLACK
+        schedule.append(
+            {
+                "competition": target,
+                "phase": phase,
+                "cadence_days": cadence.days,
+                "due": due,
+                "reason": reason,
+                "next_kickoff": _iso(upcoming),
+                "last_success": _iso(last_success),
+            }
+        )
+    return schedule
+
+
+def due_targets(force: Iterable[str] = (), now: Optional[datetime] = None) -> List[str]:
+    return [entry["competition"] for entry in plan(now=now, force=force) if entry["due"]]
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Show which competitions are due for scraping.")
+    parser.add_argument("--all", action="store_true", help="List every competition, not only due ones.")
+    parser.add_argument(
+        "--force",
+        type=str,
+        default="",
+        help="Comma-separated competitions to treat as due (or 'all').",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the schedule as JSON.")
+    args = parser.parse_args(argv)
+
+    force = [value.strip() for value in args.force.split(",") if value.strip()]
+    schedule = plan(force=force)
+    rows = schedule if args.all else [entry for entry in schedule if entry["due"]]
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+        return
+
+    marks = {"in-season": "🏉", "pre-season": "📅", "off-season": "💤"}
+    for entry in rows:
+        status = "due" if entry["due"] else "skip"
+        print(
+            f"{marks[entry['phase']]} {entry['competition']:<16} {entry['phase']:<10} "
+            f"{status:<4} 毎{entry['cadence_days']}日  {entry['reason']}"
+            + (f"  最終取得 {entry['last_success'][:10]}" if entry["last_success"] else "")
+        )
+    due = [entry["competition"] for entry in schedule if entry["due"]]
+    print(f"\n対象: {len(due)}/{len(schedule)}大会" + (f" ({', '.join(due)})" if due else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+"""
+Multi-season historical backfill.
+
+    python -m src.main backfill-seasons --comp m6n:2020-2025 --comp jrlo:2023-2025
+
+Each (competition, season) pair is one task. Tasks run concurrently in a
+thread pool, but tasks that hit the same host are limited by a per-host
+semaphore and a minimum interval between task starts. Progress is
+checkpointed in .cache/season_backfill.json after every task, so an
+interrupted run resumes where it stopped. Once a run finishes without
+failures the checkpoint is marked complete, and the next run only skips
+frozen seasons, so current and unfinished seasons are fetched again.
+Completed past seasons are
+added to data/frozen_seasons.json; regular scraper runs never overwrite
+frozen seasons, and the backfill skips them unless --refresh-frozen.
+
+Only collectors whose source can address a past season are supported:
+Six Nations (URL year), League One (?year=), Premiership/URC (RugbyViz
+seasonId) and World Rugby based scrapers (date range). Top 14, EPCR and
+Super Rugby only publish the current season.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.repositories.fixture_index import parse_kickoff_utc
+from src.repositories.frozen_seasons import freeze_seasons, load_frozen_seasons
+from src.repositories.match_repository import MATCHES_DIR, load_match_file
+from src.utils.json_io import write_json_atomic
+
+ROOT = Path(__file__).resolve().parents[2]
+CHECKPOINT_JSON = ROOT / ".cache" / "season_backfill.json"
+
+DEFAULT_WORKERS = 4
+DEFAULT_PER_HOST = 1
+DEFAULT_HOST_INTERVAL = 5.0
+CHECKPOINT_VERSION = 1
+
+
+def _six_nations(cls_name: str) -> Callable[[], Any]:
+    def create():
+        from src.collectors.international import six_nations
+
+        return getattr(six_nations, cls_name)()
+
+    return create
+
+
+def _league_one():
+    from src.collectors.domestic import LeagueOneDivisionsScraper
+
+    return LeagueOneDivisionsScraper()
+
+
+def _rugbyviz(cls_name: str) -> Callable[[], Any]:
+    def create():
+        from src.collectors.european import rugbyviz
+
+        return getattr(rugbyviz, cls_name)()
+
+    return create
+
+
+def _world_rugby(cls_name: str) -> Callable[[], Any]:
+    def create():
+        from src.collectors.international import world_rugby
+
+        return getattr(world_rugby, cls_name)()
+
+    return create
+
+
+def _calendar_season(now: datetime) -> int:
+    return now.year
+
+
+def _league_one_season(now: datetime) -> int:
+    # 12月開幕: 2025年12月〜2026年5月 → 2026シーズン
+    return now.year + 1 if now.month >= 12 else now.year
+
+
+def _split_season(now: datetime) -> int:
+    # RugbyViz は開幕年でシーズンを表す（2025年9月〜2026年6月 → 2025シーズン）
+    return now.year if now.month >= 9 else now.year - 1
+
+
+# comp_id: (factory, host, 出力先の大会ID, 現行シーズン判定)
+SEASON_SOURCES: Dict[str, Tuple[Callable[[], Any], str, Tuple[str, ...], Callable[[datetime], int]]] = {
+    "m6n": (_six_nations("SixNationsScraper"), "www.sixnationsrugby.com", ("m6n",), _calendar_season),
+    "w6n": (_six_nations("SixNationsWomensScraper"), "www.sixnationsrugby.com", ("w6n",), _calendar_season),
+    "u6n": (_six_nations("SixNationsU20Scraper"), "www.sixnationsrugby.com", ("u6n",), _calendar_season),
+    "jrlo": (_league_one, "league-one.jp", ("jrlo-div1", "jrlo-div2", "jrlo-div3"), _league_one_season),
+    "premier": (
+        _rugbyviz("GallagherPremiershipScraper"),
+        "rugby-union-feeds.incrowdsports.com",
+        ("premier",),
+        _split_season,
+    ),
+    "urc": (
+        _rugbyviz("UnitedRugbyChampionshipScraper"),
+        "rugby-union-feeds.incrowdsports.com",
+        ("urc",),
+        _split_season,
+    ),
+    "wr": (_world_rugby("WorldRugbyInternationalsScraper"), "api.wr-rims-prod.pulselive.com", ("wr",), _calendar_season),
+    "trc": (_world_rugby("RugbyChampionshipScraper"), "api.wr-rims-prod.pulselive.com", ("trc",), _calendar_season),
+    "ans": (_world_rugby("AutumnNationsSeriesScraper"), "api.wr-rims-prod.pulselive.com", ("ans",), _calendar_season),
+}
+UNSUPPORTED = {"t14", "epcr-champions", "epcr-challenge", "srp"}
+
+
+def parse_comp_spec(spec: str) -> Tuple[str, List[str]]:
+    """Parse "m6n:2020-2025" / "m6n:2021" / "m6n:2019,2021" into (comp_id, seasons)."""
+    if ":" not in spec:
+        raise ValueError(f"invalid --comp (expected comp:YYYY-YYYY): {spec}")
+    comp_id, ranges = spec.split(":", 1)
+    seasons: List[str] = []
+    for part in ranges.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = (int(value) for value in part.split("-", 1))
+            if start > end:
+                raise ValueError(f"invalid season range: {part}")
+            seasons.extend(str(year) for year in range(start, end + 1))
+        else:
+            seasons.append(str(int(part)))
+    if not seasons:
+        raise ValueError(f"no seasons in --comp: {spec}")
+    return comp_id.strip(), sorted(set(seasons))
+
+
+class _HostLimiter:
+    """Per-host concurrency limit + minimum interval between task starts."""
+
+    def __init__(self, per_host: int, interval: float):
+        self.per_host = max(1, per_host)
+        self.interval = max(0.0, interval)
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, host: str) -> None:
+        with self._lock:
+            slot = self._slots.setdefault(host, threading.BoundedSemaphore(self.per_host))
+        slot.acquire()
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, 0.0))
+            self._next_start[host] = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+    def release(self, host: str) -> None:
+        self._slots[host].release()
+
+
+class _Checkpoint:
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        # 前回の実行が最後まで完了したか（False なら中断された実行の再開）
+        self.complete = False
+        if path.exists():
+            try:
+                with path.open("r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict) and data.get("version") == CHECKPOINT_VERSION:
+                    self.tasks = data.get("tasks", {})
+                    self.complete = bool(data.get("complete"))
+            except (OSError, json.JSONDecodeError):
+                pass
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.tasks.get(key)
+
+    def is_done(self, key: str) -> bool:
+        """True if the task can be skipped: frozen, or finished earlier in an interrupted run."""
+        entry = self.tasks.get(key)
+        if not entry:
+            return False
+        if entry.get("frozen"):
+            return True
+        return not self.complete and entry.get("status") in ("done", "empty")
+
+    def _write(self) -> None:
+        write_json_atomic(self.path, {"version": CHECKPOINT_VERSION, "complete": self.complete, "tasks": self.tasks})
+
+    def record(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            if self.complete:
+                # 完了済みの実行の後に始まった新しい実行
+                self.complete = False
+                self.tasks = {name: task for name, task in self.tasks.items() if task.get("frozen")}
+            self.tasks[key] = entry
+            self._write()
+
+    def finish(self) -> None:
+        with self._lock:
+            if self.complete or not self.tasks:
+                return
+            self.complete = True
+            self._write()
+
+
+def _count_matches(result: Any) -> int:
+    if isinstance(result, dict):
+        return sum(len(value) for value in result.values() if isinstance(value, list))
+    if isinstance(result, list):
+        return len(result)
+    return 0
+
+
+def _season_finished(outputs: Tuple[str, ...], season: str, now: datetime, matches_dir: Path = MATCHES_DIR) -> bool:
+    """True when every output file has matches and all kickoffs are in the past."""
+    for output in outputs:
+        path = matches_dir / output / f"{season}.json"
+        matches = load_match_file(path) if path.exists() else []
+        if not matches:
+            return False
+        for match in matches:
+            kickoff = parse_kickoff_utc(str(match.get("kickoff_utc") or ""))
+            if kickoff is None:
+                # 日時未定の試合が残っている
+                return False
+            if kickoff.tzinfo is None:
+                kickoff = kickoff.replace(tzinfo=timezone.utc)
+            if kickoff >= now:
+                return False
+    return True
+
+
+def _run_task(comp_id: str, season: str, refresh_frozen: bool) -> Dict[str, Any]:
+    factory = SEASON_SOURCES[comp_id][0]
+    started = time.perf_counter()
+    scraper = factory()
+    scraper.target_season = season
+    scraper.allow_frozen_write = refresh_frozen
+    result = scraper.scrape()
+    entry = {
+        "status": "failed" if result is None else ("done" if _count_matches(result) else "empty"),
+        "matches": _count_matches(result),
+        "seconds": round(time.perf_counter() - started, 1),
+        "finished_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+    }
+    return entry
+
+
+def backfill_seasons(
+    specs: List[Tuple[str, List[str]]],
+    workers: int = DEFAULT_WORKERS,
+    per_host: int = DEFAULT_PER_HOST,
+    host_interval: float = DEFAULT_HOST_INTERVAL,
+    refresh_frozen: bool = False,
+    restart: bool = False,
+    checkpoint_path: Path = CHECKPOINT_JSON,
+) -> Dict[str, Dict[str, Any]]:
+    now = datetime.now()
+    if restart:
+        checkpoint_path.unlink(missing_ok=True)
+    checkpoint = _Checkpoint(checkpoint_path)
+    frozen = load_frozen_seasons()
+
+    tasks: List[Tuple[str, str]] = []
+    for comp_id, seasons in specs:
+        if comp_id in UNSUPPORTED:
+            print(f"⚠️ {comp_id}: 公式ソースが現行シーズンのみのためバックフィル非対応")
+            continue
+        if comp_id not in SEASON_SOURCES:
+            print(f"⚠️ {comp_id}: 未知の大会ID（対応: {', '.join(SEASON_SOURCES)}）")
+            continue
+        outputs = SEASON_SOURCES[comp_id][2]
+        for season in seasons:
+            key = f"{comp_id}:{season}"
+            is_frozen = all(season in frozen.get(output, set()) for output in outputs)
+            if is_frozen and not refresh_frozen:
+                print(f"🧊 {key}: 凍結済みのためスキップ")
+                continue
+            if checkpoint.is_done(key) and not refresh_frozen:
+                print(f"↩️ {key}: チェックポイント済み（{checkpoint.get(key)['status']}）")
+                continue
+            tasks.append((comp_id, season))
+
+    if not tasks:
+        checkpoint.finish()
+        print("✅ バックフィル対象なし")
+        return {}
+
+    print(f"バックフィル開始: {len(tasks)}タスク（並列 {workers} / ホストごと {per_host}、間隔 {host_interval:g}s）")
+    limiter = _HostLimiter(per_host, host_interval)
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def run(task: Tuple[str, str]) -> None:
+        comp_id, season = task
+        key = f"{comp_id}:{season}"
+        host = SEASON_SOURCES[comp_id][1]
+        limiter.acquire(host)
+        try:
+            print(f"▶️ {key}")
+            entry = _run_task(comp_id, season, refresh_frozen)
+        except Exception as exc:  # noqa: BLE001
+            entry = {"status": "failed", "matches": 0, "error": str(exc)}
+        finally:
+            limiter.release(host)
+
+        current = SEASON_SOURCES[comp_id][3](now)
+        outputs = SEASON_SOURCES[comp_id][2]
+        if (
+            entry["status"] == "done"
+            and int(season) < current
+            and _season_finished(outputs, season, datetime.now(timezone.utc))
+        ):
+            # 終了済みシーズンのみ凍結（現行・将来シーズンは通常実行で更新を続ける）
+            freeze_seasons((output, season) for output in outputs)
+            entry["frozen"] = True
+        checkpoint.record(key, entry)
+        results[key] = entry
+        mark = {"done": "✅", "empty": "⚠️", "failed": "❌"}[entry["status"]]
+        print(f"{mark} {key}: {entry['status']} ({entry['matches']}試合)" + (" 🧊" if entry.get("frozen") else ""))
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        list(executor.map(run, tasks))
+
+    counts: Dict[str, int] = {}
+    for entry in results.values():
+        counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+    print("\nバックフィル完了: " + " / ".join(f"{status} {count}" for status, count in sorted(counts.items())))
+    if counts.get("failed"):
+        print(f"  失敗したタスクは再実行で再試行されます（チェックポイント: {checkpoint_path}）")
+    else:
+        checkpoint.finish()
+    return results
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Backfill past seasons into data/matches/{comp}/{season}.json.")
+    parser.add_argument(
+        "--comp",
+        action="append",
+        required=True,
+        help="Competition and seasons, e.g. m6n:2020-2025 (repeatable; comma-separated ranges allowed).",
+    )
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent tasks.")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST, help="Concurrent tasks per source host.")
+    parser.add_argument(
+        "--host-interval",
+        type=float,
+        default=DEFAULT_HOST_INTERVAL,
+        help="Minimum seconds between task starts on the same host.",
+    )
+    parser.add_argument("--refresh-frozen", action="store_true", help="Re-scrape and overwrite frozen seasons.")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start over.")
+    args = parser.parse_args(argv)
+
+    try:
+        specs = [parse_comp_spec(spec) for spec in args.comp]
+    except ValueError as exc:
+        parser.error(str(exc))
+    backfill_seasons(
+        specs,
+        workers=args.workers,
+        per_host=args.per_host,
+        host_interval=args.host_interval,
+        refresh_frozen=args.refresh_frozen,
+        restart=args.restart,
+    )
+
+
+if __name__ == "__main__":
+    main()
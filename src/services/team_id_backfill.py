@@ -1,77 +1,216 @@
 """
 Backfill team_id in match data using teams.json.
+
+Match files are processed concurrently in a process pool. The resolver
+index (team master + base team names) is built once in the parent and
+shipped to each worker; workers only return diffs and the parent applies
+them with write-if-changed atomic writes. Each worker keeps the resolver's
+(team name, competition) cache across all files it processes.
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional, Set
 
 from src.collectors.base import BaseScraper
+from src.repositories.match_repository import iter_match_files, ndjson_path_for, write_matches_ndjson
+from src.utils.json_io import write_json_atomic
 
 ROOT = Path(__file__).resolve().parents[2]
 MATCHES_DIR = ROOT / "data" / "matches"
 
+TEAM_ID_FIELDS = (("home_team", "home_team_id"), ("away_team", "away_team_id"))
+
 
 class _Resolver(BaseScraper):
+    def __init__(
+        self,
+        team_master: Optional[Dict[str, Any]] = None,
+        base_team_names: Optional[Dict[str, Set[str]]] = None,
+    ):
+        self._preloaded_team_master = team_master
+        super().__init__(update_team_master=False)
+        if base_team_names is not None:
+            self._base_team_names = base_team_names
+
+    def _load_team_master(self) -> Dict[str, Any]:
+        if self._preloaded_team_master is not None:
+            return self._preloaded_team_master
+        return super()._load_team_master()
+
     def scrape(self):
         raise NotImplementedError
 
 
+# Worker-local resolver (set once per process by _init_worker)
+_WORKER_RESOLVER: Optional[_Resolver] = None
+
+
+def _init_worker(team_master: Dict[str, Any], base_team_names: Dict[str, Set[str]]) -> None:
+    global _WORKER_RESOLVER
+    _WORKER_RESOLVER = _Resolver(team_master, base_team_names)
+
+
 def _iter_match_files(only: List[str] | None):
-    for comp_dir in sorted(MATCHES_DIR.iterdir()):
-        if not comp_dir.is_dir():
+    yield from iter_match_files(only, MATCHES_DIR)
+
+
+def _display_path(path: Path) -> str:
+    try:
+        return str(path.relative_to(ROOT))
+    except ValueError:
+        return str(path)
+
+
+def _compute_file_diffs(comp_id: str, match_file: str, force: bool) -> Dict[str, Any]:
+    """Resolve team IDs for one file and return the changes only.
+
+    Returns:
+        {"path": str, "diffs": [{"index", "match_id", "field", "old", "new"}], "error": str}
+    """
+    result: Dict[str, Any] = {"path": match_file, "diffs": [], "error": "", "cache_hits": 0, "cache_misses": 0}
+    try:
+        with open(match_file, "r", encoding="utf-8") as f:
+            matches = json.load(f)
+    except Exception as exc:  # noqa: BLE001
+        result["error"] = str(exc)
+        return result
+
+    if not isinstance(matches, list):
+        return result
+
+    resolver = _WORKER_RESOLVER
+    stats_before = resolver.team_id_cache_stats()
+    for index, match in enumerate(matches):
+        if not isinstance(match, dict):
             continue
-        comp_id = comp_dir.name
-        if only and comp_id not in only:
+        for name_field, id_field in TEAM_ID_FIELDS:
+            old = match.get(id_field) or ""
+            if not force and old:
+                continue
+            new = resolver._resolve_team_id(match.get(name_field, ""), comp_id)
+            # --force では解決できなくなった名前の古いIDも空に戻す
+            if new != old:
+                result["diffs"].append(
+                    {
+                        "index": index,
+                        "match_id": match.get("match_id", ""),
+                        "field": id_field,
+                        "old": old,
+                        "new": new,
+                    }
+                )
+
+    # ワーカー内キャッシュはファイル間で共有されるため差分のみ返す
+    stats_after = resolver.team_id_cache_stats()
+    result["cache_hits"] = stats_after["hits"] - stats_before["hits"]
+    result["cache_misses"] = stats_after["misses"] - stats_before["misses"]
+    return result
+
+
+def _apply_diffs(match_file: Path, diffs: List[Dict[str, Any]]) -> int:
+    """Apply worker diffs to a match file. Returns the number of applied changes."""
+    with match_file.open("r", encoding="utf-8") as f:
+        matches = json.load(f)
+
+    applied = 0
+    for diff in diffs:
+        index = diff["index"]
+        if index >= len(matches) or not isinstance(matches[index], dict):
             continue
-        for match_file in sorted(comp_dir.glob("*.json")):
-            yield comp_id, match_file
-
+        match = matches[index]
+        # ファイルが途中で書き換えられていた場合は適用しない
+        if (match.get(diff["field"]) or "") != diff["old"]:
+            continue
+        match[diff["field"]] = diff["new"]
+        applied += 1
+
+    if applied:
+        write_json_atomic(match_file, matches)
+        # NDJSONの併記ファイルがあれば同期
+        ndjson_path = ndjson_path_for(match_file)
+        if ndjson_path.exists():
+            write_matches_ndjson(ndjson_path, matches)
+    return applied
+
+
+def backfill_team_ids(
+    only: List[str] | None = None,
+    force: bool = False,
+    dry_run: bool = False,
+    workers: int | None = None,
+) -> None:
+    resolver = _Resolver()
+    team_master = resolver._team_master
+    base_team_names = resolver._base_team_names
+
+    files = [(comp_id, str(match_file)) for comp_id, match_file in _iter_match_files(only)]
+    if not files:
+        print("⚠️ 対象の試合ファイルがありません")
+        return
+
+    max_workers = workers or os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(files)))
+
+    if max_workers == 1:
+        _init_worker(team_master, base_team_names)
+        results = [_compute_file_diffs(comp_id, path, force) for comp_id, path in files]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(team_master, base_team_names),
+        ) as executor:
+            results = list(
+                executor.map(
+                    _compute_file_diffs,
+                    [comp_id for comp_id, _ in files],
+                    [path for _, path in files],
+                    [force] * len(files),
+                )
+            )
 
-def backfill_team_ids(only: List[str] | None = None, force: bool = False) -> None:
-    resolver = _Resolver(update_team_master=False)
     updated_files = 0
     total_updates = 0
-
-    for comp_id, match_file in _iter_match_files(only):
-        try:
-            with match_file.open("r", encoding="utf-8") as f:
-                matches = json.load(f)
-        except Exception as exc:  # noqa: BLE001
-            print(f"⚠️ {match_file}: 読み込み失敗 ({exc})")
+    cache_hits = sum(result["cache_hits"] for result in results)
+    cache_lookups = cache_hits + sum(result["cache_misses"] for result in results)
+    for result in results:
+        match_file = Path(result["path"])
+        if result["error"]:
+            print(f"⚠️ {match_file}: 読み込み失敗 ({result['error']})")
             continue
-
-        if not isinstance(matches, list):
+        diffs = result["diffs"]
+        if not diffs:
             continue
 
-        changed = False
-        for match in matches:
-            if not isinstance(match, dict):
-                continue
+        if dry_run:
+            print(f"\n{_display_path(match_file)}: {len(diffs)}件")
+            for diff in diffs:
+                label = diff["match_id"] or f"#{diff['index']}"
+                print(f"  {label} {diff['field']}: '{diff['old']}' → '{diff['new']}'")
+            updated_files += 1
+            total_updates += len(diffs)
+            continue
 
-            home_team = match.get("home_team", "")
-            away_team = match.get("away_team", "")
-
-            if force or not match.get("home_team_id"):
-                match["home_team_id"] = resolver._resolve_team_id(home_team, comp_id)
-                if match["home_team_id"]:
-                    changed = True
-                    total_updates += 1
-
-            if force or not match.get("away_team_id"):
-                match["away_team_id"] = resolver._resolve_team_id(away_team, comp_id)
-                if match["away_team_id"]:
-                    changed = True
-                    total_updates += 1
-
-        if changed:
-            with match_file.open("w", encoding="utf-8") as f:
-                json.dump(matches, f, ensure_ascii=False, indent=2)
-                f.write("\n")
+        applied = _apply_diffs(match_file, diffs)
+        if applied:
             updated_files += 1
+            total_updates += applied
+
+    if cache_lookups:
+        print(f"🗂️ team_id解決キャッシュ: ヒット {cache_hits}/{cache_lookups} ({cache_hits / cache_lookups:.1%})")
+
+    if dry_run:
+        print(
+            f"\n🔍 Dry run: 対象ファイル {len(files)} / 変更予定ファイル {updated_files} / "
+            f"team_id変更予定 {total_updates}"
+        )
+        return
 
     print(f"✅ Backfill 完了: 更新ファイル {updated_files} / team_id更新 {total_updates}")
 
@@ -89,10 +228,21 @@ def main(argv: List[str] | None = None) -> None:
         action="store_true",
         help="Overwrite existing team_id values.",
     )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report which team_id values would change without writing files.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Number of worker processes (default: CPU count, 1 = serial).",
+    )
     args = parser.parse_args(argv)
 
     only = [s.strip() for s in args.only.split(",") if s.strip()] if args.only else None
-    backfill_team_ids(only, args.force)
+    backfill_team_ids(only, args.force, dry_run=args.dry_run, workers=args.workers or None)
 
 
 if __name__ == "__main__":
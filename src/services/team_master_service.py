@@ -3,6 +3,12 @@ Official team master updater.
 
 This service updates data/teams.json from official team list sources,
 independent of match data.
+
+Sources are collected concurrently: identical URLs are fetched once
+(shared futures), HTTP sources run in a thread pool on one pooled
+Session, and Selenium pages go through a single shared browser guarded
+by a lock. Results are merged in teams_sources.json order, so the output
+does not depend on completion order.
 """
 
 from __future__ import annotations
@@ -10,12 +16,15 @@ from __future__ import annotations
 import argparse
 import json
 import re
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -42,6 +51,10 @@ DATA_DIR = ROOT / "data"
 TEAMS_SOURCES = DATA_DIR / "teams_sources.json"
 TEAMS_JSON = DATA_DIR / "teams.json"
 
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+REQUEST_TIMEOUT = 30
+MAX_WORKERS = 8
+
 
 def _load_sources() -> Dict[str, dict]:
     if not TEAMS_SOURCES.exists():
@@ -50,27 +63,20 @@ def _load_sources() -> Dict[str, dict]:
         return json.load(f)
 
 
-def _fetch_html(url: str) -> BeautifulSoup:
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    }
-    response = requests.get(url, headers=headers, timeout=30)
-    response.raise_for_status()
-    return BeautifulSoup(response.text, "html.parser")
-
-
-def _fetch_html_selenium(url: str) -> BeautifulSoup:
+def _create_chrome_driver():
     BaseScraper._prefer_selenium_manager()
     chrome_options = Options()
     chrome_options.add_argument("--headless=new")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument(
-        "--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    )
+    chrome_options.add_argument(f"--user-agent={USER_AGENT}")
     driver = webdriver.Chrome(options=chrome_options)
     driver.set_page_load_timeout(120)
+    return driver
+
+
+def _load_page_selenium(driver, url: str) -> str:
     try:
         driver.get(url)
         # Basic readiness
@@ -85,13 +91,80 @@ def _fetch_html_selenium(url: str) -> BeautifulSoup:
             html = driver.page_source
     except TimeoutException:
         html = driver.page_source
-    finally:
-        driver.quit()
-    return BeautifulSoup(html, "html.parser")
-
-
-def _extract_premiership_clubs(url: str) -> Tuple[List[str], Dict[str, dict]]:
-    soup = _fetch_html(url)
+    return html
+
+
+class SourceFetcher:
+    """Shared fetch layer for one update run.
+
+    - fetch_html: one pooled requests.Session; identical URLs share a future
+    - fetch_html_selenium / with_browser: one lazily started browser,
+      serialized by a lock and quit in close()
+    """
+
+    def __init__(self, max_workers: int = MAX_WORKERS):
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT})
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._pages: Dict[Tuple[str, str], Future] = {}
+        self._pages_lock = threading.Lock()
+        self._browser = None
+        self._browser_lock = threading.RLock()
+        self.stats = {"requests": 0, "deduplicated": 0}
+
+    def _once(self, kind: str, url: str, load: Callable[[], str]) -> str:
+        key = (kind, url)
+        with self._pages_lock:
+            future = self._pages.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._pages[key] = future
+                self.stats["requests"] += 1
+            else:
+                self.stats["deduplicated"] += 1
+        if owner:
+            try:
+                future.set_result(load())
+            except BaseException as exc:  # noqa: BLE001
+                future.set_exception(exc)
+        return future.result()
+
+    def _get_text(self, url: str) -> str:
+        response = self.session.get(url, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response.text
+
+    def fetch_html(self, url: str) -> BeautifulSoup:
+        # BeautifulSoup は呼び出し側ごとに生成（スレッド間で共有しない）
+        return BeautifulSoup(self._once("http", url, lambda: self._get_text(url)), "html.parser")
+
+    def with_browser(self, func: Callable[[Any], Any]) -> Any:
+        """Run func(driver) on the shared browser (one caller at a time)."""
+        with self._browser_lock:
+            if self._browser is None:
+                self._browser = _create_chrome_driver()
+            return func(self._browser)
+
+    def fetch_html_selenium(self, url: str) -> BeautifulSoup:
+        html = self._once("selenium", url, lambda: self.with_browser(lambda driver: _load_page_selenium(driver, url)))
+        return BeautifulSoup(html, "html.parser")
+
+    def close(self) -> None:
+        with self._browser_lock:
+            if self._browser is not None:
+                try:
+                    self._browser.quit()
+                except Exception:  # noqa: BLE001
+                    pass
+                self._browser = None
+        self.session.close()
+
+
+def _extract_premiership_clubs(url: str, fetcher: SourceFetcher) -> Tuple[List[str], Dict[str, dict]]:
+    soup = fetcher.fetch_html(url)
     team_names: Set[str] = set()
     logos: Dict[str, dict] = {}
     blacklist = {
@@ -113,11 +186,11 @@ def _extract_premiership_clubs(url: str) -> Tuple[List[str], Dict[str, dict]]:
     return sorted(team_names), logos
 
 
-def _extract_epcr_clubs(url: str) -> Tuple[List[str], Dict[str, dict]]:
+def _extract_epcr_clubs(url: str, fetcher: SourceFetcher) -> Tuple[List[str], Dict[str, dict]]:
     try:
-        soup = _fetch_html(url)
+        soup = fetcher.fetch_html(url)
     except Exception:
-        soup = _fetch_html_selenium(url)
+        soup = fetcher.fetch_html_selenium(url)
     logos: Dict[str, dict] = {}
     team_names: Set[str] = set()
     for name_el in soup.select("p.club-name"):
@@ -133,8 +206,8 @@ def _extract_epcr_clubs(url: str) -> Tuple[List[str], Dict[str, dict]]:
     return sorted(team_names), logos
 
 
-def _extract_top14_clubs(url: str) -> Tuple[List[str], Dict[str, dict]]:
-    soup = _fetch_html(url)
+def _extract_top14_clubs(url: str, fetcher: SourceFetcher) -> Tuple[List[str], Dict[str, dict]]:
+    soup = fetcher.fetch_html(url)
     team_names: Set[str] = set()
     logos: Dict[str, dict] = {}
     for img in soup.find_all("img", alt=True, src=True):
@@ -148,8 +221,8 @@ def _extract_top14_clubs(url: str) -> Tuple[List[str], Dict[str, dict]]:
     return sorted(team_names), logos
 
 
-def _extract_jrlo_division(url: str, division: str) -> Tuple[List[str], Dict[str, dict]]:
-    soup = _fetch_html(url)
+def _extract_jrlo_division(url: str, division: str, fetcher: SourceFetcher) -> Tuple[List[str], Dict[str, dict]]:
+    soup = fetcher.fetch_html(url)
     teams: List[str] = []
     logos: Dict[str, dict] = {}
     if division == "1":
@@ -184,7 +257,7 @@ def _extract_jrlo_division(url: str, division: str) -> Tuple[List[str], Dict[str
     return sorted(dict.fromkeys(teams)), logos
 
 
-def _extract_six_nations_teams(competition_id: str) -> Tuple[List[str], Dict[str, dict]]:
+def _extract_six_nations_teams(competition_id: str, fetcher: SourceFetcher) -> Tuple[List[str], Dict[str, dict]]:
     if competition_id == "m6n":
         scraper = SixNationsScraper()
     elif competition_id == "w6n":
@@ -192,9 +265,18 @@ def _extract_six_nations_teams(competition_id: str) -> Tuple[List[str], Dict[str
     else:
         scraper = SixNationsU20Scraper()
 
+    def load_page(driver) -> str:
+        # 共有ブラウザを使い、スクレイパー側では quit しない
+        scraper._setup_driver = lambda: driver
+        try:
+            scraper._initialize_driver_and_load_page()
+            return scraper.driver.page_source
+        finally:
+            scraper.driver = None
+
     try:
-        scraper._initialize_driver_and_load_page()
-        soup = BeautifulSoup(scraper.driver.page_source, "html.parser")
+        html = fetcher.with_browser(load_page)
+        soup = BeautifulSoup(html, "html.parser")
         scraper._extract_team_logos(soup)
         raw_names = list(scraper._team_logos_cache.keys())
         # Filter by known country codes/names to remove sponsor logos
@@ -220,8 +302,8 @@ def _extract_six_nations_teams(competition_id: str) -> Tuple[List[str], Dict[str
             scraper.driver.quit()
 
 
-def _extract_urc_clubs(url: str) -> Tuple[List[str], Dict[str, dict]]:
-    soup = _fetch_html_selenium(url)
+def _extract_urc_clubs(url: str, fetcher: SourceFetcher) -> Tuple[List[str], Dict[str, dict]]:
+    soup = fetcher.fetch_html_selenium(url)
     logos: Dict[str, dict] = {}
 
     # Extract logos from page URLs (WordPress uploads contain team logos)
@@ -280,7 +362,7 @@ def _extract_urc_clubs(url: str) -> Tuple[List[str], Dict[str, dict]]:
     return team_names, logos
 
 
-def _extract_srp_teams(url: str) -> Tuple[List[str], Dict[str, dict]]:
+def _extract_srp_teams(url: str, fetcher: SourceFetcher) -> Tuple[List[str], Dict[str, dict]]:
     logos: Dict[str, dict] = {}
     teams: Set[str] = set()
 
@@ -305,18 +387,18 @@ def _extract_srp_teams(url: str) -> Tuple[List[str], Dict[str, dict]]:
             teams.add(team_name)
             logos[team_name] = {"logo_url": src, "badge_url": src}
 
-    soup = _fetch_html(url)
+    soup = fetcher.fetch_html(url)
     parse_srp(soup)
     if not teams:
-        soup = _fetch_html_selenium(url)
+        soup = fetcher.fetch_html_selenium(url)
         parse_srp(soup)
 
     return sorted(teams), logos
 
 
-def _extract_jrlo_short_names(url: str) -> Dict[str, str]:
+def _extract_jrlo_short_names(url: str, fetcher: SourceFetcher) -> Dict[str, str]:
     """Extract JRLO short names from official about page."""
-    soup = _fetch_html(url)
+    soup = fetcher.fetch_html(url)
     mapping: Dict[str, str] = {}
     invalid_values = {"略称", "公式チーム名称", "呼称", "エンブレム"}
 
@@ -373,33 +455,81 @@ def _is_short_name_placeholder(value: str) -> bool:
 
 
 
-def _collect_teams_for_comp(comp_id: str, cfg: dict) -> Tuple[List[str], Dict[str, dict]]:
+def _collect_teams_for_comp(comp_id: str, cfg: dict, fetcher: SourceFetcher) -> Tuple[List[str], Dict[str, dict]]:
     source_type = cfg.get("type")
     if source_type == "premiership-clubs":
-        return _extract_premiership_clubs(cfg["url"])
+        return _extract_premiership_clubs(cfg["url"], fetcher)
     if source_type == "epcr-clubs":
-        return _extract_epcr_clubs(cfg["url"])
+        return _extract_epcr_clubs(cfg["url"], fetcher)
     if source_type == "top14-clubs":
-        return _extract_top14_clubs(cfg["url"])
+        return _extract_top14_clubs(cfg["url"], fetcher)
     if source_type == "jrlo-teams":
         if comp_id.endswith("div1"):
-            return _extract_jrlo_division(cfg["url"], "1")
+            return _extract_jrlo_division(cfg["url"], "1", fetcher)
         if comp_id.endswith("div2"):
-            return _extract_jrlo_division(cfg["url"], "2")
+            return _extract_jrlo_division(cfg["url"], "2", fetcher)
         if comp_id.endswith("div3"):
-            return _extract_jrlo_division(cfg["url"], "3")
+            return _extract_jrlo_division(cfg["url"], "3", fetcher)
         return [], {}
     if source_type == "six-nations-fixtures":
-        return _extract_six_nations_teams(comp_id)
+        return _extract_six_nations_teams(comp_id, fetcher)
     if source_type == "urc-clubs":
-        return _extract_urc_clubs(cfg["url"])
+        return _extract_urc_clubs(cfg["url"], fetcher)
     if source_type == "srp-teams":
-        return _extract_srp_teams(cfg["url"])
+        return _extract_srp_teams(cfg["url"], fetcher)
 
     return [], {}
 
 
-def update_team_master(only: List[str] | None = None, fetch_logos: bool = True) -> None:
+def _collect_all_sources(
+    sources: Dict[str, dict],
+    fetcher: SourceFetcher,
+    max_workers: int = MAX_WORKERS,
+) -> Tuple[Dict[str, Tuple[List[str], Dict[str, dict], Optional[Exception]]], Dict[str, str], float]:
+    """Collect every source concurrently.
+
+    Returns:
+        ({comp_id: (teams, logos, error)}, jrlo_short_names, elapsed_seconds)
+    """
+    short_names_url = ""
+    for comp_id, cfg in sources.items():
+        if comp_id.startswith("jrlo") and cfg.get("short_names_url"):
+            short_names_url = cfg["short_names_url"]
+            break
+
+    def collect(comp_id: str, cfg: dict):
+        started = time.perf_counter()
+        try:
+            teams, logos = _collect_teams_for_comp(comp_id, cfg, fetcher)
+            return teams, logos, None, time.perf_counter() - started
+        except Exception as exc:  # noqa: BLE001
+            return [], {}, exc, time.perf_counter() - started
+
+    started = time.perf_counter()
+    jrlo_short_names: Dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(sources) + 1))) as executor:
+        futures = {comp_id: executor.submit(collect, comp_id, cfg) for comp_id, cfg in sources.items()}
+        short_names_future = executor.submit(_extract_jrlo_short_names, short_names_url, fetcher) if short_names_url else None
+
+        results = {}
+        for comp_id, future in futures.items():
+            teams, logos, error, elapsed = future.result()
+            results[comp_id] = (teams, logos, error)
+            print(f"  ⏱️ {comp_id}: {elapsed:.1f}s")
+        if short_names_future is not None:
+            try:
+                jrlo_short_names = short_names_future.result()
+            except Exception as exc:  # noqa: BLE001
+                print(f"  ⚠️ JRLO略称取得失敗: {exc}")
+
+    return results, jrlo_short_names, time.perf_counter() - started
+
+
+def update_team_master(
+    only: List[str] | None = None,
+    fetch_logos: bool = True,
+    max_workers: int = MAX_WORKERS,
+) -> None:
     sources = _load_sources()
     if only:
         sources = {k: v for k, v in sources.items() if k in only}
@@ -412,7 +542,6 @@ def update_team_master(only: List[str] | None = None, fetch_logos: bool = True)
         for team_id, team_data in existing_teams.items()
         if (team_data.get("short_name") or "").strip()
     }
-    jrlo_short_names: Dict[str, str] = {}
     srp_aliases = {
         "BLUES": "Blues",
         "BRUMBIES": "Brumbies",
@@ -436,20 +565,24 @@ def update_team_master(only: List[str] | None = None, fetch_logos: bool = True)
             if not (team_data.get("short_name") or "").strip():
                 team_data["short_name"] = mapped
 
-    for comp_id, cfg in sources.items():
-        if not comp_id.startswith("jrlo"):
-            continue
-        short_url = cfg.get("short_names_url")
-        if short_url:
-            try:
-                jrlo_short_names = _extract_jrlo_short_names(short_url)
-            except Exception as exc:  # noqa: BLE001
-                print(f"  ⚠️ JRLO略称取得失敗: {exc}")
-            break
-    for comp_id, cfg in sources.items():
+    print(f"公式ソース取得中: {len(sources)}件（並列 {max_workers}）")
+    fetcher = SourceFetcher(max_workers)
+    try:
+        collected, jrlo_short_names, elapsed = _collect_all_sources(sources, fetcher, max_workers)
+    finally:
+        fetcher.close()
+    print(
+        f"取得完了: {elapsed:.1f}s "
+        f"(リクエスト {fetcher.stats['requests']}件 / 重複URL共有 {fetcher.stats['deduplicated']}件)"
+    )
+
+    # teams_sources.json の順で統合（完了順に依存しない）
+    for comp_id in sources:
         print(f"\n大会: {comp_id}")
         try:
-            teams, logos = _collect_teams_for_comp(comp_id, cfg)
+            teams, logos, error = collected[comp_id]
+            if error is not None:
+                raise error
             if not teams:
                 print("  ⚠️ チーム取得結果が空です（ソース/セレクタ要確認）")
                 fallback = [
@@ -563,10 +696,16 @@ def main(argv: List[str] | None = None) -> None:
         action="store_true",
         help="Skip logo fetch during team master update.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=MAX_WORKERS,
+        help=f"Number of concurrent source fetches (default: {MAX_WORKERS}).",
+    )
     args = parser.parse_args(argv)
 
     only = [s.strip() for s in args.only.split(",") if s.strip()] if args.only else None
-    update_team_master(only, fetch_logos=not args.no_logos)
+    update_team_master(only, fetch_logos=not args.no_logos, max_workers=max(1, args.workers))
 
 
 if __name__ == "__main__":
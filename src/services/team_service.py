@@ -19,18 +19,16 @@ import json
 import re
 from pathlib import Path
 from collections import defaultdict
-import requests
-import time
+
+from src.repositories.team_id_allocator import TeamIdAllocator, counters_path_for
+from src.repositories.team_master_store import compact_team_master
+from src.services.logo_client import get_logo_client
 
 ROOT = Path(__file__).resolve().parents[2]
 MATCHES_DIR = ROOT / "data" / "matches"
 TEAMS_JSON = ROOT / "data" / "teams.json"
 DUPLICATES_REPORT = ROOT / "data" / "team_duplicates_report.json"
 
-# TheSportsDB API設定
-THESPORTSDB_API_KEY = "3"  # 無料プランのキー
-THESPORTSDB_BASE_URL = "https://www.thesportsdb.com/api/v1/json"
-
 # 大会ID・略称マッピング（新形式対応）
 COMPETITION_IDS = {
     "six-nations": "m6n",
@@ -188,69 +186,31 @@ def is_placeholder_team(team_name: str) -> bool:
 
 def fetch_team_logo(team_name, comp_id):
     """TheSportsDB APIからチームロゴを取得"""
-    try:
-        # ベースチーム名を使用
-        search_name = get_base_team_name(team_name)
-
-        data = _fetch_logo_payload(search_name)
-        if data:
-            teams = data.get("teams")
-            if teams and len(teams) > 0:
-                team = teams[0]
-                logo_url = team.get("strTeamBadge") or team.get("strTeamLogo") or ""
-                badge_url = team.get("strTeamBanner") or ""
-                return logo_url, badge_url
-
-        return "", ""
-
-    except Exception as e:
-        print(f"    ⚠️ ロゴ取得エラー ({team_name}): {e}")
-        return "", ""
-
-
-def _fetch_logo_payload(search_name: str):
-    url = f"{THESPORTSDB_BASE_URL}/{THESPORTSDB_API_KEY}/searchteams.php"
-    params = {"t": search_name}
-    backoffs = [1.0, 2.0, 4.0]
-    last_error = None
-    for idx, backoff in enumerate(backoffs, 1):
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            if response.status_code == 429:
-                time.sleep(backoff)
-                last_error = f"429 Too Many Requests (attempt {idx})"
-                continue
-            response.raise_for_status()
-            time.sleep(0.5)  # APIレート制限対策（基本待機）
-            return response.json()
-        except Exception as e:  # noqa: BLE001
-            last_error = e
-            time.sleep(backoff)
-            continue
-    raise last_error
+    info = fetch_logo_from_thesportsdb(team_name)
+    return info["logo_url"], info["badge_url"]
 
 
 def fetch_logo_from_thesportsdb(team_name: str):
-    """update_team_logos用: TheSportsDB APIからロゴ取得"""
+    """update_team_logos用: TheSportsDB APIからロゴ取得（共有クライアント経由）"""
     try:
         search_name = get_base_team_name(team_name)
-        data = _fetch_logo_payload(search_name)
-        if not data:
-            return {"logo_url": "", "badge_url": ""}
-        teams = data.get("teams")
-        if teams and len(teams) > 0:
-            team = teams[0]
-            logo_url = team.get("strTeamBadge") or team.get("strTeamLogo") or ""
-            badge_url = team.get("strTeamBanner") or ""
-            return {"logo_url": logo_url, "badge_url": badge_url}
-        return {"logo_url": "", "badge_url": ""}
-    except Exception as e:
+        result = get_logo_client().resolve(search_name)
+        # 旧実装の対応: logo_url = バッジ優先, badge_url = バナー
+        return {
+            "logo_url": result.get("badge_url") or result.get("logo_url") or "",
+            "badge_url": result.get("banner_url") or "",
+        }
+    except Exception as e:  # noqa: BLE001
         print(f"  ⚠️ ロゴ取得エラー ({team_name}): {e}")
         return {"logo_url": "", "badge_url": ""}
 
 
 def load_existing_teams():
-    """既存teams.jsonを読み込み"""
+    """既存teams.jsonを読み込み（スクレイパーのジャーナルを先に反映）"""
+    try:
+        compact_team_master(TEAMS_JSON)
+    except json.JSONDecodeError:
+        pass
     if not TEAMS_JSON.exists():
         return {}
     
@@ -354,16 +314,8 @@ def generate_team_master(teams_by_comp, existing_teams, fetch_logos=False, offic
             if short_key not in existing_by_name:
                 existing_by_name[short_key] = team_id
     
-    # 大会別の最大ID番号を取得
-    max_id_by_comp = defaultdict(int)
-    for team_id in existing_teams.keys():
-        if "_" in team_id:
-            comp_prefix, num_str = team_id.rsplit("_", 1)
-            try:
-                num = int(num_str)
-                max_id_by_comp[comp_prefix] = max(max_id_by_comp[comp_prefix], num)
-            except ValueError:
-                pass
+    # 大会別の採番カウンタ（data/team_id_counters.json と既存IDの最大値から）
+    allocator = TeamIdAllocator(existing_teams, counters_path_for(TEAMS_JSON))
     
     # 新チームマスタ
     new_teams = {}
@@ -442,8 +394,7 @@ def generate_team_master(teams_by_comp, existing_teams, fetch_logos=False, offic
                 
                 else:
                     # 新チーム: 新ID採番
-                    max_id_by_comp[comp_id] += 1
-                    team_id = f"{comp_id}_{max_id_by_comp[comp_id]}"
+                    team_id = allocator.allocate(comp_id)
                     
                     # ロゴ取得
                     official = official_logos.get(team_name, {})
@@ -465,6 +416,7 @@ def generate_team_master(teams_by_comp, existing_teams, fetch_logos=False, offic
                     
                     added_count += 1
     
+    allocator.save()
     return new_teams, added_count, preserved_count
 
 
@@ -1,3 +1,9 @@
 """Utility functions and helpers."""
 
-__all__ = []
+from .json_io import dump_json_text, write_json_atomic, write_text_atomic
+
+__all__ = [
+    "dump_json_text",
+    "write_json_atomic",
+    "write_text_atomic",
+]
@@ -0,0 +1,95 @@
+"""
+Resident Selenium browsers for long-running processes.
+
+Scrapers obtain their WebDriver through BaseScraper._acquire_driver().
+By default this creates a fresh driver and quits it after the scrape, as
+before. Once enable_resident() has been called (serve-scheduler), one
+driver per profile (the scraper's _setup_driver implementation, e.g.
+EPCR or Six Nations) is kept alive and reused by later scrapes, so Chrome
+start-up is paid once per process. Broken drivers are detected and
+recreated; a scrape that failed discards its driver.
+
+Resident drivers are not shared between concurrent scrapes: the daemon
+runs scrapes one at a time.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict
+
+_lock = threading.Lock()
+_resident = False
+_drivers: Dict[str, Any] = {}
+stats = {"started": 0, "reused": 0}
+
+
+def enable_resident() -> None:
+    global _resident
+    _resident = True
+
+
+def is_resident() -> bool:
+    return _resident
+
+
+def _alive(driver) -> bool:
+    try:
+        driver.current_url
+        return True
+    except Exception:  # noqa: BLE001
+        return False
+
+
+def _quit(driver) -> None:
+    try:
+        driver.quit()
+    except Exception:  # noqa: BLE001
+        pass
+
+
+def acquire(profile: str, factory: Callable[[], Any]):
+    """Return a driver for the profile (resident one when enabled)."""
+    if not _resident:
+        stats["started"] += 1
+        return factory()
+    with _lock:
+        driver = _drivers.get(profile)
+        if driver is not None and _alive(driver):
+            stats["reused"] += 1
+            return driver
+        if driver is not None:
+            _quit(driver)
+        driver = factory()
+        stats["started"] += 1
+        _drivers[profile] = driver
+        return driver
+
+
+def release(profile: str, driver, failed: bool = False) -> None:
+    """Quit the driver, or keep it for the next scrape in resident mode."""
+    if driver is None:
+        return
+    if not _resident:
+        _quit(driver)
+        return
+    with _lock:
+        if failed or _drivers.get(profile) is not driver:
+            _drivers.pop(profile, None)
+            _quit(driver)
+            return
+    try:
+        # ページのメモリを解放しておく
+        driver.get("about:blank")
+    except Exception:  # noqa: BLE001
+        with _lock:
+            _drivers.pop(profile, None)
+        _quit(driver)
+
+
+def close_all() -> None:
+    with _lock:
+        drivers = list(_drivers.values())
+        _drivers.clear()
+    for driver in drivers:
+        _quit(driver)
@@ -0,0 +1,110 @@
+"""
+Process-wide pooled HTTP session for collectors.
+
+get() behaves like requests.get() but reuses one Session, so repeated
+requests to the same host share keep-alive connections instead of
+opening a new pool per call.
+
+Long-running processes (serve-scheduler) can additionally enable an
+in-memory conditional-GET cache: 200 responses carrying ETag or
+Last-Modified are kept (LRU), later requests for the same URL, params and
+headers are sent with If-None-Match / If-Modified-Since, and a 304 returns
+the cached response without transferring the body again.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+POOL_SIZE = 16
+CACHE_SIZE = 256
+
+_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+_cache: Optional["OrderedDict[Tuple, Tuple[Dict[str, str], requests.Response]]"] = None
+_cache_size = CACHE_SIZE
+stats = {"requests": 0, "not_modified": 0}
+
+
+def get_session() -> requests.Session:
+    """Return the shared Session (created on first use)."""
+    global _session
+    with _lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def enable_cache(max_entries: int = CACHE_SIZE) -> None:
+    """Keep validators + bodies in memory and revalidate with conditional GETs."""
+    global _cache, _cache_size
+    with _lock:
+        if _cache is None:
+            _cache = OrderedDict()
+        _cache_size = max(1, max_entries)
+
+
+def _cache_key(url: str, params: Any, headers: Optional[Dict[str, str]]) -> Tuple:
+    if isinstance(params, dict):
+        params_key = tuple(sorted((str(k), str(v)) for k, v in params.items()))
+    else:
+        params_key = str(params or "")
+    headers_key = tuple(sorted((str(k).lower(), str(v)) for k, v in (headers or {}).items()))
+    return (url, params_key, headers_key)
+
+
+def get(url: str, params: Any = None, headers: Optional[Dict[str, str]] = None, **kwargs) -> requests.Response:
+    """requests.get() over the shared Session (conditional when the cache is enabled)."""
+    session = get_session()
+    stats["requests"] += 1
+    if _cache is None:
+        return session.get(url, params=params, headers=headers, **kwargs)
+
+    key = _cache_key(url, params, headers)
+    with _lock:
+        cached = _cache.get(key)
+    request_headers = dict(headers or {})
+    if cached is not None:
+        request_headers.update(cached[0])
+
+    response = session.get(url, params=params, headers=request_headers, **kwargs)
+    if response.status_code == 304 and cached is not None:
+        stats["not_modified"] += 1
+        with _lock:
+            _cache.move_to_end(key)
+        return cached[1]
+
+    if response.status_code == 200:
+        validators = {}
+        if response.headers.get("ETag"):
+            validators["If-None-Match"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = response.headers["Last-Modified"]
+        if validators:
+            # 本文を読み込んでから保持（再利用時に .text / .json() が使えるように）
+            response.content
+            with _lock:
+                _cache[key] = (validators, response)
+                _cache.move_to_end(key)
+                while len(_cache) > _cache_size:
+                    _cache.popitem(last=False)
+    return response
+
+
+def close() -> None:
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+        if _cache is not None:
+            _cache.clear()
@@ -0,0 +1,66 @@
+"""
+JSON file helpers shared by services and repositories.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+
+def dump_json_text(data: Any, *, indent: int | None = 2, trailing_newline: bool = True) -> str:
+    """Serialize data the same way the repository writes JSON files."""
+    if indent is None:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    else:
+        text = json.dumps(data, ensure_ascii=False, indent=indent)
+    if trailing_newline:
+        text += "\n"
+    return text
+
+
+def write_text_atomic(path: Path, text: str, *, only_if_changed: bool = True) -> bool:
+    """Write text via a temp file + os.replace.
+
+    Returns:
+        True if the file was written, False if the content was unchanged.
+    """
+    path = Path(path)
+    if only_if_changed and path.exists():
+        try:
+            if path.read_text(encoding="utf-8") == text:
+                return False
+        except (OSError, UnicodeDecodeError):
+            pass
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    return True
+
+
+def write_json_atomic(
+    path: Path,
+    data: Any,
+    *,
+    indent: int | None = 2,
+    trailing_newline: bool = True,
+    only_if_changed: bool = True,
+) -> bool:
+    """Serialize data and write it atomically (skip when unchanged)."""
+    text = dump_json_text(data, indent=indent, trailing_newline=trailing_newline)
+    return write_text_atomic(path, text, only_if_changed=only_if_changed)